@@ -43,6 +43,11 @@ class Settings(BaseSettings):
     # Feature Flags
     enable_registration: bool = True
 
+    # Image storage backend: "bunny" (Bunny.net CDN) or "local" (disk, served at /media)
+    storage_backend: str = "bunny"
+    local_storage_dir: str = "media"  # Root directory for the local backend
+    local_storage_base_url: str = "/media"  # Public URL prefix, e.g. "https://api.example.com/media"
+
     # Image Upload (Bunny.net)
     bunny_storage_zone: Optional[str] = None  # e.g., "catatlas"
     bunny_api_key: Optional[str] = None  # Storage API key
@@ -50,6 +55,30 @@ class Settings(BaseSettings):
     bunny_cdn_hostname: Optional[str] = None  # e.g., "catatlas.b-cdn.net"
     max_upload_size_mb: int = 10  # Maximum file size in MB
     allowed_image_types: str = "image/jpeg,image/png,image/webp,image/gif"
+    image_variants_enabled: bool = True  # Also store thumbnail/medium/WebP versions of uploads
+    image_variant_workers: int = 2  # Processes rendering variants (PIL work off the API worker)
+    image_validation_workers: int = 4  # Threads validating uploads (PIL verify off the event loop)
+    async_image_uploads: bool = False  # Save sightings right away, upload their photo in the background
+    upload_spool_dir: str = "upload_spool"  # Where photos wait for the background upload (must persist across restarts)
+    photo_upload_max_attempts: int = 5  # Background upload attempts before photo_status becomes "failed"
+
+    # Storage maintenance (deferred deletes + orphan reconciliation)
+    storage_delete_interval_seconds: int = 30  # How often pending storage deletes are drained
+    storage_delete_batch_size: int = 50  # Deletes issued per drain pass
+    storage_reconcile_interval_hours: int = 24  # Orphaned-file scan interval (0 disables)
+    storage_reconcile_delete_orphans: bool = False  # Only report orphans unless enabled
+
+    # Background geocoding (write-behind, OpenStreetMap Nominatim)
+    auto_geocode_entries: bool = False  # Geocode new entries with a location after the response is sent
+    geocode_queue_max_size: int = 1000  # Pending jobs before new ones are dropped (backpressure)
+
+    # Background analysis (write-behind, keeps /entries/{id}/analysis warm)
+    precompute_analyses: bool = True  # Analyze new entries after the response is sent
+    analysis_queue_max_size: int = 1000  # Pending entries before new ones are dropped (backpressure)
+
+    # Cat profile response cache (versioned per cat)
+    profile_cache_size: int = 1000  # Cached profile responses (0 disables)
+    profile_cache_stale_while_revalidate: bool = False  # Serve outdated profiles while rebuilding them
 
     model_config = SettingsConfigDict(
         env_file=".env",
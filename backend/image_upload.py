@@ -8,24 +8,83 @@ Bunny.net provides EU-based storage with built-in CDN and image optimization.
 
 API Documentation: https://docs.bunny.net/reference/storage-api
 
+Storage is pluggable (STORAGE_BACKEND): "bunny" (default) or "local", which
+keeps files on disk and serves them from the API (see StorageBackend below).
+
 Resiliency Patterns:
-- Retry logic with exponential backoff (3 attempts)
+- Retry logic with exponential backoff (3 attempts, non-blocking asyncio.sleep)
 - Circuit breaker to prevent cascading failures
 - Timeout handling (30s for uploads)
 - Graceful degradation (allows entries without images)
+- Pooled async HTTP client, so storage I/O never blocks the event loop
+- Resized variants (thumbnail, medium, WebP) rendered in a process pool and
+  uploaded next to the original; best effort, the original is always kept
+- Content-addressed storage names (sha256 of the bytes), so known content
+  can skip the upload entirely (see find_existing in upload_image)
+- Image validation (PIL verify) in a small thread pool, after a header-only
+  dimension check, so large PNGs/GIFs don't stall the event loop
 """
 
-from typing import Optional, Tuple
-import requests
-import uuid
+import asyncio
+import functools
+import hashlib
+import os
+import shutil
+import tempfile
 import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+import httpx
+import uuid
 from datetime import datetime, timedelta
 from fastapi import HTTPException, UploadFile
-from PIL import Image
+from PIL import Image, ExifTags, ImageOps
 import io
 from config import settings
 
 
+# Bytes read from an upload / streamed to storage at a time
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Resized variants stored next to each original: name -> (max edge px, PIL format, extension)
+IMAGE_VARIANTS = {
+    "thumb": (320, "JPEG", "jpg"),
+    "medium": (1280, "JPEG", "jpg"),
+    "webp": (1280, "WEBP", "webp"),
+}
+VARIANT_QUALITY = 82
+
+# Perceptual hash: DHASH_SIZE x DHASH_SIZE bits (64 for 8)
+DHASH_SIZE = 8
+
+# Decompression-bomb guard, checked from the image header before any decoding
+MAX_IMAGE_DIMENSION = 10000
+MAX_IMAGE_PIXELS = 64_000_000  # e.g. 8000x8000; 48MP phone photos fit
+
+
+@dataclass
+class ImageInfo:
+    """Metadata collected while validating an image (same PIL pass)."""
+    width: int = 0
+    height: int = 0
+    format: Optional[str] = None
+    gps: Optional[Tuple[float, float]] = None  # (lat, lon) from EXIF GPS tags
+
+
+@dataclass
+class UploadedImage:
+    """Result of a successful upload: CDN URL plus image metadata."""
+    url: str
+    info: ImageInfo = field(default_factory=ImageInfo)
+    variants: Dict[str, str] = field(default_factory=dict)  # variant name -> CDN URL
+    sha256: Optional[str] = None  # Hex digest of the original bytes
+    deduplicated: bool = False  # True if the content was already stored (no upload made)
+    dhash: Optional[str] = None  # Perceptual difference hash (16 hex chars), see compute_dhash
+    timings: Dict[str, float] = field(default_factory=dict)  # stage -> milliseconds
+
+
 # Circuit Breaker State
 class CircuitBreaker:
     """
@@ -80,34 +139,70 @@ class CircuitBreaker:
 bunny_circuit_breaker = CircuitBreaker(failure_threshold=5, timeout=60)
 
 
+class StorageError(Exception):
+    """Bunny.net storage API returned an error response."""
+
+
+class TransientStorageError(StorageError):
+    """Storage error worth retrying (5xx from Bunny.net)."""
+
+
+# Shared async HTTP client (connection pooling + keep-alive to the storage API)
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the pooled async HTTP client for Bunny.net, creating it on first use.
+
+    Pooled connections belong to the event loop that opened them, so a new
+    client is created if we're called from a different loop.
+    """
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the pooled client (called on app shutdown)."""
+    global _http_client, _http_client_loop
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+    _http_client_loop = None
+
+
 def retry_with_backoff(max_attempts: int = 3, base_delay: float = 1.0):
     """
-    Decorator for retry logic with exponential backoff.
+    Decorator for retry logic with exponential backoff (async functions).
+
+    Only transient errors (connection problems, timeouts, 5xx) are retried.
+    Waiting uses asyncio.sleep, so other requests keep being served meanwhile.
 
     Args:
         max_attempts: Maximum number of retry attempts
         base_delay: Initial delay in seconds (doubles each retry)
     """
     def decorator(func):
-        def wrapper(*args, **kwargs):
-            last_exception = None
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
             for attempt in range(max_attempts):
                 try:
-                    return func(*args, **kwargs)
-                except (requests.exceptions.ConnectionError,
-                        requests.exceptions.Timeout) as e:
-                    last_exception = e
-                    if attempt < max_attempts - 1:
-                        delay = base_delay * (2 ** attempt)  # Exponential backoff
-                        print(f"🔄 Retry attempt {attempt + 1}/{max_attempts} after {delay}s...")
-                        time.sleep(delay)
-                    else:
+                    return await func(*args, **kwargs)
+                except (httpx.TransportError, TransientStorageError):
+                    if attempt == max_attempts - 1:
                         # Last attempt failed
                         raise
-                except Exception as e:
-                    # Don't retry on non-transient errors
-                    raise
-            raise last_exception
+                    delay = base_delay * (2 ** attempt)  # Exponential backoff
+                    print(f"🔄 Retry attempt {attempt + 1}/{max_attempts} after {delay}s...")
+                    await asyncio.sleep(delay)
         return wrapper
     return decorator
 
@@ -151,30 +246,153 @@ def validate_image_file(file: UploadFile) -> Tuple[bool, Optional[str]]:
     return True, None
 
 
-def validate_image_content(file_content: bytes) -> Tuple[bool, Optional[str]]:
+def _dms_to_degrees(dms, ref) -> float:
+    """Convert EXIF (degrees, minutes, seconds) rationals to signed decimal degrees."""
+    degrees, minutes, seconds = (float(v) for v in dms)
+    value = degrees + minutes / 60 + seconds / 3600
+    if isinstance(ref, bytes):
+        ref = ref.decode("ascii", "ignore")
+    if ref and ref.strip("\x00 ").upper() in ("S", "W"):
+        value = -value
+    return value
+
+
+def extract_gps_coordinates(image: Image.Image) -> Optional[Tuple[float, float]]:
+    """
+    Read GPS coordinates from an image's EXIF data (phone photos usually have them).
+
+    Only the raw EXIF block from the header is parsed (no pixel decoding), so
+    this is safe to call right before image.verify().
+
+    Returns:
+        (lat, lon) in decimal degrees, or None if absent or malformed
+    """
+    raw_exif = image.info.get("exif")
+    if not raw_exif:
+        return None
+
+    try:
+        exif = Image.Exif()
+        exif.load(raw_exif)
+        gps = exif.get_ifd(ExifTags.IFD.GPSInfo)
+        if not gps:
+            return None
+        lat = _dms_to_degrees(gps[ExifTags.GPS.GPSLatitude], gps.get(ExifTags.GPS.GPSLatitudeRef))
+        lon = _dms_to_degrees(gps[ExifTags.GPS.GPSLongitude], gps.get(ExifTags.GPS.GPSLongitudeRef))
+    except Exception:
+        return None
+
+    # (0, 0) is what many cameras write when they had no fix
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180) or (lat == 0 and lon == 0):
+        return None
+    return round(lat, 6), round(lon, 6)
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def validate_image_content(
+    file_content: Union[bytes, BinaryIO],
+    info: Optional[ImageInfo] = None,
+    timings: Optional[Dict[str, float]] = None,
+) -> Tuple[bool, Optional[str]]:
     """
     Validate image content using PIL (deeper validation).
     Detects corrupted images and verifies it's actually an image.
 
+    Image.open() only parses the header, so the dimension limits are checked
+    before verify() touches the image data: a small file claiming huge
+    dimensions (decompression bomb) is rejected without decoding it.
+
+    CPU-bound for large images: call it from a worker thread in async code
+    (see validate_spooled_image).
+
     Args:
-        file_content: Raw file bytes
+        file_content: Raw file bytes, or a binary file object positioned at the start
+        info: Optional ImageInfo to fill with dimensions, format and EXIF GPS
+              coordinates gathered during the same PIL pass
+        timings: Optional dict to record "header" and "verify" durations (ms) in
 
     Returns:
         (is_valid, error_message)
     """
+    timings = timings if timings is not None else {}
     try:
-        image = Image.open(io.BytesIO(file_content))
+        start = time.perf_counter()
+        if isinstance(file_content, (bytes, bytearray)):
+            file_content = io.BytesIO(file_content)
+        image = Image.open(file_content)
+
+        # Header-only safety checks
+        if image.width > MAX_IMAGE_DIMENSION or image.height > MAX_IMAGE_DIMENSION:
+            return False, f"Image dimensions too large (max {MAX_IMAGE_DIMENSION}x{MAX_IMAGE_DIMENSION})"
+        if image.width * image.height > MAX_IMAGE_PIXELS:
+            return False, f"Image has too many pixels (max {MAX_IMAGE_PIXELS // 1_000_000} megapixels)"
+
+        if info is not None:
+            info.gps = extract_gps_coordinates(image)
+        timings["header"] = _elapsed_ms(start)
+
+        start = time.perf_counter()
         image.verify()  # Verify it's a valid image
+        timings["verify"] = _elapsed_ms(start)
 
-        # Additional safety checks
-        if image.width > 10000 or image.height > 10000:
-            return False, "Image dimensions too large (max 10000x10000)"
+        if info is not None:
+            info.width, info.height, info.format = image.width, image.height, image.format
 
         return True, None
     except Exception as e:
         return False, f"Invalid or corrupted image: {str(e)}"
 
 
+# Threads validating spooled uploads (PIL releases the GIL while decoding)
+_validation_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_validation_executor() -> ThreadPoolExecutor:
+    """Shared thread pool for image validation (created on first use)."""
+    global _validation_executor
+    if _validation_executor is None:
+        _validation_executor = ThreadPoolExecutor(
+            max_workers=settings.image_validation_workers, thread_name_prefix="image-validation"
+        )
+    return _validation_executor
+
+
+def shutdown_validation_executor() -> None:
+    """Stop the validation threads (app shutdown)."""
+    global _validation_executor
+    if _validation_executor is not None:
+        _validation_executor.shutdown(wait=True, cancel_futures=True)
+    _validation_executor = None
+
+
+def _validate_file(path: str, info: ImageInfo, timings: Dict[str, float]) -> Tuple[bool, Optional[str]]:
+    with open(path, "rb") as f:
+        return validate_image_content(f, info, timings)
+
+
+async def validate_spooled_image(
+    path: str, timings: Optional[Dict[str, float]] = None
+) -> Tuple[ImageInfo, Optional[str]]:
+    """
+    Run validate_image_content on a file in the validation thread pool.
+
+    At most image_validation_workers images are decoded at once; further
+    uploads wait for a free thread without blocking the event loop.
+
+    Returns:
+        (info, error_message) - error_message is None for a valid image
+    """
+    info = ImageInfo()
+    loop = asyncio.get_running_loop()
+    _, error = await loop.run_in_executor(
+        get_validation_executor(), _validate_file, path, info, timings if timings is not None else {}
+    )
+    return info, error
+
+
 async def upload_to_bunny(file: UploadFile, folder: str = "sightings") -> str:
     """
     Upload image to Bunny.net Storage and return CDN URL.
@@ -186,112 +404,389 @@ async def upload_to_bunny(file: UploadFile, folder: str = "sightings") -> str:
     Returns:
         CDN URL of uploaded image (e.g., https://catatlas.b-cdn.net/sightings/abc123.jpg)
 
+    Raises:
+        HTTPException: If validation fails or upload errors
+    """
+    uploaded = await upload_image(file, folder=folder)
+    return uploaded.url
+
+
+async def upload_image(
+    file: UploadFile,
+    folder: str = "sightings",
+    find_existing: Optional[Callable[[str], Optional[UploadedImage]]] = None,
+) -> UploadedImage:
+    """
+    Upload image to Bunny.net Storage.
+
+    Same as upload_to_bunny(), but also returns the metadata collected during
+    validation (dimensions, EXIF GPS coordinates).
+
+    The upload is streamed: it is copied to a temp file in chunks (size limit
+    enforced as we go), validated from that file and streamed from it to
+    storage, so per-request memory stays bounded regardless of image size.
+
+    Files are stored under the sha256 of their content. If find_existing is
+    given, it is called with that digest; when it returns a stored image,
+    no storage request is made and its URLs are returned instead.
+
     Raises:
         HTTPException: If validation fails or upload errors
     """
     # Validate configuration
     try:
-        validate_bunny_config()
+        validate_storage_config()
     except RuntimeError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    # Validate file metadata
-    is_valid, error = validate_image_file(file)
-    if not is_valid:
-        raise HTTPException(status_code=400, detail=error)
-
-    # Read file content
+    spooled = await spool_upload(file)
     try:
-        file_content = await file.read()
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Failed to read file: {str(e)}")
+        return await store_upload(spooled, folder=folder, find_existing=find_existing)
+    finally:
+        spooled.cleanup()
+
 
-    # Validate actual file size
-    if len(file_content) > settings.max_upload_size_bytes:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Max size: {settings.max_upload_size_mb}MB"
+async def store_upload(
+    spooled: "SpooledImage",
+    folder: str = "sightings",
+    find_existing: Optional[Callable[[str], Optional[UploadedImage]]] = None,
+) -> UploadedImage:
+    """
+    Store an already spooled upload: original plus variants, or nothing if
+    find_existing knows the content. The spool file is left for the caller.
+
+    Raises:
+        HTTPException: If the upload fails
+    """
+    timings = dict(spooled.timings)
+    start = time.perf_counter()
+    # find_existing is a (blocking) database lookup
+    existing = await asyncio.to_thread(find_existing, spooled.sha256) if find_existing is not None else None
+    if existing is not None:
+        dhash = existing.dhash or await generate_dhash(spooled.path)
+        timings["store"] = _elapsed_ms(start)
+        return UploadedImage(
+            url=existing.url,
+            info=spooled.info,
+            variants=existing.variants,
+            sha256=spooled.sha256,
+            deduplicated=True,
+            dhash=dhash,
+            timings=timings,
         )
 
-    # Validate image content
-    is_valid, error = validate_image_content(file_content)
-    if not is_valid:
-        raise HTTPException(status_code=400, detail=error)
+    basename = spooled.sha256 or _storage_basename()
+    variant_files: Dict[str, Tuple[str, int]] = {}
+    try:
+        # Hash and render variants in the process pool while the original uploads
+        dhash_task = asyncio.ensure_future(generate_dhash(spooled.path))
+        variants_task = None
+        if settings.image_variants_enabled:
+            variants_task = asyncio.ensure_future(generate_variants(spooled.path))
+        try:
+            cdn_url = await store_spooled_image(spooled, folder=folder, basename=basename)
+        finally:
+            dhash = await dhash_task
+            if variants_task is not None:
+                variant_files = await variants_task
+
+        variants = await store_variants(variant_files, folder=folder, basename=basename)
+    finally:
+        for path, _ in variant_files.values():
+            _remove_quietly(path)
+
+    timings["store"] = _elapsed_ms(start)
+    return UploadedImage(
+        url=cdn_url, info=spooled.info, variants=variants, sha256=spooled.sha256, dhash=dhash,
+        timings=timings,
+    )
+
+
+@dataclass
+class SpooledImage:
+    """A validated upload, copied to a local temp file."""
+    path: str
+    size: int
+    ext: str
+    info: ImageInfo = field(default_factory=ImageInfo)
+    sha256: str = ""  # Hex digest, computed while spooling
+    timings: Dict[str, float] = field(default_factory=dict)  # stage -> milliseconds
+
+    def cleanup(self) -> None:
+        """Remove the temp file (safe to call more than once)."""
+        _remove_quietly(self.path)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
 
-    # Generate unique filename
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    unique_id = uuid.uuid4().hex[:8]
 
-    # Preserve original extension
-    ext = ""
+def _file_extension(file: UploadFile) -> str:
+    """Pick a storage file extension from the filename or content type."""
     if file.filename:
         ext = file.filename.rsplit(".", 1)[-1].lower()
         if ext not in ["jpg", "jpeg", "png", "webp", "gif"]:
             ext = "jpg"  # Default fallback
-    else:
-        # Detect from content type
-        ext_map = {
-            "image/jpeg": "jpg",
-            "image/png": "png",
-            "image/webp": "webp",
-            "image/gif": "gif",
-        }
-        ext = ext_map.get(file.content_type, "jpg")
+        return ext
+
+    # Detect from content type
+    ext_map = {
+        "image/jpeg": "jpg",
+        "image/png": "png",
+        "image/webp": "webp",
+        "image/gif": "gif",
+    }
+    return ext_map.get(file.content_type, "jpg")
 
-    filename = f"{timestamp}_{unique_id}.{ext}"
-    storage_path = f"{folder}/{filename}"
 
-    # Check circuit breaker
-    if not bunny_circuit_breaker.can_attempt():
-        raise HTTPException(
-            status_code=503,
-            detail="Image upload service temporarily unavailable. Please try again later."
-        )
+async def spool_upload(file: UploadFile, spool_dir: Optional[str] = None) -> SpooledImage:
+    """
+    Validate an upload and copy it to a temp file, one chunk at a time.
 
-    # Upload to Bunny.net Storage with retry logic
-    storage_url = f"{settings.bunny_storage_url}/{storage_path}"
+    The size limit is enforced while reading, so an oversized upload is
+    rejected after at most max_upload_size_bytes + one chunk, and never
+    held in memory as a whole. The image itself is then validated off the
+    event loop (validate_spooled_image).
 
-    headers = {
-        "AccessKey": settings.bunny_api_key,
-        "Content-Type": "application/octet-stream",
-    }
+    Stage durations ("spool", "header", "verify", in ms) are recorded in the
+    result's timings.
 
-    @retry_with_backoff(max_attempts=3, base_delay=1.0)
-    def upload_with_retry():
-        response = requests.put(
-            storage_url,
-            data=file_content,
-            headers=headers,
-            timeout=30  # 30 second timeout
-        )
+    Args:
+        file: The uploaded file from FastAPI
+        spool_dir: Directory for the spool file (default: system temp dir).
+                   Use a persistent directory if the file must survive restarts.
+
+    Raises:
+        HTTPException: If validation fails
+    """
+    # Validate file metadata
+    is_valid, error = validate_image_file(file)
+    if not is_valid:
+        raise HTTPException(status_code=400, detail=error)
+
+    if spool_dir:
+        os.makedirs(spool_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix="upload_", dir=spool_dir)
+    size = 0
+    digest = hashlib.sha256()
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            while True:
+                try:
+                    chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                except Exception as e:
+                    raise HTTPException(status_code=400, detail=f"Failed to read file: {str(e)}")
+                if not chunk:
+                    break
+
+                # Validate actual file size
+                size += len(chunk)
+                if size > settings.max_upload_size_bytes:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"File too large. Max size: {settings.max_upload_size_mb}MB"
+                    )
+                spool.write(chunk)
+                digest.update(chunk)
+
+        timings["spool"] = _elapsed_ms(start)
+
+        # Validate image content (PIL reads the spooled file incrementally)
+        info, error = await validate_spooled_image(path, timings)
+        if error is not None:
+            raise HTTPException(status_code=400, detail=error)
+    except BaseException:
+        os.remove(path)
+        raise
+
+    return SpooledImage(
+        path=path, size=size, ext=_file_extension(file), info=info, sha256=digest.hexdigest(),
+        timings=timings,
+    )
+
+
+async def _iter_file(path: str, chunk_size: int = UPLOAD_CHUNK_SIZE):
+    """Yield a file's content in chunks (streaming request body)."""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _storage_basename() -> str:
+    """Generate a unique file name stem (variants share it with their original)."""
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    unique_id = uuid.uuid4().hex[:8]
+    return f"{timestamp}_{unique_id}"
 
-        if response.status_code not in [200, 201]:
-            error_detail = f"Bunny.net upload failed: {response.status_code}"
-            if response.text:
-                # Log full error for debugging
-                print(f"❌ Bunny.net API Error: {response.text}")
-                error_detail += f" - {response.text[:500]}"  # Show more details
-            raise requests.exceptions.RequestException(error_detail)
 
-        return response
+async def store_spooled_image(
+    spooled: SpooledImage,
+    folder: str = "sightings",
+    basename: Optional[str] = None,
+) -> str:
+    """
+    Stream a spooled image to Bunny.net Storage and return its CDN URL.
 
+    Stored as <basename>.<ext>; upload_image passes the content hash, other
+    callers get a unique timestamp-based name.
+
+    Raises:
+        HTTPException: If the upload fails
+    """
+    filename = f"{basename or _storage_basename()}.{spooled.ext}"
+    return await _store_file(spooled.path, spooled.size, f"{folder}/{filename}")
+
+
+async def _store_file(path: str, size: int, storage_path: str) -> str:
+    """Store a local file at storage_path with the configured backend; returns its public URL."""
+    return await get_storage().store_file(path, size, storage_path)
+
+
+# Process pool for variant rendering: PIL decode/resize is CPU bound and holds
+# the GIL, so it runs outside the API worker process
+_variant_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_variant_executor() -> ProcessPoolExecutor:
+    """Return the shared variant rendering pool, creating it on first use."""
+    global _variant_executor
+    if _variant_executor is None:
+        _variant_executor = ProcessPoolExecutor(max_workers=settings.image_variant_workers)
+    return _variant_executor
+
+
+def shutdown_variant_executor() -> None:
+    """Stop the variant rendering pool (called on app shutdown)."""
+    global _variant_executor
+    if _variant_executor is not None:
+        _variant_executor.shutdown(wait=True, cancel_futures=True)
+    _variant_executor = None
+
+
+def render_variants(source_path: str) -> Dict[str, Tuple[str, int]]:
+    """
+    Render every IMAGE_VARIANTS entry of an image into temp files.
+
+    Runs in a worker process. The image is decoded once (JPEGs at reduced
+    scale via draft mode), rotated according to its EXIF orientation and
+    downscaled per variant; images smaller than a variant are not enlarged.
+
+    Returns:
+        variant name -> (temp file path, size in bytes)
+    """
+    largest_edge = max(max_edge for max_edge, _, _ in IMAGE_VARIANTS.values())
+    rendered: Dict[str, Tuple[str, int]] = {}
+    try:
+        with Image.open(source_path) as image:
+            image.draft("RGB", (largest_edge, largest_edge))
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+
+            for name, (max_edge, image_format, ext) in IMAGE_VARIANTS.items():
+                variant = image.copy()
+                variant.thumbnail((max_edge, max_edge))
+                fd, path = tempfile.mkstemp(prefix=f"variant_{name}_", suffix=f".{ext}")
+                rendered[name] = (path, 0)
+                with os.fdopen(fd, "wb") as out:
+                    variant.save(out, image_format, quality=VARIANT_QUALITY)
+                rendered[name] = (path, os.path.getsize(path))
+    except BaseException:
+        for path, _ in rendered.values():
+            _remove_quietly(path)
+        raise
+    return rendered
+
+
+async def generate_variants(source_path: str) -> Dict[str, Tuple[str, int]]:
+    """
+    Render variants for a spooled image in the process pool.
+
+    Best effort: on failure an empty dict is returned and clients fall back
+    to the original photo_url.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_variant_executor(), render_variants, source_path)
+    except Exception as e:
+        print(f"⚠️  Image variant generation failed: {str(e)}")
+        return {}
+
+
+def compute_dhash(source_path: str) -> str:
+    """
+    Perceptual difference hash of an image (runs in a worker process).
+
+    The image is reduced to (DHASH_SIZE + 1) x DHASH_SIZE grey pixels and each
+    bit records whether a pixel is brighter than its right neighbour. Resized,
+    recompressed or slightly edited copies of a photo get hashes within a few
+    bits of each other (Hamming distance); unrelated photos differ in ~half.
+
+    Returns:
+        The hash as DHASH_SIZE**2 / 4 hex chars (16 for the default 64 bits)
+    """
+    width, height = DHASH_SIZE + 1, DHASH_SIZE
+    with Image.open(source_path) as image:
+        image.draft("L", (width * 8, height * 8))  # JPEG: decode at reduced scale
+        image = ImageOps.exif_transpose(image).convert("L")
+        pixels = image.resize((width, height), Image.Resampling.LANCZOS).tobytes()
+
+    bits = 0
+    for row in range(height):
+        for col in range(DHASH_SIZE):
+            left, right = pixels[row * width + col], pixels[row * width + col + 1]
+            bits = (bits << 1) | (left > right)
+    return f"{bits:0{DHASH_SIZE * DHASH_SIZE // 4}x}"
+
+
+async def generate_dhash(source_path: str) -> Optional[str]:
+    """Compute compute_dhash in the process pool. Best effort: None on failure."""
+    loop = asyncio.get_running_loop()
     try:
-        upload_with_retry()
-        bunny_circuit_breaker.call_succeeded()  # Mark success
-
-    except requests.exceptions.Timeout:
-        bunny_circuit_breaker.call_failed()
-        raise HTTPException(status_code=504, detail="Upload timeout. Please try again.")
-    except (requests.exceptions.ConnectionError, requests.exceptions.RequestException) as e:
-        bunny_circuit_breaker.call_failed()
-        raise HTTPException(status_code=503, detail=f"Upload failed: {str(e)}")
+        return await loop.run_in_executor(get_variant_executor(), compute_dhash, source_path)
     except Exception as e:
-        bunny_circuit_breaker.call_failed()
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+        print(f"⚠️  Perceptual hash failed: {str(e)}")
+        return None
+
+
+async def store_variants(
+    variant_files: Dict[str, Tuple[str, int]],
+    folder: str,
+    basename: str,
+) -> Dict[str, str]:
+    """
+    Upload rendered variants concurrently, next to the original.
+
+    A variant that fails to upload is skipped (logged), the others are kept.
+
+    Returns:
+        variant name -> CDN URL
+    """
+    names = list(variant_files)
+
+    async def store(name: str) -> str:
+        path, size = variant_files[name]
+        ext = IMAGE_VARIANTS[name][2]
+        return await _store_file(path, size, f"{folder}/{basename}_{name}.{ext}")
 
-    # Return CDN URL
-    cdn_url = f"{settings.bunny_cdn_url}/{storage_path}"
-    return cdn_url
+    results = await asyncio.gather(*(store(name) for name in names), return_exceptions=True)
+
+    variants = {}
+    for name, result in zip(names, results):
+        if isinstance(result, BaseException):
+            detail = result.detail if isinstance(result, HTTPException) else str(result)
+            print(f"⚠️  Failed to store {name} variant: {detail}")
+            continue
+        variants[name] = result
+    return variants
 
 
 async def delete_from_bunny(url: str) -> bool:
@@ -306,59 +801,370 @@ async def delete_from_bunny(url: str) -> bool:
 
     Note: This function fails gracefully - returns False instead of raising exceptions.
     """
-    try:
-        # Validate configuration
-        validate_bunny_config()
+    return await BunnyStorage().delete(url)
 
-        # Check circuit breaker (but don't fail hard for deletes)
-        if not bunny_circuit_breaker.can_attempt():
-            print("⚠️  Skipping delete due to circuit breaker (will retry later)")
-            return False
 
-        # Extract path from CDN URL
-        # Example: https://catatlas.b-cdn.net/sightings/file.jpg -> sightings/file.jpg
-        if settings.bunny_cdn_hostname not in url:
-            print(f"Warning: URL doesn't match CDN hostname: {url}")
-            return False
+async def delete_stored_file(url: str) -> bool:
+    """
+    Delete a stored file by its public URL, with the configured backend.
+
+    Returns:
+        True if deleted (or already gone), False otherwise (never raises)
+    """
+    return await get_storage().delete(url)
+
+
+@dataclass
+class StoredObject:
+    """A file in the storage zone, as reported by the Bunny.net list API."""
+    url: str  # CDN URL (same form as stored in photo_url)
+    size: int
+    last_changed: Optional[datetime]  # UTC
+
 
-        # Get path after CDN hostname
-        path = url.split(settings.bunny_cdn_hostname + "/", 1)[-1]
+async def list_storage_objects(folder: str = "sightings") -> List[StoredObject]:
+    """
+    List the files in a storage folder (not recursive), with the configured backend.
+
+    Raises:
+        RuntimeError: If storage is not configured
+        StorageError: If the listing fails
+        httpx.TransportError: If Bunny.net storage is unreachable
+    """
+    return await get_storage().list_objects(folder)
+
+
+# ============================================================================
+# Storage Backends
+# ============================================================================
+
+class StorageBackend(ABC):
+    """
+    Where uploaded files live. Paths are relative ("sightings/<sha256>.jpg");
+    files are addressed by the public URL returned from store_file().
+    """
+
+    @abstractmethod
+    def validate_config(self) -> None:
+        """Raise RuntimeError if the backend can't be used."""
+
+    @abstractmethod
+    async def store_file(self, path: str, size: int, storage_path: str) -> str:
+        """
+        Store a local file at storage_path and return its public URL.
+
+        Raises:
+            HTTPException: If storing fails
+        """
+
+    @abstractmethod
+    async def delete(self, url: str) -> bool:
+        """Delete a file by public URL. True if deleted or already gone; never raises."""
 
-        # Delete from storage
-        storage_url = f"{settings.bunny_storage_url}/{path}"
+    @abstractmethod
+    async def list_objects(self, folder: str) -> List[StoredObject]:
+        """List the files in a folder (not recursive)."""
+
+
+class BunnyStorage(StorageBackend):
+    """Bunny.net Storage, served from its CDN (retries + circuit breaker)."""
+
+    def validate_config(self) -> None:
+        validate_bunny_config()
+
+    async def store_file(self, path: str, size: int, storage_path: str) -> str:
+        """
+        Stream a local file to Bunny.net Storage at storage_path and return its CDN URL.
+
+        Raises:
+            HTTPException: If the upload fails
+        """
+        # Check circuit breaker
+        if not bunny_circuit_breaker.can_attempt():
+            raise HTTPException(
+                status_code=503,
+                detail="Image upload service temporarily unavailable. Please try again later."
+            )
+
+        # Upload to Bunny.net Storage with retry logic
+        storage_url = f"{settings.bunny_storage_url}/{storage_path}"
 
         headers = {
             "AccessKey": settings.bunny_api_key,
+            "Content-Type": "application/octet-stream",
+            "Content-Length": str(size),
         }
 
-        @retry_with_backoff(max_attempts=2, base_delay=0.5)
-        def delete_with_retry():
-            response = requests.delete(
+        client = get_http_client()
+
+        @retry_with_backoff(max_attempts=3, base_delay=1.0)
+        async def upload_with_retry():
+            # Fresh stream per attempt: the body is re-read from the spool on retry
+            response = await client.put(
                 storage_url,
+                content=_iter_file(path),
                 headers=headers,
-                timeout=10
+                timeout=30.0  # 30 second timeout
             )
 
-            # 200 = deleted, 404 = already gone (both OK)
-            if response.status_code in [200, 404]:
-                return True
-
-            # Other errors
-            if response.status_code >= 500:
-                # Server error - worth retrying
-                raise requests.exceptions.RequestException(
-                    f"Server error: {response.status_code}"
+            if response.status_code not in [200, 201]:
+                error_detail = f"Bunny.net upload failed: {response.status_code}"
+                if response.text:
+                    # Log full error for debugging
+                    print(f"❌ Bunny.net API Error: {response.text}")
+                    error_detail += f" - {response.text[:500]}"  # Show more details
+                if response.status_code >= 500:
+                    raise TransientStorageError(error_detail)
+                raise StorageError(error_detail)
+
+            return response
+
+        try:
+            await upload_with_retry()
+            bunny_circuit_breaker.call_succeeded()  # Mark success
+
+        except httpx.TimeoutException:
+            bunny_circuit_breaker.call_failed()
+            raise HTTPException(status_code=504, detail="Upload timeout. Please try again.")
+        except (httpx.TransportError, StorageError) as e:
+            bunny_circuit_breaker.call_failed()
+            raise HTTPException(status_code=503, detail=f"Upload failed: {str(e)}")
+        except Exception as e:
+            bunny_circuit_breaker.call_failed()
+            raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+        # Return CDN URL
+        return f"{settings.bunny_cdn_url}/{storage_path}"
+
+    async def delete(self, url: str) -> bool:
+        """
+        Delete image from Bunny.net Storage by URL.
+
+        Note: Fails gracefully - returns False instead of raising exceptions.
+        """
+        try:
+            # Validate configuration
+            self.validate_config()
+
+            # Check circuit breaker (but don't fail hard for deletes)
+            if not bunny_circuit_breaker.can_attempt():
+                print("⚠️  Skipping delete due to circuit breaker (will retry later)")
+                return False
+
+            # Extract path from CDN URL
+            # Example: https://catatlas.b-cdn.net/sightings/file.jpg -> sightings/file.jpg
+            if settings.bunny_cdn_hostname not in url:
+                print(f"Warning: URL doesn't match CDN hostname: {url}")
+                return False
+
+            # Get path after CDN hostname
+            path = url.split(settings.bunny_cdn_hostname + "/", 1)[-1]
+
+            # Delete from storage
+            storage_url = f"{settings.bunny_storage_url}/{path}"
+
+            headers = {
+                "AccessKey": settings.bunny_api_key,
+            }
+
+            client = get_http_client()
+
+            @retry_with_backoff(max_attempts=2, base_delay=0.5)
+            async def delete_with_retry():
+                response = await client.delete(
+                    storage_url,
+                    headers=headers,
+                    timeout=10.0
                 )
 
-            # Client error - don't retry
+                # 200 = deleted, 404 = already gone (both OK)
+                if response.status_code in [200, 404]:
+                    return True
+
+                # Other errors
+                if response.status_code >= 500:
+                    # Server error - worth retrying
+                    raise TransientStorageError(
+                        f"Server error: {response.status_code}"
+                    )
+
+                # Client error - don't retry
+                return False
+
+            result = await delete_with_retry()
+            if result:
+                bunny_circuit_breaker.call_succeeded()
+            return result
+
+        except Exception as e:
+            print(f"Warning: Failed to delete image: {str(e)}")
+            bunny_circuit_breaker.call_failed()
             return False
 
-        result = delete_with_retry()
-        if result:
-            bunny_circuit_breaker.call_succeeded()
-        return result
+    async def list_objects(self, folder: str) -> List[StoredObject]:
+        """
+        Raises:
+            RuntimeError: If Bunny.net is not configured
+            StorageError: If the listing fails
+            httpx.TransportError: If storage is unreachable
+        """
+        self.validate_config()
 
-    except Exception as e:
-        print(f"Warning: Failed to delete image: {str(e)}")
-        bunny_circuit_breaker.call_failed()
-        return False
+        storage_url = f"{settings.bunny_storage_url}/{folder}/"
+        headers = {
+            "AccessKey": settings.bunny_api_key,
+            "Accept": "application/json",
+        }
+
+        client = get_http_client()
+
+        @retry_with_backoff(max_attempts=3, base_delay=1.0)
+        async def list_with_retry():
+            response = await client.get(storage_url, headers=headers, timeout=30.0)
+            if response.status_code == 404:
+                return []  # Folder doesn't exist yet
+            if response.status_code != 200:
+                error_detail = f"Bunny.net list failed: {response.status_code}"
+                if response.status_code >= 500:
+                    raise TransientStorageError(error_detail)
+                raise StorageError(error_detail)
+            return response.json()
+
+        objects = []
+        for item in await list_with_retry():
+            if item.get("IsDirectory"):
+                continue
+            last_changed = None
+            if item.get("LastChanged"):
+                try:
+                    last_changed = datetime.fromisoformat(item["LastChanged"].rstrip("Z"))
+                except ValueError:
+                    pass
+            objects.append(StoredObject(
+                url=f"{settings.bunny_cdn_url}/{folder}/{item['ObjectName']}",
+                size=item.get("Length", 0),
+                last_changed=last_changed,
+            ))
+        return objects
+
+
+class LocalStorage(StorageBackend):
+    """
+    Files on local disk under settings.local_storage_dir, served by the API
+    itself (GET /media/...). For small self-hosted deployments and offline tests:
+    no external round trip per upload or view.
+    """
+
+    @property
+    def root(self) -> str:
+        return os.path.abspath(settings.local_storage_dir)
+
+    @property
+    def base_url(self) -> str:
+        return settings.local_storage_base_url.rstrip("/")
+
+    def validate_config(self) -> None:
+        if not settings.local_storage_dir:
+            raise RuntimeError("Local storage not configured. Set LOCAL_STORAGE_DIR.")
+
+    def resolve(self, storage_path: str) -> Optional[str]:
+        """Absolute file path for a storage path, or None if it escapes the root."""
+        full_path = os.path.abspath(os.path.join(self.root, storage_path))
+        if os.path.commonpath([full_path, self.root]) != self.root or full_path == self.root:
+            return None
+        return full_path
+
+    def storage_path_for(self, url: str) -> Optional[str]:
+        """Storage path for one of our public URLs, or None if it isn't one."""
+        prefix = self.base_url + "/"
+        if not url.startswith(prefix):
+            return None
+        return url[len(prefix):]
+
+    async def store_file(self, path: str, size: int, storage_path: str) -> str:
+        target = self.resolve(storage_path)
+        if target is None:
+            raise HTTPException(status_code=400, detail="Invalid storage path")
+
+        def copy():
+            # Content-addressed names: an existing file already has these bytes
+            if os.path.exists(target):
+                return
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".incoming_")
+            os.close(fd)
+            try:
+                shutil.copyfile(path, tmp_path)  # sendfile() on Linux
+                os.replace(tmp_path, target)  # Atomic: readers never see partial files
+            except BaseException:
+                _remove_quietly(tmp_path)
+                raise
+
+        try:
+            await asyncio.to_thread(copy)
+        except OSError as e:
+            raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
+        return f"{self.base_url}/{storage_path}"
+
+    async def delete(self, url: str) -> bool:
+        storage_path = self.storage_path_for(url)
+        target = self.resolve(storage_path) if storage_path else None
+        if target is None:
+            print(f"Warning: URL doesn't match local storage: {url}")
+            return False
+        try:
+            await asyncio.to_thread(_remove_quietly, target)
+            return True
+        except OSError as e:
+            print(f"Warning: Failed to delete image: {str(e)}")
+            return False
+
+    async def list_objects(self, folder: str) -> List[StoredObject]:
+        self.validate_config()
+        directory = self.resolve(folder)
+        if directory is None or not os.path.isdir(directory):
+            return []
+
+        def scan():
+            objects = []
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.is_file() or entry.name.startswith(".incoming_"):
+                        continue
+                    stat_result = entry.stat()
+                    objects.append(StoredObject(
+                        url=f"{self.base_url}/{folder}/{entry.name}",
+                        size=stat_result.st_size,
+                        last_changed=datetime.utcfromtimestamp(stat_result.st_mtime),
+                    ))
+            return objects
+
+        return await asyncio.to_thread(scan)
+
+
+# Available backends (settings.storage_backend)
+STORAGE_BACKENDS = {
+    "bunny": BunnyStorage,
+    "local": LocalStorage,
+}
+
+
+def get_storage() -> StorageBackend:
+    """Return the configured storage backend."""
+    try:
+        return STORAGE_BACKENDS[settings.storage_backend]()
+    except KeyError:
+        raise RuntimeError(
+            f"Unknown STORAGE_BACKEND {settings.storage_backend!r}. "
+            f"Choose one of: {', '.join(STORAGE_BACKENDS)}"
+        )
+
+
+def validate_storage_config() -> None:
+    """
+    Validate that the configured storage backend can be used.
+
+    Raises:
+        RuntimeError: If configuration is incomplete
+    """
+    get_storage().validate_config()
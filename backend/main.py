@@ -16,33 +16,47 @@ This file includes:
     POST /entries/{entry_id}/favorite
     GET  /entries/{entry_id}/analysis
     POST /entries/{entry_id}/analyze
+    GET  /entries/analyses        (batch: many analyses in one query)
+    POST /entries/analyze         (batch: analyze many entries in one transaction)
     GET  /health   (optional, but helpful)
 """
 
 from __future__ import annotations
 
 import asyncio
+import base64
+import csv
 import hashlib
+import io
 import json
 import logging
 import random
 import re
 import sqlite3
 import os
+import threading
 import time
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from math import radians, cos, sin, asin, sqrt
 from pathlib import Path
-from collections import Counter
+from collections import Counter, OrderedDict
+from operator import itemgetter
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional, Literal, Union, TypeVar, Callable, Awaitable
-from fastapi import FastAPI, HTTPException, File, UploadFile, Form, Query
+from typing import Any, List, Optional, Literal, Union, TypeVar, Callable, Awaitable, Tuple
+from fastapi import FastAPI, BackgroundTasks, HTTPException, File, UploadFile, Form, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, field_validator
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, ValidationError, field_validator
 from config import settings
-from image_upload import upload_to_bunny, delete_from_bunny, validate_bunny_config
+from image_upload import (
+    LocalStorage, SpooledImage, UploadedImage, upload_image, spool_upload, store_upload, get_storage,
+    delete_stored_file, list_storage_objects, validate_storage_config, close_http_client,
+    shutdown_variant_executor, shutdown_validation_executor,
+)
 
 # Async HTTP client for geocoding
 try:
@@ -77,6 +91,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Pagination cursor of GET /entries and GET /cats
 )
 
 
@@ -96,14 +111,50 @@ async def startup_event():
     print(f"🔐 JWT algorithm: {settings.jwt_algorithm}")
     print(f"⏰ Access token expiry: {settings.access_token_expire_minutes} minutes")
 
-    # Check Bunny.net configuration
+    # Check image storage configuration
     try:
-        validate_bunny_config()
-        region_info = settings.bunny_storage_region if settings.bunny_storage_region else "default (Falkenstein)"
-        print(f"☁️  Bunny.net: configured ({region_info} region)")
-        print(f"    Storage endpoint: {settings.bunny_storage_url}")
-    except RuntimeError:
-        print(f"⚠️  Bunny.net: not configured (image uploads disabled)")
+        validate_storage_config()
+        if settings.storage_backend == "local":
+            print(f"💾 Image storage: local disk at {os.path.abspath(settings.local_storage_dir)}")
+            print(f"    Served at: {settings.local_storage_base_url}")
+        else:
+            region_info = settings.bunny_storage_region if settings.bunny_storage_region else "default (Falkenstein)"
+            print(f"☁️  Bunny.net: configured ({region_info} region)")
+            print(f"    Storage endpoint: {settings.bunny_storage_url}")
+        start_storage_maintenance()
+    except RuntimeError as e:
+        if settings.storage_backend == "bunny":
+            print(f"⚠️  Bunny.net: not configured (image uploads disabled)")
+        else:
+            print(f"⚠️  Image storage: {e} (image uploads disabled)")
+
+    start_backfills()
+
+    # Background workers (opt-in)
+    if settings.auto_geocode_entries:
+        start_geocoding()
+        print(f"🌍 Auto-geocoding: enabled (queue size {geocoding_queue.max_size})")
+    if settings.async_image_uploads:
+        start_photo_uploads()
+        resumed = resume_pending_uploads()
+        print(f"📤 Background photo uploads: enabled ({resumed} pending resumed)")
+    if settings.precompute_analyses:
+        analysis_queue.start()
+        print(f"🧠 Analysis precomputation: enabled (batches of {analysis_queue.batch_size})")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers so pending tasks don't outlive the app."""
+    await stop_geocoding()
+    await stop_photo_uploads()
+    await analysis_queue.stop()
+    await stop_storage_maintenance()
+    if _backfill_task is not None:
+        _backfill_task.cancel()
+    await close_http_client()
+    shutdown_variant_executor()
+    shutdown_validation_executor()
 
 
 @app.get("/health")
@@ -178,6 +229,20 @@ def get_cursor(conn):
         return conn.cursor()
 
 
+def get_streaming_cursor(conn, name: str):
+    """
+    Cursor that fetches rows incrementally (use fetchmany).
+
+    PostgreSQL: a named (server-side) cursor, so the result set stays on the
+    server. SQLite cursors already step through results lazily.
+    """
+    if settings.is_postgres:
+        cur = conn.cursor(name=name, cursor_factory=psycopg2.extras.RealDictCursor)
+        cur.itersize = 1000
+        return cur
+    return conn.cursor()
+
+
 def row_get(row, key):
     """
     Get a value from a database row, handling PostgreSQL lowercase column names.
@@ -202,6 +267,50 @@ def row_get(row, key):
     raise KeyError(key)
 
 
+class RowMapper:
+    """
+    Build models from result rows, resolving column names once per query shape.
+
+    Fields are matched to cur.description case-insensitively (PostgreSQL
+    reports unquoted createdAt as createdat), so no per-value row_get()
+    lookups or KeyError fallbacks. Columns that aren't model fields (sort
+    keys, ...) are ignored; fields not selected keep their defaults and stay
+    unset. Works on sqlite3.Row and plain tuples (by position) and on
+    RealDictRow (by the reported name).
+    """
+
+    def __init__(self, model: type[BaseModel]):
+        self.model = model
+        self._plans: dict[tuple, tuple] = {}  # column names -> (fields, indices, keys)
+
+    def _plan(self, cur) -> tuple:
+        names = tuple(column[0] for column in cur.description)
+        plan = self._plans.get(names)
+        if plan is None:
+            position = {name.lower(): i for i, name in enumerate(names)}
+            fields = tuple(f for f in self.model.model_fields if f.lower() in position)
+            indices = tuple(position[f.lower()] for f in fields)
+            plan = (fields, indices, tuple(names[i] for i in indices))
+            self._plans[names] = plan
+        return plan
+
+    def map(self, cur, rows) -> list:
+        """Models for rows fetched from cur."""
+        if not rows:
+            return []
+        fields, indices, keys = self._plan(cur)
+        get = itemgetter(*(keys if isinstance(rows[0], dict) else indices))
+        model = self.model
+        if len(fields) == 1:
+            return [model(**{fields[0]: get(row)}) for row in rows]
+        return [model(**dict(zip(fields, get(row)))) for row in rows]
+
+    def one(self, cur):
+        """Model for cur's next row, or None."""
+        row = cur.fetchone()
+        return None if row is None else self.map(cur, [row])[0]
+
+
 def get_last_insert_id(cur, conn) -> int:
     """Get the last inserted row ID in a database-agnostic way."""
     if settings.is_postgres:
@@ -219,21 +328,119 @@ def sql_placeholder() -> str:
     return "%s" if settings.is_postgres else "?"
 
 
+@lru_cache(maxsize=1024)
+def postgres_sql(sql: str) -> str:
+    """Replace ? placeholders with %s (cached per distinct statement text)."""
+    return sql.replace('?', '%s')
+
+
 def execute_query(cur, sql: str, params: tuple = ()):
     """
     Execute a SQL query with automatic placeholder conversion.
 
     Converts ? to %s for PostgreSQL automatically.
     This allows us to write queries with ? and have them work on both databases.
+    Fixed statements used on hot paths are better registered (see run_query).
     """
-    if settings.is_postgres and '?' in sql:
-        # Replace ? with %s for PostgreSQL
-        sql = sql.replace('?', '%s')
+    if settings.is_postgres:
+        sql = postgres_sql(sql)
 
     cur.execute(sql, params)
     return cur
 
 
+def execute_many(cur, sql: str, params_seq: list) -> None:
+    """
+    Run one statement for many parameter tuples (batched writes).
+
+    Same ? -> %s conversion as execute_query. On PostgreSQL, psycopg2's
+    execute_batch is used: plain executemany() there is a loop of single
+    round trips.
+    """
+    if not params_seq:
+        return
+    if settings.is_postgres:
+        psycopg2.extras.execute_batch(cur, postgres_sql(sql), params_seq)
+    else:
+        cur.executemany(sql, params_seq)
+
+
+# -----------------------------------------------------------------------------
+# Named Queries (compiled per dialect at import)
+# -----------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class NamedQuery:
+    """A statement written with ? placeholders, compiled for both databases."""
+    name: str
+    sqlite: str
+    postgres: str
+    postgres_returning: Optional[str] = None  # INSERT ... RETURNING <returning>
+
+
+QUERIES: dict[str, NamedQuery] = {}
+
+
+def register_query(name: str, sql: str, returning: Optional[str] = None) -> NamedQuery:
+    """
+    Register a statement under name, compiled once for SQLite and PostgreSQL.
+
+    returning: column an INSERT returns on PostgreSQL (see insert_returning_id).
+    """
+    sql = " ".join(sql.split())
+    query = NamedQuery(
+        name=name,
+        sqlite=sql,
+        postgres=postgres_sql(sql),
+        postgres_returning=f"{postgres_sql(sql)} RETURNING {returning}" if returning else None,
+    )
+    QUERIES[name] = query
+    return query
+
+
+def run_query(cur, name: str, params: tuple = ()):
+    """Execute a registered query: no per-call placeholder rewriting."""
+    query = QUERIES[name]
+    cur.execute(query.postgres if settings.is_postgres else query.sqlite, params)
+    return cur
+
+
+def insert_returning_id(cur, name: str, params: tuple) -> int:
+    """Run a registered INSERT and return the new row's id (RETURNING on PostgreSQL)."""
+    query = QUERIES[name]
+    if settings.is_postgres:
+        cur.execute(query.postgres_returning, params)
+        return row_get(cur.fetchone(), "id")
+    cur.execute(query.sqlite, params)
+    return cur.lastrowid
+
+
+# Columns an Entry is built from (SELECT lists and UPDATE ... RETURNING)
+ENTRY_COLUMNS = """id, text, createdAt, isFavorite, nickname, location, cat_id, photo_url,
+    photo_thumb_url, photo_medium_url, photo_webp_url, photo_status,
+    location_normalized, location_lat, location_lon, location_osm_id,
+    location_street, location_number, location_zip, location_city, location_country"""
+
+register_query("cat_exists", "SELECT id FROM cats WHERE id = ?")
+register_query("entry_by_id", f"SELECT {ENTRY_COLUMNS} FROM entries WHERE id = ?")
+register_query("insert_cat", "INSERT INTO cats (name, createdAt) VALUES (?, ?)", returning="id")
+register_query("insert_entry", """
+    INSERT INTO entries (text, createdAt, isFavorite, nickname, location, cat_id, photo_url,
+                         location_street, location_number, location_zip, location_city, location_country)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+""", returning="id")
+register_query("insert_entry_with_photo", """
+    INSERT INTO entries (text, createdAt, isFavorite, nickname, location, cat_id, photo_url,
+                         photo_thumb_url, photo_medium_url, photo_webp_url, photo_status,
+                         location_street, location_number, location_zip, location_city, location_country)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+""", returning="id")
+register_query("insert_pending_upload", """
+    INSERT INTO pending_uploads (entry_id, spool_path, ext, size, sha256, createdAt)
+    VALUES (?, ?, ?, ?, ?, ?)
+""", returning="id")
+
+
 def init_db() -> None:
     """
     Create required tables if they don't exist.
@@ -264,13 +471,15 @@ def init_db() -> None:
             id {id_type},
             name TEXT,
             createdAt TEXT NOT NULL,
-            updatedAt TEXT
+            updatedAt TEXT,
+            version INTEGER NOT NULL DEFAULT 0
         )
         """
     )
 
-    # Add updatedAt column for existing databases
+    # Add updatedAt / version columns for existing databases
     _try_alter_table(conn, cur, "ALTER TABLE cats ADD COLUMN updatedAt TEXT")
+    _try_alter_table(conn, cur, "ALTER TABLE cats ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
 
     # --- Entries table (sightings) - depends on cats ---
     execute_query(cur,
@@ -319,6 +528,55 @@ def init_db() -> None:
     _try_alter_table(conn, cur, "ALTER TABLE entries ADD COLUMN location_city TEXT")
     _try_alter_table(conn, cur, "ALTER TABLE entries ADD COLUMN location_country TEXT")
 
+    # Resized photo variants (generated on upload, next to photo_url)
+    _try_alter_table(conn, cur, "ALTER TABLE entries ADD COLUMN photo_thumb_url TEXT")
+    _try_alter_table(conn, cur, "ALTER TABLE entries ADD COLUMN photo_medium_url TEXT")
+    _try_alter_table(conn, cur, "ALTER TABLE entries ADD COLUMN photo_webp_url TEXT")
+    _try_alter_table(conn, cur, "ALTER TABLE entries ADD COLUMN photo_status TEXT")
+
+    # 1 = geocoding deferred because the queue was full (see requeue_deferred_geocoding)
+    _try_alter_table(conn, cur, "ALTER TABLE entries ADD COLUMN geocode_pending INTEGER NOT NULL DEFAULT 0")
+    execute_query(cur,
+        "CREATE INDEX IF NOT EXISTS idx_entries_geocode_pending ON entries(id) WHERE geocode_pending = 1"
+    )
+
+    # Perceptual hash of the photo (visual similarity in /entries/{id}/matches)
+    _try_alter_table(conn, cur, "ALTER TABLE entries ADD COLUMN photo_dhash TEXT")
+
+    # Bounding-box lookups on coordinates (nearby names for photo GPS)
+    execute_query(cur, "CREATE INDEX IF NOT EXISTS idx_entries_lat_lon ON entries(location_lat, location_lon)")
+
+    # Newest-first sightings of a cat; id makes the order (and keyset cursors) unique
+    execute_query(cur, "DROP INDEX IF EXISTS idx_entries_cat_created")
+    execute_query(cur, "CREATE INDEX IF NOT EXISTS idx_entries_cat_created_id ON entries(cat_id, createdAt, id)")
+
+    # GET /entries filters (newest first by id)
+    execute_query(cur, "CREATE INDEX IF NOT EXISTS idx_entries_cat_id ON entries(cat_id, id)")  # Also cat_id IS NULL
+    execute_query(cur, "CREATE INDEX IF NOT EXISTS idx_entries_favorite ON entries(isFavorite, id)")
+    execute_query(cur, "CREATE INDEX IF NOT EXISTS idx_entries_created ON entries(createdAt)")
+    execute_query(cur, "CREATE INDEX IF NOT EXISTS idx_entries_city ON entries(LOWER(location_city), id)")
+    execute_query(cur,
+        "CREATE INDEX IF NOT EXISTS idx_entries_with_coords ON entries(id) "
+        "WHERE location_lat IS NOT NULL AND location_lon IS NOT NULL"
+    )
+
+    # Text/location keywords per entry: /entries/{id}/matches candidates (see index_entry_keywords)
+    execute_query(cur,
+        f"""
+        CREATE TABLE IF NOT EXISTS entry_keywords (
+            keyword TEXT NOT NULL,
+            entry_id {int_type} NOT NULL,
+            PRIMARY KEY (keyword, entry_id),
+            FOREIGN KEY(entry_id) REFERENCES entries(id) ON DELETE CASCADE
+        )
+        """
+    )
+    # 0 for entries from before entry_keywords (see backfill_entry_keywords)
+    _try_alter_table(conn, cur, "ALTER TABLE entries ADD COLUMN keywords_indexed INTEGER NOT NULL DEFAULT 0")
+    execute_query(cur,
+        "CREATE INDEX IF NOT EXISTS idx_entries_keywords_pending ON entries(id) WHERE keywords_indexed = 0"
+    )
+
     # --- Analyses table - depends on entries ---
     execute_query(cur,
         f"""
@@ -367,17 +625,173 @@ def init_db() -> None:
         )
         """
     )
+    execute_query(cur,
+        "CREATE INDEX IF NOT EXISTS idx_cat_comments_cat_created_id ON cat_comments(cat_id, createdAt, id)"
+    )
+
+    # --- Image blobs - content-addressed uploads shared between entries ---
+    execute_query(cur,
+        """
+        CREATE TABLE IF NOT EXISTS image_blobs (
+            sha256 TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            thumb_url TEXT,
+            medium_url TEXT,
+            webp_url TEXT,
+            refcount INTEGER NOT NULL DEFAULT 0,
+            createdAt TEXT NOT NULL
+        )
+        """
+    )
+    execute_query(cur, "CREATE INDEX IF NOT EXISTS idx_image_blobs_url ON image_blobs(url)")
+    _try_alter_table(conn, cur, "ALTER TABLE image_blobs ADD COLUMN dhash TEXT")
+    # Storage URL lookups (pending deletes, reconciliation) - see _referenced_urls
+    for table, column in STORED_URL_COLUMNS:
+        if (table, column) != ("image_blobs", "url"):
+            execute_query(cur,
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table}({column}) WHERE {column} IS NOT NULL"
+            )
+    # Last upload/lookup of the content: unattached blobs expire IMAGE_BLOB_LEASE after it
+    _try_alter_table(conn, cur, "ALTER TABLE image_blobs ADD COLUMN leasedAt TEXT")
+
+    # --- Pending uploads - spooled photos waiting for the background uploader ---
+    execute_query(cur,
+        f"""
+        CREATE TABLE IF NOT EXISTS pending_uploads (
+            id {id_type},
+            entry_id {int_type} NOT NULL,
+            spool_path TEXT NOT NULL,
+            ext TEXT NOT NULL,
+            size {int_type} NOT NULL,
+            sha256 TEXT NOT NULL,
+            attempts {int_type} NOT NULL DEFAULT 0,
+            last_error TEXT,
+            createdAt TEXT NOT NULL,
+            FOREIGN KEY(entry_id) REFERENCES entries(id) ON DELETE CASCADE
+        )
+        """
+    )
+    # When a waiting upload is due for the sweep; NULL while it's in the queue
+    _try_alter_table(conn, cur, "ALTER TABLE pending_uploads ADD COLUMN next_attempt_at TEXT")
+    execute_query(cur,
+        "CREATE INDEX IF NOT EXISTS idx_pending_uploads_next_attempt ON pending_uploads(next_attempt_at)"
+    )
+
+    # --- Pending deletes - storage files to remove (drained in the background) ---
+    execute_query(cur,
+        f"""
+        CREATE TABLE IF NOT EXISTS pending_deletes (
+            id {id_type},
+            url TEXT NOT NULL UNIQUE,
+            attempts {int_type} NOT NULL DEFAULT 0,
+            next_attempt_at TEXT NOT NULL,
+            last_error TEXT,
+            createdAt TEXT NOT NULL
+        )
+        """
+    )
+    execute_query(cur,
+        "CREATE INDEX IF NOT EXISTS idx_pending_deletes_next_attempt ON pending_deletes(next_attempt_at)"
+    )
+
+    # --- Per-cat statistics, maintained as sightings are linked (see Cat Statistics) ---
+    execute_query(cur,
+        f"""
+        CREATE TABLE IF NOT EXISTS cat_stats (
+            cat_id {int_type} PRIMARY KEY,
+            total_sightings INTEGER NOT NULL DEFAULT 0,
+            photo_count INTEGER NOT NULL DEFAULT 0,
+            unique_locations INTEGER NOT NULL DEFAULT 0,
+            first_seen TEXT,
+            last_seen TEXT,
+            primary_photo TEXT,
+            primary_photo_at TEXT,
+            updatedAt TEXT NOT NULL,
+            FOREIGN KEY(cat_id) REFERENCES cats(id) ON DELETE CASCADE
+        )
+        """
+    )
+    execute_query(cur,
+        f"""
+        CREATE TABLE IF NOT EXISTS cat_location_stats (
+            cat_id {int_type} NOT NULL,
+            location TEXT NOT NULL,
+            sightings INTEGER NOT NULL DEFAULT 0,
+            last_seen TEXT,
+            last_entry_id {int_type},
+            PRIMARY KEY (cat_id, location),
+            FOREIGN KEY(cat_id) REFERENCES cats(id) ON DELETE CASCADE
+        )
+        """
+    )
+    execute_query(cur,
+        "CREATE INDEX IF NOT EXISTS idx_cat_location_stats_rank ON cat_location_stats(cat_id, sightings)"
+    )
+    # kind: "tag" (baseline_tags tokens) or "sentiment" (POS_WORDS/NEG_WORDS present)
+    execute_query(cur,
+        f"""
+        CREATE TABLE IF NOT EXISTS cat_keywords (
+            cat_id {int_type} NOT NULL,
+            kind TEXT NOT NULL,
+            keyword TEXT NOT NULL,
+            occurrences INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (cat_id, kind, keyword),
+            FOREIGN KEY(cat_id) REFERENCES cats(id) ON DELETE CASCADE
+        )
+        """
+    )
+    execute_query(cur,
+        "CREATE INDEX IF NOT EXISTS idx_cat_keywords_rank ON cat_keywords(cat_id, kind, occurrences)"
+    )
+
+    # Cat directory sort orders (keyset pagination, see list_cats)
+    execute_query(cur,
+        "CREATE INDEX IF NOT EXISTS idx_cat_stats_last_seen ON cat_stats(COALESCE(last_seen, ''), cat_id)"
+    )
+    execute_query(cur,
+        "CREATE INDEX IF NOT EXISTS idx_cat_stats_sightings ON cat_stats(total_sightings, cat_id)"
+    )
+    execute_query(cur,
+        "CREATE INDEX IF NOT EXISTS idx_cats_name ON cats(LOWER(COALESCE(name, '')), id)"
+    )
+
+    # Cats from before cat_stats get their row from backfill_cat_stats (after startup)
 
     conn.commit()
     conn.close()
 
 
+
 @app.on_event("startup")
 def on_startup() -> None:
     """FastAPI lifecycle hook: initialize DB when the server starts."""
     init_db()
 
 
+# One-off data backfills for rows from before a derived table existed. They
+# run in a worker thread after startup (in small committed batches), so a
+# large database doesn't delay boot; readers cope with the missing rows.
+_backfill_task: Optional[asyncio.Task] = None
+
+
+async def run_backfills() -> None:
+    for backfill in (backfill_cat_stats, backfill_entry_keywords):
+        try:
+            done = await asyncio.to_thread(backfill)
+        except Exception as e:
+            logger.warning(f"Backfill {backfill.__name__} failed: {e}")
+            continue
+        if done:
+            logger.info(f"Backfill {backfill.__name__}: {done} row(s)")
+
+
+def start_backfills() -> None:
+    """Start the backfills on the running event loop (idempotent)."""
+    global _backfill_task
+    if _backfill_task is None or _backfill_task.done():
+        _backfill_task = asyncio.get_running_loop().create_task(run_backfills())
+
+
 
 
 
@@ -456,6 +870,7 @@ class RecentSighting(BaseModel):
     createdAt: str
     location: Optional[str] = None
     photo_url: Optional[str] = None
+    photo_thumb_url: Optional[str] = None
 
 
 class EnhancedCatProfile(BaseModel):
@@ -483,6 +898,11 @@ class Entry(BaseModel):
     location: Optional[str] = None  # Legacy single field (auto-built from structured fields)
     cat_id: Optional[int] = None
     photo_url: Optional[str] = None
+    # Resized photo variants (lightweight references for lists and map popups)
+    photo_thumb_url: Optional[str] = None
+    photo_medium_url: Optional[str] = None
+    photo_webp_url: Optional[str] = None
+    photo_status: Optional[str] = None  # "pending" | "ready" | "failed" (background uploads only)
     # Location normalization fields (OpenStreetMap)
     location_normalized: Optional[str] = None
     location_lat: Optional[float] = None
@@ -505,6 +925,10 @@ class EntryAnalysis(BaseModel):
     sentiment: str  # later you may rename to temperament
     updatedAt: str
 
+class AnalyzeBatchRequest(BaseModel):
+    """Entries to analyze in one request (POST /entries/analyze)."""
+    entry_ids: List[int] = Field(..., min_length=1, max_length=500)
+
 class CatCreate(BaseModel):
     name: Optional[str] = Field(None, max_length=100)
 
@@ -512,6 +936,13 @@ class Cat(BaseModel):
     id: int
     name: Optional[str] = None
     createdAt: str
+    # Only with GET /cats?include_stats=true
+    sightingsCount: Optional[int] = None
+    lastSeen: Optional[str] = None
+    primaryPhoto: Optional[str] = None
+
+
+cat_mapper = RowMapper(Cat)
 
 
 class MatchCandidate(BaseModel):
@@ -524,6 +955,7 @@ class MatchCandidate(BaseModel):
     candidate_id: int
     score: float
     reasons: List[str]
+    photo_distance: Optional[int] = None  # Hamming distance of photo hashes (0 = same picture)
 
     # Helpful fields to show in UI without extra calls
     candidate_nickname: Optional[str] = None
@@ -599,6 +1031,41 @@ class GeocodingHealthResponse(BaseModel):
     status: str  # "healthy", "degraded", "unavailable"
 
 
+class BackgroundQueueStats(BaseModel):
+    """Metrics for a write-behind background queue."""
+    name: str
+    running: bool
+    depth: int
+    max_size: int
+    high_water_mark: int
+    submitted: int
+    processed: int
+    failed: int
+    dropped: int  # rejected because the queue was full (backpressure)
+
+
+class ProfileCacheStats(BaseModel):
+    """Hit rates of the cat profile response cache."""
+    size: int
+    max_size: int
+    stale_while_revalidate: bool
+    hits: int
+    stale_hits: int  # outdated body served while it was rebuilt in the background
+    misses: int
+    hit_rate: float  # (hits + stale_hits) / requests
+    refreshes: int
+
+
+class StorageMaintenanceStats(BaseModel):
+    """State of deferred storage deletes and the orphaned-file scan."""
+    running: bool
+    pending_deletes: int
+    retrying_deletes: int  # pending deletes that failed at least once
+    oldest_pending_delete: Optional[str] = None
+    last_reconciled_at: Optional[str] = None
+    orphaned_objects: Optional[int] = None  # found by the last reconciliation pass
+
+
 # -----------------------------------------------------------------------------
 # Phase 3: Validation Workflow Models
 # -----------------------------------------------------------------------------
@@ -971,6 +1438,352 @@ def find_similar_cached_location(conn, location: str) -> Optional[dict]:
     return best_match
 
 
+# Max distance for borrowing a display name from an already geocoded sighting
+NEARBY_NAME_RADIUS_METERS = 150
+
+
+def find_nearby_location_name(cur, lat: float, lon: float, radius_meters: float = NEARBY_NAME_RADIUS_METERS) -> Optional[str]:
+    """
+    Resolve a display name for coordinates from our own geocoded sightings.
+
+    Used for photo EXIF GPS positions instead of a reverse-geocoding call to
+    Nominatim. Returns the normalized location of the closest geocoded entry
+    within radius_meters, or None.
+    """
+    # Bounding box first (uses idx_entries_lat_lon), exact distance after
+    dlat = radius_meters / 111320.0
+    dlon = radius_meters / (111320.0 * max(cos(radians(lat)), 0.01))
+    execute_query(cur,
+        """
+        SELECT location_normalized, location_lat, location_lon
+        FROM entries
+        WHERE location_lat BETWEEN ? AND ?
+          AND location_lon BETWEEN ? AND ?
+          AND location_normalized IS NOT NULL
+        """,
+        (lat - dlat, lat + dlat, lon - dlon, lon + dlon),
+    )
+
+    best_name = None
+    best_distance = radius_meters
+    for row in cur.fetchall():
+        distance = haversine_distance(lat, lon, row["location_lat"], row["location_lon"])
+        if distance <= best_distance:
+            best_name = row["location_normalized"]
+            best_distance = distance
+    return best_name
+
+
+def store_photo_gps(cur, entry_id: int, gps: tuple[float, float]) -> Optional[dict]:
+    """
+    Use a photo's EXIF GPS position as an entry's coordinates, if it has none yet.
+
+    Returns the stored location fields, or None if the entry already had coordinates.
+    """
+    lat, lon = gps
+    name = find_nearby_location_name(cur, lat, lon)
+    execute_query(cur,
+        """
+        UPDATE entries
+        SET location_lat = ?, location_lon = ?, location_normalized = ?
+        WHERE id = ? AND location_lat IS NULL
+        """,
+        (lat, lon, name, entry_id),
+    )
+    if cur.rowcount == 0:
+        return None
+    return {"location_lat": lat, "location_lon": lon, "location_normalized": name}
+
+
+def store_geocode_result(cur, entry_id: int, geo_result: dict, only_if_missing: bool = False) -> bool:
+    """
+    Persist a successful geocoding result (display name + coordinates) on an entry.
+
+    With only_if_missing=True the row is left untouched if it already has
+    coordinates, so background jobs never overwrite a manual normalization.
+
+    Returns True if the entry was updated.
+    """
+    sql = """
+        UPDATE entries
+        SET location_normalized = ?,
+            location_lat = ?,
+            location_lon = ?,
+            location_osm_id = ?
+        WHERE id = ?
+        """
+    if only_if_missing:
+        sql += " AND location_lat IS NULL"
+
+    execute_query(cur, sql, (
+        geo_result["display_name"],
+        float(geo_result["lat"]),
+        float(geo_result["lon"]),
+        geo_result.get("osm_id"),
+        entry_id,
+    ))
+    if cur.rowcount == 0:
+        return False
+    refresh_cat_stats_for_entry(cur, entry_id)  # Location key may have changed
+    return True
+
+
+# -----------------------------------------------------------------------------
+# Write-behind Queue (background work scheduled by request handlers)
+# -----------------------------------------------------------------------------
+
+class WriteBehindQueue:
+    """
+    Bounded in-process job queue drained by a background asyncio task.
+
+    Request handlers call submit() and return immediately; the worker runs
+    `handler(job)` after the response has been sent. When `max_size` jobs are
+    already pending, new jobs are dropped and counted instead of blocking the
+    caller, so a slow downstream service never turns into request latency.
+
+    submit() is thread-safe: sync endpoints run in FastAPI's threadpool, so
+    jobs are handed over to the event loop with call_soon_threadsafe.
+
+    With batch_size > 1, the worker waits `batch_delay` seconds after the
+    first job, then hands `handler` a list of up to batch_size queued jobs,
+    so bursts are coalesced into one batched write.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[None]],
+        max_size: int = 1000,
+        batch_size: int = 1,
+        batch_delay: float = 0.0,
+    ):
+        self.name = name
+        self.handler = handler
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._high_water_mark = 0
+        self._submitted = 0
+        self._processed = 0
+        self._failed = 0
+        self._dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the worker on the running event loop (idempotent)."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._pending = 0
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the worker. Jobs still queued are discarded."""
+        task, self._task = self._task, None
+        self._loop = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def join(self) -> None:
+        """Wait until every submitted job has been processed."""
+        while self._queue is not None and self._pending:
+            await asyncio.sleep(0)  # let call_soon_threadsafe hand-offs land
+            await self._queue.join()
+
+    def submit(self, job: Any) -> bool:
+        """
+        Schedule a job without waiting for it.
+
+        Returns False if the worker isn't running or the queue is full.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return False
+
+        with self._lock:
+            if self._pending >= self.max_size:
+                self._dropped += 1
+                return False
+            self._pending += 1
+            self._submitted += 1
+            self._high_water_mark = max(self._high_water_mark, self._pending)
+
+        loop.call_soon_threadsafe(self._queue.put_nowait, job)
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            jobs = [await self._queue.get()]
+            if self.batch_size > 1:
+                if self.batch_delay:
+                    await asyncio.sleep(self.batch_delay)  # let a burst accumulate
+                while len(jobs) < self.batch_size and not self._queue.empty():
+                    jobs.append(self._queue.get_nowait())
+            try:
+                await self.handler(jobs if self.batch_size > 1 else jobs[0])
+                self._processed += len(jobs)
+            except Exception as e:
+                self._failed += len(jobs)
+                logger.warning(f"{self.name} job {jobs if self.batch_size > 1 else jobs[0]!r} failed: {e}")
+            finally:
+                with self._lock:
+                    self._pending -= len(jobs)
+                for _ in jobs:
+                    self._queue.task_done()
+
+    def stats(self) -> dict:
+        """Queue metrics for health/monitoring endpoints."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "running": self.running,
+                "depth": self._pending,
+                "max_size": self.max_size,
+                "high_water_mark": self._high_water_mark,
+                "submitted": self._submitted,
+                "processed": self._processed,
+                "failed": self._failed,
+                "dropped": self._dropped,
+            }
+
+
+def _load_geocode_target(entry_id: int):
+    conn = get_conn()
+    cur = get_cursor(conn)
+    execute_query(cur, "SELECT location, location_lat FROM entries WHERE id = ?", (entry_id,))
+    row = cur.fetchone()
+    conn.close()
+    return row
+
+
+def _store_background_geocode(entry_id: int, geo_result: dict) -> None:
+    conn = get_conn()
+    cur = get_cursor(conn)
+    store_geocode_result(cur, entry_id, geo_result, only_if_missing=True)
+    conn.commit()
+    conn.close()
+
+
+async def _geocode_entry_job(job: tuple[int, str]) -> None:
+    """
+    Background job: geocode one entry's location and store the coordinates.
+
+    The DB connection is not held while waiting on Nominatim (rate limited to
+    1 request/second), and the update is skipped if the entry was normalized,
+    edited or deleted in the meantime. Database work runs in a worker thread.
+    """
+    entry_id, location = job
+
+    row = await asyncio.to_thread(_load_geocode_target, entry_id)
+    if row is None or row["location_lat"] is not None or row["location"] != location:
+        return
+
+    geo_result = await geocode_with_fallback(location)
+    if not (geo_result.get("lat") and geo_result.get("lon")):
+        return
+
+    await asyncio.to_thread(_store_background_geocode, entry_id, geo_result)
+
+
+# Global queue for automatic geocoding of new entries (see settings.auto_geocode_entries)
+geocoding_queue = WriteBehindQueue(
+    "geocoding",
+    _geocode_entry_job,
+    max_size=settings.geocode_queue_max_size,
+)
+
+
+def schedule_geocoding(entry_id: int, location: Optional[str]) -> bool:
+    """Queue background geocoding for a new entry (no-op unless enabled)."""
+    if not settings.auto_geocode_entries or not location:
+        return False
+    return geocoding_queue.submit((entry_id, location))
+
+
+# Geocoding deferred by a full queue (bulk ingest) is persisted on the entry
+# (geocode_pending) and re-queued by a periodic sweep as the queue drains,
+# rather than blocking the import until there is room.
+GEOCODE_SWEEP_INTERVAL_SECONDS = 60
+_geocode_sweep_task: Optional[asyncio.Task] = None
+
+
+def defer_geocoding(entry_ids: List[int]) -> None:
+    """Mark entries for geocoding by the next requeue_deferred_geocoding sweep."""
+    conn = get_conn()
+    cur = get_cursor(conn)
+    execute_many(cur, "UPDATE entries SET geocode_pending = 1 WHERE id = ?", [(entry_id,) for entry_id in entry_ids])
+    conn.commit()
+    conn.close()
+
+
+def requeue_deferred_geocoding() -> int:
+    """
+    Queue deferred entries for geocoding, as many as the queue has room for.
+
+    An entry's mark is cleared once it's queued; like any queued job, it's
+    not retried if the process stops before the job runs.
+
+    Returns:
+        Number of entries queued
+    """
+    room = geocoding_queue.max_size - geocoding_queue.stats()["depth"]
+    if not settings.auto_geocode_entries or not geocoding_queue.running or room <= 0:
+        return 0
+
+    conn = get_conn()
+    cur = get_cursor(conn)
+    execute_query(cur,
+        "SELECT id, location FROM entries WHERE geocode_pending = 1 ORDER BY id LIMIT ?",
+        (room,),
+    )
+    rows = cur.fetchall()
+    queued = [row_get(r, "id") for r in rows if schedule_geocoding(row_get(r, "id"), row_get(r, "location"))]
+    # Rows without a location (edited since) have nothing to geocode
+    done = queued + [row_get(r, "id") for r in rows if not row_get(r, "location")]
+    execute_many(cur, "UPDATE entries SET geocode_pending = 0 WHERE id = ?", [(entry_id,) for entry_id in done])
+    conn.commit()
+    conn.close()
+    return len(queued)
+
+
+async def _geocode_sweep_loop() -> None:
+    while True:
+        await asyncio.sleep(GEOCODE_SWEEP_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(requeue_deferred_geocoding)
+        except Exception as e:
+            logger.warning(f"Deferred geocoding sweep failed: {e}")
+
+
+def start_geocoding() -> None:
+    """Start the geocoding worker and the deferred-geocoding sweep (idempotent)."""
+    global _geocode_sweep_task
+    geocoding_queue.start()
+    if _geocode_sweep_task is None or _geocode_sweep_task.done():
+        _geocode_sweep_task = asyncio.get_running_loop().create_task(_geocode_sweep_loop())
+
+
+async def stop_geocoding() -> None:
+    global _geocode_sweep_task
+    task, _geocode_sweep_task = _geocode_sweep_task, None
+    if task is not None:
+        task.cancel()
+    await geocoding_queue.stop()
+
+
 # -----------------------------------------------------------------------------
 # Baseline "AI-like" analysis helpers (Week 5)
 # -----------------------------------------------------------------------------
@@ -1008,12 +1821,21 @@ def baseline_tags(text: str, k: int = 5) -> list[str]:
     - remove stopwords
     - return most frequent tokens
     """
-    tokens = re.findall(r"[a-zA-Z][a-zA-Z0-9_-]{2,}", text.lower())
-    tokens = [t for t in tokens if t not in STOPWORDS]
-    counts = Counter(tokens)
+    counts = Counter(tag_tokens(text))
     return [w for w, _ in counts.most_common(k)]
 
 
+def tag_tokens(text: str) -> list[str]:
+    """Word-like tokens counted by baseline_tags (lowercased, stopwords removed)."""
+    tokens = re.findall(r"[a-zA-Z][a-zA-Z0-9_-]{2,}", text.lower())
+    return [t for t in tokens if t not in STOPWORDS]
+
+
+def sentiment_words(text: str) -> set[str]:
+    """Words of POS_WORDS / NEG_WORDS that baseline_sentiment finds in text."""
+    return set(re.findall(r"[a-zA-Z']+", text.lower())) & (POS_WORDS | NEG_WORDS)
+
+
 def normalize_text(s: Optional[str]) -> str:
     """Lowercase + collapse whitespace for consistent comparisons."""
     if not s:
@@ -1057,7 +1879,11 @@ def location_similarity(loc_a: str, loc_b: str) -> float:
     return jaccard_similarity(a, b)
 
 
-def compute_match_score(
+# Sightings further apart than this get no location score
+MATCH_DISTANCE_METERS = 1000
+
+
+def compute_match_score(
     base_text: str,
     base_location: str,
     cand_text: str,
@@ -1066,6 +1892,7 @@ def compute_match_score(
     base_lon: Optional[float] = None,
     cand_lat: Optional[float] = None,
     cand_lon: Optional[float] = None,
+    photo_distance: Optional[int] = None,
 ) -> tuple[float, list[str]]:
     """
     Combine text similarity + location similarity into one score.
@@ -1076,6 +1903,11 @@ def compute_match_score(
 
     Falls back to text-only matching (70/30 split) when no coordinates.
 
+    photo_distance (Hamming distance between the two photos' perceptual
+    hashes, only passed when within PHOTO_MATCH_MAX_DISTANCE) blends in a
+    visual similarity score half-and-half. It only ever raises the score:
+    a different photo of the same cat says nothing against a match.
+
     We also return "reasons" for transparency in UI.
     """
     reasons: list[str] = []
@@ -1099,8 +1931,8 @@ def compute_match_score(
 
         # Convert distance to similarity score (closer = higher)
         # 0m = 1.0, 100m = 0.9, 500m = 0.5, 1000m+ = 0.0
-        if distance < 1000:
-            loc_score = max(0.0, 1.0 - (distance / 1000))
+        if distance < MATCH_DISTANCE_METERS:
+            loc_score = max(0.0, 1.0 - (distance / MATCH_DISTANCE_METERS))
             reasons.append(f"distance {distance:.0f}m (score {loc_score:.2f})")
         else:
             reasons.append(f"distance {distance:.0f}m (too far)")
@@ -1117,6 +1949,11 @@ def compute_match_score(
         # Use original 70/30 weighting for text-only matching
         score = 0.7 * text_sim + 0.3 * loc_score
 
+    if photo_distance is not None and photo_distance <= PHOTO_MATCH_MAX_DISTANCE:
+        photo_sim = 1.0 - photo_distance / (PHOTO_MATCH_MAX_DISTANCE + 1)
+        reasons.append(f"visually similar photo (hash distance {photo_distance})")
+        score = max(score, 0.5 * score + 0.5 * photo_sim)
+
     # If no reasons, still make it explicit
     if not reasons:
         reasons.append("low similarity")
@@ -1129,9 +1966,13 @@ def baseline_sentiment(text: str) -> str:
     Baseline sentiment classifier (very naive):
     - count overlap with positive/negative sets
     """
-    tokens = set(re.findall(r"[a-zA-Z']+", text.lower()))
-    pos = len(tokens & POS_WORDS)
-    neg = len(tokens & NEG_WORDS)
+    return sentiment_from_words(sentiment_words(text))
+
+
+def sentiment_from_words(words: set[str]) -> str:
+    """Classify by the distinct positive vs negative words present."""
+    pos = len(words & POS_WORDS)
+    neg = len(words & NEG_WORDS)
     if pos > neg:
         return "positive"
     if neg > pos:
@@ -1139,6 +1980,194 @@ def baseline_sentiment(text: str) -> str:
     return "neutral"
 
 
+# -----------------------------------------------------------------------------
+# Photo Similarity Index (perceptual hashes, BK-tree)
+# -----------------------------------------------------------------------------
+
+# Max Hamming distance (of 64 bits) still counted as "the same picture/cat".
+# Re-encoded or resized copies land at 0-4, unrelated photos around 32.
+PHOTO_MATCH_MAX_DISTANCE = 10
+
+# Rebuild the in-memory index from the DB after this many seconds, so photos
+# stored by other worker processes show up too
+PHOTO_INDEX_MAX_AGE_SECONDS = 300
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return (a ^ b).bit_count()
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree for nearest-neighbour search under Hamming distance.
+
+    Each node stores one hash (plus the ids of every item with that hash) and
+    its children keyed by their distance to it. A radius search only descends
+    into children whose key is within `radius` of the query's distance to the
+    node (triangle inequality), so a small radius visits a small fraction of
+    the tree instead of comparing against every hash.
+    """
+
+    def __init__(self):
+        # Node: [hash, ids, {distance: child node}]
+        self._root: Optional[list] = None
+        self.size = 0
+
+    def add(self, value: int, item: Any) -> None:
+        self.size += 1
+        if self._root is None:
+            self._root = [value, [item], {}]
+            return
+
+        node = self._root
+        while True:
+            distance = hamming_distance(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [item], {}]
+                return
+            node = child
+
+    def search(self, value: int, radius: int) -> List[tuple[Any, int]]:
+        """Return (item, distance) for every item within `radius` of value."""
+        found: List[tuple[Any, int]] = []
+        if self._root is None:
+            return found
+
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(value, node[0])
+            if distance <= radius:
+                found.extend((item, distance) for item in node[1])
+            for child_distance, child in node[2].items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        return found
+
+
+class PhotoHashIndex:
+    """
+    Process-wide BK-tree over entries.photo_dhash.
+
+    Built from the database on first use. After PHOTO_INDEX_MAX_AGE_SECONDS
+    it is rebuilt in a background thread while lookups keep using the
+    current tree. Photos stored by this process are applied right away with
+    set(); a replaced or removed hash stays in the tree until the next
+    rebuild but is filtered out of results. Thread-safe (sync endpoints run
+    in a threadpool).
+    """
+
+    def __init__(self, max_age_seconds: float = PHOTO_INDEX_MAX_AGE_SECONDS):
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._tree: Optional[BKTree] = None
+        self._hashes: dict[int, Optional[int]] = {}  # entry id -> current hash
+        self._built_at = 0.0
+        self._rebuilding = False
+        self._changes: dict[int, Optional[int]] = {}  # set() calls during a rebuild
+        self._generation = 0  # Bumped by clear(): a rebuild started before is discarded
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tree = None
+            self._hashes = {}
+            self._changes = {}
+            self._rebuilding = False
+            self._generation += 1
+
+    @staticmethod
+    def _load() -> tuple[BKTree, dict[int, Optional[int]]]:
+        conn = get_conn()
+        cur = get_cursor(conn)
+        execute_query(cur, "SELECT id, photo_dhash FROM entries WHERE photo_dhash IS NOT NULL")
+        rows = cur.fetchall()
+        conn.close()
+
+        tree = BKTree()
+        hashes: dict[int, Optional[int]] = {}
+        for r in rows:
+            value = int(row_get(r, "photo_dhash"), 16)
+            hashes[row_get(r, "id")] = value
+            tree.add(value, row_get(r, "id"))
+        return tree, hashes
+
+    def _install(self, tree: BKTree, hashes: dict[int, Optional[int]]) -> None:
+        """Swap in a freshly loaded tree (lock held), replaying set() calls made while loading."""
+        for entry_id, value in self._changes.items():
+            hashes[entry_id] = value
+            if value is not None:
+                tree.add(value, entry_id)
+        self._tree, self._hashes, self._changes = tree, hashes, {}
+        self._built_at = time.monotonic()
+
+    def _rebuild_in_background(self, generation: int) -> None:
+        try:
+            tree, hashes = self._load()
+        except Exception as e:
+            logger.warning(f"Photo index rebuild failed: {e}")
+            tree = None
+        with self._lock:
+            if generation != self._generation:
+                return
+            if tree is None:
+                self._built_at = time.monotonic()  # Retry after another max_age
+                self._changes = {}
+            else:
+                self._install(tree, hashes)
+            self._rebuilding = False
+
+    def set(self, entry_id: int, dhash: Optional[str]) -> None:
+        """Index a newly stored, replaced or removed photo hash (no-op until the index is built)."""
+        with self._lock:
+            if self._tree is None:
+                return
+            value = int(dhash, 16) if dhash else None
+            if self._rebuilding:
+                self._changes[entry_id] = value
+            if self._hashes.get(entry_id) == value:
+                return
+            self._hashes[entry_id] = value
+            if value is not None:
+                self._tree.add(value, entry_id)
+
+    def similar(self, dhash: str, radius: int = PHOTO_MATCH_MAX_DISTANCE) -> dict[int, int]:
+        """
+        Entries whose photo is within `radius` bits of dhash.
+
+        Returns:
+            {entry_id: hamming distance}
+        """
+        value = int(dhash, 16)
+        with self._lock:
+            if self._tree is None:
+                self._changes = {}
+                self._install(*self._load())
+            elif not self._rebuilding and time.monotonic() - self._built_at > self.max_age_seconds:
+                self._rebuilding = True
+                threading.Thread(target=self._rebuild_in_background, args=(self._generation,), daemon=True).start()
+            hashes = self._hashes
+            # Skip hashes an entry no longer has (the tree keeps them until the next rebuild)
+            return {
+                entry_id: distance
+                for entry_id, distance in self._tree.search(value, radius)
+                if hashes.get(entry_id) is not None and hamming_distance(value, hashes[entry_id]) == distance
+            }
+
+
+# Global photo similarity index (see find_matches)
+photo_hash_index = PhotoHashIndex()
+
+
+def store_photo_hash(cur, entry_id: int, dhash: Optional[str]) -> None:
+    """Save an entry's photo hash (indexed by photo_hash_index after commit)."""
+    execute_query(cur, "UPDATE entries SET photo_dhash = ? WHERE id = ?", (dhash, entry_id))
+
+
 # -----------------------------------------------------------------------------
 # Analysis persistence helpers (Week 6)
 # -----------------------------------------------------------------------------
@@ -1165,6 +2194,123 @@ def tags_from_json(tags_json: str) -> list[str]:
         return []
 
 
+# Upsert one analysis row: (entry_id, text_hash, summary, tags_json, sentiment, createdAt, updatedAt)
+# ON CONFLICT(entry_id) means: if entry_id already exists, update that row.
+ANALYSIS_UPSERT_SQL = """
+    INSERT INTO analyses (entry_id, text_hash, summary, tags_json, sentiment, createdAt, updatedAt)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(entry_id) DO UPDATE SET
+        text_hash=excluded.text_hash,
+        summary=excluded.summary,
+        tags_json=excluded.tags_json,
+        sentiment=excluded.sentiment,
+        updatedAt=excluded.updatedAt
+"""
+
+# Max bound parameters per IN (...) list (SQLite's limit is 999 on older builds)
+IN_CLAUSE_CHUNK_SIZE = 500
+
+
+def analysis_from_row(row) -> EntryAnalysis:
+    """Build the API model from an analyses row."""
+    return EntryAnalysis(
+        entry_id=row_get(row, "entry_id"),
+        summary=row_get(row, "summary"),
+        tags=tags_from_json(row_get(row, "tags_json")),
+        sentiment=row_get(row, "sentiment"),
+        updatedAt=row_get(row, "updatedAt"),
+    )
+
+
+def compute_analysis(text: str) -> tuple[str, list[str], str]:
+    """Baseline analysis of a sighting text: (summary, tags, sentiment)."""
+    return baseline_summary(text), baseline_tags(text), baseline_sentiment(text)
+
+
+def analyze_entries(cur, entry_ids: list[int]) -> list[EntryAnalysis]:
+    """
+    Analyze many entries with one read and one batched upsert (caller commits).
+
+    Same caching rule as /entries/{id}/analyze: an entry whose text hash
+    matches its stored analysis keeps it. Unknown ids are skipped.
+
+    Returns:
+        Analyses ordered by entry id (cached and fresh)
+    """
+    entry_ids = sorted(set(entry_ids))
+    if not entry_ids:
+        return []
+
+    execute_query(cur,
+        f"""
+        SELECT e.id, e.text, a.entry_id, a.text_hash, a.summary, a.tags_json, a.sentiment, a.updatedAt
+        FROM entries e
+        LEFT JOIN analyses a ON a.entry_id = e.id
+        WHERE e.id IN ({", ".join("?" for _ in entry_ids)})
+        ORDER BY e.id
+        """,
+        tuple(entry_ids),
+    )
+    rows = cur.fetchall()
+
+    now = datetime.utcnow().isoformat() + "Z"
+    results: list[EntryAnalysis] = []
+    upserts: list[tuple] = []
+    for r in rows:
+        text_hash = text_to_hash(row_get(r, "text"))
+        if row_get(r, "text_hash") == text_hash:
+            results.append(analysis_from_row(r))
+            continue
+
+        summary, tags, sentiment = compute_analysis(row_get(r, "text"))
+        upserts.append((row_get(r, "id"), text_hash, summary, tags_to_json(tags), sentiment, now, now))
+        results.append(EntryAnalysis(
+            entry_id=row_get(r, "id"), summary=summary, tags=tags, sentiment=sentiment, updatedAt=now,
+        ))
+
+    execute_many(cur, ANALYSIS_UPSERT_SQL, upserts)
+    return results
+
+
+# Background analysis of new entries: coalesced into batches of up to
+# ANALYSIS_BATCH_SIZE, collected for ANALYSIS_BATCH_DELAY seconds
+ANALYSIS_BATCH_SIZE = 100
+ANALYSIS_BATCH_DELAY = 0.5
+
+
+def precompute_analyses(entry_ids: list[int]) -> None:
+    """Analyze a batch of new entries in one transaction."""
+    conn = get_conn()
+    cur = get_cursor(conn)
+    try:
+        analyze_entries(cur, entry_ids)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+async def _precompute_analyses_job(entry_ids: list[int]) -> None:
+    """Background job: precompute_analyses in a worker thread, off the event loop."""
+    await asyncio.to_thread(precompute_analyses, entry_ids)
+
+
+# Global queue for analysis precomputation (see settings.precompute_analyses)
+analysis_queue = WriteBehindQueue(
+    "analysis",
+    _precompute_analyses_job,
+    max_size=settings.analysis_queue_max_size,
+    batch_size=ANALYSIS_BATCH_SIZE,
+    batch_delay=ANALYSIS_BATCH_DELAY,
+)
+
+
+def schedule_analysis(entry_id: int) -> bool:
+    """Queue background analysis for a new entry (no-op unless enabled)."""
+    if not settings.precompute_analyses:
+        return False
+    return analysis_queue.submit(entry_id)
+
+
 PROMPT_VERSION = "v1"
 
 def make_context_hash(parts: list[str]) -> str:
@@ -1304,6 +2450,492 @@ def generate_cat_insight_stub(
         generatedAt=now,
     )
 
+# -----------------------------------------------------------------------------
+# Cat Statistics (incrementally maintained per-cat aggregates)
+# -----------------------------------------------------------------------------
+#
+# cat_stats, cat_location_stats and cat_keywords hold what the enhanced cat
+# profile shows, so a profile view doesn't scan every sighting of the cat:
+# - linking a sighting to a cat adds it with a few increments/upserts
+# - anything that removes a sighting from a cat or edits a linked one
+#   (re-linking, new photo, geocoding) rebuilds that cat's rows
+# Cats without a cat_stats row (created before this table) are rebuilt on
+# first use.
+
+CAT_STATS_COLUMNS = "id, text, createdAt, location, location_normalized, photo_url"
+CAT_STATS_FIELDS = (
+    "total_sightings, photo_count, unique_locations, first_seen, last_seen, primary_photo"
+)
+
+
+def _sighting_location(row) -> Optional[str]:
+    """Location key a sighting is counted under (free text first, like the profile)."""
+    return row_get(row, "location") or row_get(row, "location_normalized")
+
+
+def _sighting_keywords(row) -> Counter:
+    """(kind, keyword) -> occurrences contributed by one sighting's text."""
+    text = row_get(row, "text") or ""
+    keywords = Counter(("tag", token) for token in tag_tokens(text))
+    keywords.update(("sentiment", word) for word in sentiment_words(text))
+    return keywords
+
+
+def bump_cat_version(cur, cat_id: int) -> None:
+    """
+    Mark everything derived from a cat as changed (caller commits).
+
+    Called by every write touching the cat's sightings (through the
+    statistics helpers below), its name or its insights; cached profile
+    responses of older versions are no longer served as fresh.
+    """
+    execute_query(cur, "UPDATE cats SET version = version + 1 WHERE id = ?", (cat_id,))
+
+
+def _upsert_cat_keywords(cur, cat_id: int, keywords: Counter) -> None:
+    execute_many(cur,
+        """
+        INSERT INTO cat_keywords (cat_id, kind, keyword, occurrences)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (cat_id, kind, keyword) DO UPDATE SET
+            occurrences = cat_keywords.occurrences + excluded.occurrences
+        """,
+        [(cat_id, kind, keyword, n) for (kind, keyword), n in keywords.items()],
+    )
+
+
+def rebuild_cat_stats(cur, cat_id: int) -> None:
+    """Recompute one cat's statistics from its sightings (caller commits)."""
+    execute_query(cur, "DELETE FROM cat_stats WHERE cat_id = ?", (cat_id,))
+    execute_query(cur, "DELETE FROM cat_location_stats WHERE cat_id = ?", (cat_id,))
+    execute_query(cur, "DELETE FROM cat_keywords WHERE cat_id = ?", (cat_id,))
+    bump_cat_version(cur, cat_id)
+
+    execute_query(cur,
+        f"SELECT {CAT_STATS_COLUMNS} FROM entries WHERE cat_id = ? ORDER BY createdAt DESC",
+        (cat_id,),
+    )
+    rows = cur.fetchall()
+
+    photo_rows = [r for r in rows if row_get(r, "photo_url")]
+    locations: dict[str, list] = {}  # location -> [sightings, last_seen, last_entry_id]
+    keywords: Counter = Counter()
+    for r in rows:  # Newest first: the first row per location is its latest
+        loc = _sighting_location(r)
+        if loc:
+            if loc not in locations:
+                locations[loc] = [0, row_get(r, "createdAt"), row_get(r, "id")]
+            locations[loc][0] += 1
+        keywords.update(_sighting_keywords(r))
+
+    execute_query(cur,
+        """
+        INSERT INTO cat_stats (cat_id, total_sightings, photo_count, unique_locations,
+                               first_seen, last_seen, primary_photo, primary_photo_at, updatedAt)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            cat_id, len(rows), len(photo_rows), len(locations),
+            row_get(rows[-1], "createdAt") if rows else None,
+            row_get(rows[0], "createdAt") if rows else None,
+            row_get(photo_rows[0], "photo_url") if photo_rows else None,
+            row_get(photo_rows[0], "createdAt") if photo_rows else None,
+            datetime.utcnow().isoformat() + "Z",
+        ),
+    )
+    execute_many(cur,
+        """
+        INSERT INTO cat_location_stats (cat_id, location, sightings, last_seen, last_entry_id)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        [(cat_id, loc, n, seen, entry_id) for loc, (n, seen, entry_id) in locations.items()],
+    )
+    _upsert_cat_keywords(cur, cat_id, keywords)
+
+
+def add_sighting_to_cat_stats(cur, cat_id: int, entry_id: int) -> None:
+    """
+    Count a sighting that was just linked to cat_id (after the UPDATE, caller commits).
+
+    Constant work per sighting: a handful of increments and upserts, plus
+    one keyword upsert per distinct word of its text.
+    """
+    execute_query(cur, "SELECT 1 FROM cat_stats WHERE cat_id = ?", (cat_id,))
+    if cur.fetchone() is None:
+        rebuild_cat_stats(cur, cat_id)  # Also counts this sighting
+        return
+
+    execute_query(cur, f"SELECT {CAT_STATS_COLUMNS} FROM entries WHERE id = ?", (entry_id,))
+    row = cur.fetchone()
+    if row is None:
+        return
+    bump_cat_version(cur, cat_id)
+    created_at = row_get(row, "createdAt")
+    photo_url = row_get(row, "photo_url")
+
+    new_location = 0
+    loc = _sighting_location(row)
+    if loc:
+        execute_query(cur,
+            "SELECT 1 FROM cat_location_stats WHERE cat_id = ? AND location = ?", (cat_id, loc)
+        )
+        new_location = 1 if cur.fetchone() is None else 0
+        execute_query(cur,
+            """
+            INSERT INTO cat_location_stats (cat_id, location, sightings, last_seen, last_entry_id)
+            VALUES (?, ?, 1, ?, ?)
+            ON CONFLICT (cat_id, location) DO UPDATE SET
+                sightings = cat_location_stats.sightings + 1,
+                last_entry_id = CASE WHEN excluded.last_seen >= cat_location_stats.last_seen
+                                     THEN excluded.last_entry_id ELSE cat_location_stats.last_entry_id END,
+                last_seen = CASE WHEN excluded.last_seen >= cat_location_stats.last_seen
+                                 THEN excluded.last_seen ELSE cat_location_stats.last_seen END
+            """,
+            (cat_id, loc, created_at, entry_id),
+        )
+
+    is_new_photo = photo_url is not None
+    execute_query(cur,
+        """
+        UPDATE cat_stats SET
+            total_sightings = total_sightings + 1,
+            photo_count = photo_count + ?,
+            unique_locations = unique_locations + ?,
+            first_seen = CASE WHEN first_seen IS NULL OR ? < first_seen THEN ? ELSE first_seen END,
+            last_seen = CASE WHEN last_seen IS NULL OR ? > last_seen THEN ? ELSE last_seen END,
+            primary_photo = CASE WHEN ? AND (primary_photo_at IS NULL OR ? >= primary_photo_at)
+                                 THEN ? ELSE primary_photo END,
+            primary_photo_at = CASE WHEN ? AND (primary_photo_at IS NULL OR ? >= primary_photo_at)
+                                    THEN ? ELSE primary_photo_at END,
+            updatedAt = ?
+        WHERE cat_id = ?
+        """,
+        (
+            1 if is_new_photo else 0, new_location,
+            created_at, created_at,
+            created_at, created_at,
+            is_new_photo, created_at, photo_url,
+            is_new_photo, created_at, created_at,
+            datetime.utcnow().isoformat() + "Z",
+            cat_id,
+        ),
+    )
+    _upsert_cat_keywords(cur, cat_id, _sighting_keywords(row))
+
+
+def init_cat_stats(cur, cat_id: int) -> None:
+    """Give a new cat its (empty) cat_stats row (caller commits)."""
+    execute_query(cur,
+        "INSERT INTO cat_stats (cat_id, updatedAt) VALUES (?, ?)",
+        (cat_id, datetime.utcnow().isoformat() + "Z"),
+    )
+
+
+BACKFILL_BATCH_SIZE = 100
+
+
+def backfill_cat_stats(batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """
+    Build the cat_stats rows of cats from before the table (see run_backfills).
+
+    Returns:
+        Number of cats backfilled
+    """
+    done = 0
+    while True:
+        conn = get_conn()
+        cur = get_cursor(conn)
+        execute_query(cur,
+            "SELECT c.id FROM cats c LEFT JOIN cat_stats s ON s.cat_id = c.id WHERE s.cat_id IS NULL LIMIT ?",
+            (batch_size,),
+        )
+        cat_ids = [row_get(row, "id") for row in cur.fetchall()]
+        for cat_id in cat_ids:
+            rebuild_cat_stats(cur, cat_id)
+        conn.commit()
+        conn.close()
+        done += len(cat_ids)
+        if len(cat_ids) < batch_size:
+            return done
+
+
+def refresh_cat_stats_for_entry(cur, entry_id: int) -> None:
+    """Rebuild the statistics of the cat an edited sighting belongs to (if any)."""
+    execute_query(cur, "SELECT cat_id FROM entries WHERE id = ?", (entry_id,))
+    row = cur.fetchone()
+    if row is not None and row_get(row, "cat_id") is not None:
+        rebuild_cat_stats(cur, row_get(row, "cat_id"))
+
+
+def link_sighting_to_cat(cur, entry_id: int, cat_id: int, previous_cat_id: Optional[int]) -> Entry:
+    """
+    Set an entry's cat and keep both cats' statistics current (caller commits).
+
+    Removing a sighting can change first/last seen, the primary photo and
+    location recency, so the previous cat is rebuilt rather than decremented.
+
+    Returns:
+        The updated entry
+    """
+    entry = update_entry_returning(cur, entry_id, "cat_id = ?", (cat_id,))
+    if previous_cat_id == cat_id:
+        return entry
+    add_sighting_to_cat_stats(cur, cat_id, entry_id)
+    if previous_cat_id is not None:
+        rebuild_cat_stats(cur, previous_cat_id)
+    return entry
+
+
+# Linking more sightings than this at once rebuilds the cat's statistics in
+# one pass instead of adding each sighting incrementally
+LINK_STATS_REBUILD_THRESHOLD = 20
+
+
+def _link_chunk_returning(cur, chunk: List[int], cat_id: int) -> dict[int, Optional[int]]:
+    """
+    Link the entries of chunk not yet on cat_id in one UPDATE ... RETURNING.
+
+    Returns:
+        {entry id: previous cat_id} of the entries the UPDATE changed.
+        PostgreSQL returns the previous cat_id too (rows locked by the
+        subquery); on SQLite the single writer keeps the caller's SELECT
+        current, so it's filled in from there.
+    """
+    if settings.is_postgres:
+        execute_query(cur,
+            """
+            UPDATE entries AS e SET cat_id = ?
+            FROM (SELECT id, cat_id FROM entries WHERE id = ANY(?) FOR UPDATE) AS old
+            WHERE e.id = old.id AND old.cat_id IS DISTINCT FROM ?
+            RETURNING e.id, old.cat_id AS previous_cat_id
+            """,
+            (cat_id, list(chunk), cat_id),
+        )
+        return {row_get(r, "id"): row_get(r, "previous_cat_id") for r in cur.fetchall()}
+
+    execute_query(cur,
+        f"UPDATE entries SET cat_id = ? WHERE id IN ({', '.join('?' for _ in chunk)}) "
+        "AND (cat_id IS NULL OR cat_id <> ?) RETURNING id",
+        (cat_id, *chunk, cat_id),
+    )
+    return {row_get(r, "id"): None for r in cur.fetchall()}
+
+
+def link_sightings_to_cat_bulk(cur, entry_ids: List[int], cat_id: int) -> tuple[List[int], List[int], List[int]]:
+    """
+    Link many entries to cat_id with set-based statements (caller commits).
+
+    One SELECT and one UPDATE ... RETURNING per IN_CLAUSE_CHUNK_SIZE ids,
+    instead of a SELECT and an UPDATE per id. Which entries were newly
+    linked comes from the rows the UPDATE returns, so a concurrent change
+    between the two statements isn't misreported; without RETURNING (older
+    SQLite) it follows from the SELECT. Results follow payload order as if
+    linked one by one (a repeated id is newly linked once, then already linked).
+
+    Returns:
+        (newly_linked, already_linked, failed) entry ids
+    """
+    current: dict[int, Optional[int]] = {}  # entry id -> cat_id
+    unique_ids = list(dict.fromkeys(entry_ids))
+    for i in range(0, len(unique_ids), IN_CLAUSE_CHUNK_SIZE):
+        chunk = unique_ids[i:i + IN_CLAUSE_CHUNK_SIZE]
+        execute_query(cur,
+            f"SELECT id, cat_id FROM entries WHERE id IN ({', '.join('?' for _ in chunk)})",
+            tuple(chunk),
+        )
+        current.update((row_get(r, "id"), row_get(r, "cat_id")) for r in cur.fetchall())
+
+    to_link = [entry_id for entry_id in unique_ids if entry_id in current and current[entry_id] != cat_id]
+    changed: dict[int, Optional[int]] = {}  # entry id -> previous cat_id
+    for i in range(0, len(to_link), IN_CLAUSE_CHUNK_SIZE):
+        chunk = to_link[i:i + IN_CLAUSE_CHUNK_SIZE]
+        if SUPPORTS_RETURNING:
+            changed.update(_link_chunk_returning(cur, chunk, cat_id))
+        else:
+            execute_query(cur,
+                f"UPDATE entries SET cat_id = ? WHERE id IN ({', '.join('?' for _ in chunk)})",
+                (cat_id, *chunk),
+            )
+            changed.update((entry_id, None) for entry_id in chunk)
+    if not settings.is_postgres:
+        changed = {entry_id: current[entry_id] for entry_id in changed}
+
+    newly_linked: List[int] = []
+    already_linked: List[int] = []
+    failed: List[int] = []
+    to_report = set(changed)
+    for entry_id in entry_ids:
+        if entry_id in to_report:
+            to_report.discard(entry_id)
+            newly_linked.append(entry_id)
+        elif entry_id in current:
+            already_linked.append(entry_id)
+        else:
+            failed.append(entry_id)
+    previous_cat_ids = {previous for previous in changed.values() if previous is not None}
+
+    # Statistics: same result as link_sighting_to_cat per entry
+    if len(newly_linked) > LINK_STATS_REBUILD_THRESHOLD:
+        rebuild_cat_stats(cur, cat_id)
+    else:
+        for entry_id in newly_linked:
+            add_sighting_to_cat_stats(cur, cat_id, entry_id)
+    for previous_cat_id in sorted(previous_cat_ids):
+        rebuild_cat_stats(cur, previous_cat_id)
+
+    return newly_linked, already_linked, failed
+
+
+# -----------------------------------------------------------------------------
+# Cat Profile Cache (versioned, optional stale-while-revalidate)
+# -----------------------------------------------------------------------------
+#
+# Both profile endpoints keep their serialized JSON in an in-process LRU,
+# tagged with the cat's version (see bump_cat_version). A request costs one
+# indexed version lookup when the cached body is current. With
+# PROFILE_CACHE_STALE_WHILE_REVALIDATE, an outdated body is served right away
+# and rebuilt after the response is sent.
+
+class ProfileCache:
+    """
+    LRU of serialized profile responses keyed by (kind, cat_id).
+
+    Only the newest version of each profile is kept; get() treats a body of
+    another version as stale. Thread-safe (sync endpoints run in a threadpool).
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, int], tuple[int, bytes]] = OrderedDict()
+        self._refreshing: set[tuple[str, int]] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._refreshing.clear()
+
+    def get(self, kind: str, cat_id: int, version: int, allow_stale: bool = False) -> tuple[Optional[bytes], str]:
+        """
+        Look up a profile body.
+
+        Returns:
+            (body, "hit") when cached for this version, (body, "stale") for an
+            older version if allow_stale, otherwise (None, "miss")
+        """
+        key = (kind, cat_id)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[1], "hit"
+            if cached is not None and allow_stale:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                return cached[1], "stale"
+            self.misses += 1
+            return None, "miss"
+
+    def put(self, kind: str, cat_id: int, version: int, body: bytes) -> None:
+        """Store a body, unless a newer version is cached already."""
+        if self.max_size <= 0:
+            return
+        key = (kind, cat_id)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] > version:
+                return
+            self._entries[key] = (version, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def start_refresh(self, kind: str, cat_id: int) -> bool:
+        """Claim the background rebuild of a stale profile (False if one is running)."""
+        with self._lock:
+            if (kind, cat_id) in self._refreshing:
+                return False
+            self._refreshing.add((kind, cat_id))
+            self.refreshes += 1
+            return True
+
+    def finish_refresh(self, kind: str, cat_id: int) -> None:
+        with self._lock:
+            self._refreshing.discard((kind, cat_id))
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self.hits + self.stale_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "stale_while_revalidate": settings.profile_cache_stale_while_revalidate,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.stale_hits) / requests, 4) if requests else 0.0,
+                "refreshes": self.refreshes,
+            }
+
+
+# Global profile response cache (see cached_profile_response)
+profile_cache = ProfileCache(max_size=settings.profile_cache_size)
+
+
+def _cat_version(cat_id: int) -> Optional[int]:
+    conn = get_conn()
+    cur = get_cursor(conn)
+    execute_query(cur, "SELECT version FROM cats WHERE id = ?", (cat_id,))
+    row = cur.fetchone()
+    conn.close()
+    return row_get(row, "version") if row is not None else None
+
+
+def _refresh_cached_profile(kind: str, cat_id: int, build: Callable[[int], BaseModel]) -> None:
+    """Rebuild a stale profile after its response was sent."""
+    try:
+        version = _cat_version(cat_id)
+        if version is not None:
+            profile_cache.put(kind, cat_id, version, build(cat_id).model_dump_json().encode())
+    except Exception as e:
+        logger.warning(f"Refreshing cached {kind} of cat {cat_id} failed: {e}")
+    finally:
+        profile_cache.finish_refresh(kind, cat_id)
+
+
+def cached_profile_response(
+    kind: str,
+    cat_id: int,
+    build: Callable[[int], BaseModel],
+    background_tasks: BackgroundTasks,
+) -> Response:
+    """
+    Serve a profile from profile_cache, building it with build(cat_id) on a miss.
+
+    The X-Cache header tells whether the body was a hit, stale or a miss.
+    """
+    version = _cat_version(cat_id)
+    if version is None:
+        return build(cat_id)  # Raises the endpoint's 404
+
+    body, status = profile_cache.get(
+        kind, cat_id, version, allow_stale=settings.profile_cache_stale_while_revalidate
+    )
+    if status == "stale":
+        if profile_cache.start_refresh(kind, cat_id):
+            background_tasks.add_task(_refresh_cached_profile, kind, cat_id, build)
+    elif body is None:
+        body = build(cat_id).model_dump_json().encode()
+        profile_cache.put(kind, cat_id, version, body)
+
+    return Response(content=body, media_type="application/json", headers={"X-Cache": status.upper()})
+
+
 # -----------------------------------------------------------------------------
 # Endpoints
 # -----------------------------------------------------------------------------
@@ -1328,7 +2960,7 @@ def cat_insights(cat_id: int, payload: CatInsightRequest):
     cur = get_cursor(conn)
 
     # Ensure cat exists
-    execute_query(cur, "SELECT id FROM cats WHERE id = ?", (cat_id,))
+    run_query(cur, "cat_exists", (cat_id,))
     if cur.fetchone() is None:
         conn.close()
         raise HTTPException(status_code=404, detail="Cat not found")
@@ -1387,6 +3019,7 @@ def cat_insights(cat_id: int, payload: CatInsightRequest):
             now,
         ),
     )
+    bump_cat_version(cur, cat_id)  # Insight status shown on the enhanced profile
     conn.commit()
     conn.close()
 
@@ -1400,7 +3033,11 @@ def health():
 
 
 @app.get("/cats/{cat_id}/profile", response_model=CatProfile)
-def cat_profile(cat_id: int):
+def cat_profile(cat_id: int, background_tasks: BackgroundTasks):
+    return cached_profile_response("profile", cat_id, build_cat_profile, background_tasks)
+
+
+def build_cat_profile(cat_id: int) -> CatProfile:
     conn = get_conn()
     cur = get_cursor(conn)
 
@@ -1480,129 +3117,170 @@ def cat_profile(cat_id: int):
     )
 
 
-@app.get("/cats/{cat_id}/profile/enhanced", response_model=EnhancedCatProfile)
-def enhanced_cat_profile(cat_id: int):
-    """
-    Enhanced cat profile with aggregated stats for the dedicated Cat Profile page.
+PROFILE_BATCH_MAX_IDS = 100
+PROFILE_RECENT_SIGHTINGS = 5
+PROFILE_TOP_LOCATIONS = 10
+PROFILE_TOP_TAGS = 8
+PROFILE_SUMMARY_MAX_LEN = 220
 
-    Returns:
-    - Basic cat info with primary photo
-    - Statistics (total sightings, unique locations, photos, date range)
-    - Recent sightings preview (last 5)
-    - Location summary with counts
-    - Insight generation status
-    - Legacy profile text for backward compatibility
+
+def _rows_by_cat(rows) -> dict[int, list]:
+    grouped: dict[int, list] = {}
+    for r in rows:
+        grouped.setdefault(row_get(r, "cat_id"), []).append(r)
+    return grouped
+
+
+def load_enhanced_profiles(cur, cat_ids: List[int]) -> dict[int, EnhancedCatProfile]:
     """
-    conn = get_conn()
-    cur = get_cursor(conn)
+    Build the enhanced profiles of many cats with a fixed number of queries.
 
-    # Load cat with createdAt
-    execute_query(cur, "SELECT id, name, createdAt FROM cats WHERE id = ?", (cat_id,))
-    cat_row = cur.fetchone()
-    if cat_row is None:
-        conn.close()
-        raise HTTPException(
-            status_code=404,
-            detail={"code": "CAT_NOT_FOUND", "message": f"Cat with ID {cat_id} not found", "retryable": False}
-        )
+    Aggregates come from cat_stats / cat_location_stats / cat_keywords;
+    window functions pick each cat's newest sightings, top locations and top
+    tags, and the notes needed for the summary (a running total of their
+    length, so only as many as fit max_len are read). Cats without a
+    cat_stats row yet are built first (caller commits). Unknown ids are
+    absent from the result.
 
-    # Load all sightings for this cat with full details
+    Returns:
+        {cat_id: EnhancedCatProfile}
+    """
+    if not cat_ids:
+        return {}
+    in_clause = ", ".join("?" for _ in cat_ids)
+    params = tuple(cat_ids)
+
+    cat_sql = f"""
+        SELECT c.id, c.name, c.createdAt, s.cat_id AS stats_cat_id,
+               s.total_sightings, s.photo_count, s.unique_locations,
+               s.first_seen, s.last_seen, s.primary_photo
+        FROM cats c
+        LEFT JOIN cat_stats s ON s.cat_id = c.id
+        WHERE c.id IN ({in_clause})
+    """
+    execute_query(cur, cat_sql, params)
+    cat_rows = cur.fetchall()
+    unbuilt = [row_get(r, "id") for r in cat_rows if row_get(r, "stats_cat_id") is None]
+    if unbuilt:
+        for cat_id in unbuilt:
+            rebuild_cat_stats(cur, cat_id)
+        execute_query(cur, cat_sql, params)
+        cat_rows = cur.fetchall()
+
+    # Newest sightings (preview) plus the notes the summary needs
     execute_query(cur,
-        """
-        SELECT id, text, createdAt, location, location_normalized,
-               location_lat, location_lon, photo_url
-        FROM entries
-        WHERE cat_id = ?
-        ORDER BY createdAt DESC
+        f"""
+        SELECT cat_id, id, text, createdAt, location, photo_url, photo_thumb_url, rn, preceding_len
+        FROM (
+            SELECT cat_id, id, text, createdAt, location, photo_url, photo_thumb_url,
+                   ROW_NUMBER() OVER w AS rn,
+                   SUM(CASE WHEN text IS NULL OR text = '' THEN 0 ELSE LENGTH(text) + 1 END) OVER w
+                     - CASE WHEN text IS NULL OR text = '' THEN 0 ELSE LENGTH(text) + 1 END AS preceding_len
+            FROM entries
+            WHERE cat_id IN ({in_clause})
+            WINDOW w AS (PARTITION BY cat_id ORDER BY createdAt DESC, id DESC
+                         ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW)
+        ) ranked
+        WHERE rn <= ? OR preceding_len <= ?
+        ORDER BY cat_id, rn
         """,
-        (cat_id,),
+        params + (PROFILE_RECENT_SIGHTINGS, PROFILE_SUMMARY_MAX_LEN),
     )
-    sightings = cur.fetchall()
+    sighting_rows = _rows_by_cat(cur.fetchall())
 
-    # Check insight status
+    # Top locations; details come from the latest sighting at each location
     execute_query(cur,
-        """
-        SELECT mode, updatedAt FROM cat_insights
-        WHERE cat_id = ?
+        f"""
+        SELECT cat_id, location, sightings, last_seen, location_normalized, location_lat, location_lon
+        FROM (
+            SELECT l.cat_id, l.location, l.sightings, l.last_seen,
+                   e.location_normalized, e.location_lat, e.location_lon,
+                   ROW_NUMBER() OVER (PARTITION BY l.cat_id ORDER BY l.sightings DESC, l.last_seen DESC) AS rn
+            FROM cat_location_stats l
+            LEFT JOIN entries e ON e.id = l.last_entry_id
+            WHERE l.cat_id IN ({in_clause})
+        ) ranked
+        WHERE rn <= ?
+        ORDER BY cat_id, rn
         """,
-        (cat_id,),
+        params + (PROFILE_TOP_LOCATIONS,),
     )
-    insight_rows = cur.fetchall()
-    conn.close()
+    location_rows = _rows_by_cat(cur.fetchall())
 
-    # Process sightings data
-    total_sightings = len(sightings)
+    # Top tags and every sentiment word
+    execute_query(cur,
+        f"""
+        SELECT cat_id, kind, keyword
+        FROM (
+            SELECT cat_id, kind, keyword,
+                   ROW_NUMBER() OVER (PARTITION BY cat_id, kind ORDER BY occurrences DESC, keyword) AS rn
+            FROM cat_keywords
+            WHERE cat_id IN ({in_clause})
+        ) ranked
+        WHERE kind = 'sentiment' OR rn <= ?
+        ORDER BY cat_id, kind, rn
+        """,
+        params + (PROFILE_TOP_TAGS,),
+    )
+    keyword_rows = _rows_by_cat(cur.fetchall())
 
-    # Compute stats
-    unique_locations_set = set()
-    location_counts = {}
-    location_details = {}
-    photo_count = 0
-    first_seen = None
-    last_seen = None
-    primary_photo = None
+    execute_query(cur,
+        f"SELECT cat_id, mode, updatedAt FROM cat_insights WHERE cat_id IN ({in_clause})",
+        params,
+    )
+    insight_rows = _rows_by_cat(cur.fetchall())
 
-    for s in sightings:
-        loc = s["location"] or s["location_normalized"]
-        created_at = row_get(s, "createdAt") or row_get(s, "createdat")
+    return {
+        row_get(r, "id"): _enhanced_profile_from_rows(
+            r,
+            sighting_rows.get(row_get(r, "id"), []),
+            location_rows.get(row_get(r, "id"), []),
+            keyword_rows.get(row_get(r, "id"), []),
+            insight_rows.get(row_get(r, "id"), []),
+        )
+        for r in cat_rows
+    }
 
-        # Track dates
-        if created_at:
-            if last_seen is None:
-                last_seen = created_at  # First row is most recent
-            first_seen = created_at  # Last row will be oldest
 
-        # Track locations
-        if loc:
-            unique_locations_set.add(loc)
-            location_counts[loc] = location_counts.get(loc, 0) + 1
-            # Store details for location summary
-            if loc not in location_details:
-                location_details[loc] = {
-                    "normalized": s["location_normalized"],
-                    "lat": s["location_lat"],
-                    "lon": s["location_lon"],
-                    "lastSeen": created_at,
-                }
+def _enhanced_profile_from_rows(cat_row, sighting_rows, location_rows, keyword_rows, insight_rows) -> EnhancedCatProfile:
+    """Assemble one EnhancedCatProfile from the rows load_enhanced_profiles fetched for it."""
+    cat_id = row_get(cat_row, "id")
 
-        # Track photos
-        if s["photo_url"]:
-            photo_count += 1
-            if primary_photo is None:
-                primary_photo = s["photo_url"]
-
-    # Find most frequent location
-    most_frequent_location = None
-    if location_counts:
-        most_frequent_location = max(location_counts.items(), key=lambda x: x[1])[0]
-
-    # Build location summary (sorted by count descending)
-    location_summary = []
-    for loc, count in sorted(location_counts.items(), key=lambda x: -x[1])[:10]:
-        details = location_details.get(loc, {})
-        location_summary.append(LocationSummary(
-            location=loc,
-            normalizedLocation=details.get("normalized"),
-            count=count,
-            lastSeen=details.get("lastSeen", ""),
-            lat=details.get("lat"),
-            lon=details.get("lon"),
-        ))
+    location_summary = [
+        LocationSummary(
+            location=row_get(r, "location"),
+            normalizedLocation=row_get(r, "location_normalized"),
+            count=row_get(r, "sightings"),
+            lastSeen=row_get(r, "last_seen") or "",
+            lat=row_get(r, "location_lat"),
+            lon=row_get(r, "location_lon"),
+        )
+        for r in location_rows
+    ]
+    most_frequent_location = location_summary[0].location if location_summary else None
+
+    recent_sightings = [
+        RecentSighting(
+            id=row_get(s, "id"),
+            text=row_get(s, "text"),
+            createdAt=row_get(s, "createdAt") or "",
+            location=row_get(s, "location"),
+            photo_url=row_get(s, "photo_url"),
+            photo_thumb_url=row_get(s, "photo_thumb_url"),
+        )
+        for s in sighting_rows
+        if row_get(s, "rn") <= PROFILE_RECENT_SIGHTINGS
+    ]
+    summary_text = "\n".join(
+        row_get(s, "text") for s in sighting_rows
+        if row_get(s, "text") and row_get(s, "preceding_len") <= PROFILE_SUMMARY_MAX_LEN
+    )
 
-    # Build recent sightings (top 5)
-    recent_sightings = []
-    for s in sightings[:5]:
-        created_at = row_get(s, "createdAt") or row_get(s, "createdat")
-        recent_sightings.append(RecentSighting(
-            id=s["id"],
-            text=s["text"],
-            createdAt=created_at or "",
-            location=s["location"],
-            photo_url=s["photo_url"],
-        ))
+    tags = [row_get(r, "keyword") for r in keyword_rows if row_get(r, "kind") == "tag"]
+    sentiment_found = {row_get(r, "keyword") for r in keyword_rows if row_get(r, "kind") == "sentiment"}
 
     # Build insight status
-    insight_modes = {row_get(r, "mode"): row_get(r, "updatedAt") or row_get(r, "updatedat") for r in insight_rows}
+    insight_modes = {row_get(r, "mode"): row_get(r, "updatedAt") for r in insight_rows}
     latest_insight_update = max(insight_modes.values()) if insight_modes else None
     insight_status = InsightStatus(
         hasProfile="profile" in insight_modes,
@@ -1613,22 +3291,21 @@ def enhanced_cat_profile(cat_id: int):
     )
 
     # Generate legacy profile text
-    all_text = "\n".join([s["text"] for s in sightings if s["text"]])
-    tags = baseline_tags(all_text, k=8) if all_text else []
-    sentiment = baseline_sentiment(all_text) if all_text else "neutral"
+    sentiment = sentiment_from_words(sentiment_found)
     temperament_guess = (
         "friendly" if sentiment == "positive"
         else "defensive / cautious" if sentiment == "negative"
         else "unknown / neutral"
     )
 
-    cat_name = cat_row["name"] or f"Cat #{cat_id}"
+    total_sightings = row_get(cat_row, "total_sightings")
+    cat_name = row_get(cat_row, "name") or f"Cat #{cat_id}"
     location_hint = most_frequent_location or "unknown area"
 
     if total_sightings == 0:
         profile_text = "No sightings assigned yet. Assign sightings to build a profile."
     else:
-        summary = baseline_summary(all_text, max_len=220)
+        summary = baseline_summary(summary_text, max_len=PROFILE_SUMMARY_MAX_LEN)
         profile_text = (
             f"{cat_name} is a community-tracked street cat most often seen around {location_hint}. "
             f"Based on {total_sightings} sighting(s), the current temperament guess is '{temperament_guess}'. "
@@ -1636,21 +3313,19 @@ def enhanced_cat_profile(cat_id: int):
             f"Summary of recent notes: {summary}"
         )
 
-    cat_created_at = row_get(cat_row, "createdAt") or row_get(cat_row, "createdat") or ""
-
     return EnhancedCatProfile(
         cat=CatBasicInfo(
             id=cat_id,
-            name=cat_row["name"],
-            createdAt=cat_created_at,
-            primaryPhoto=primary_photo,
+            name=row_get(cat_row, "name"),
+            createdAt=row_get(cat_row, "createdAt") or "",
+            primaryPhoto=row_get(cat_row, "primary_photo"),
         ),
         stats=CatStats(
             totalSightings=total_sightings,
-            uniqueLocations=len(unique_locations_set),
-            photoCount=photo_count,
-            firstSeen=first_seen,
-            lastSeen=last_seen,
+            uniqueLocations=row_get(cat_row, "unique_locations"),
+            photoCount=row_get(cat_row, "photo_count"),
+            firstSeen=row_get(cat_row, "first_seen"),
+            lastSeen=row_get(cat_row, "last_seen"),
             mostFrequentLocation=most_frequent_location,
         ),
         recentSightings=recent_sightings,
@@ -1662,9 +3337,129 @@ def enhanced_cat_profile(cat_id: int):
     )
 
 
+@app.get("/cats/{cat_id}/profile/enhanced", response_model=EnhancedCatProfile)
+def enhanced_cat_profile(cat_id: int, background_tasks: BackgroundTasks):
+    """
+    Enhanced cat profile with aggregated stats for the dedicated Cat Profile page.
+
+    Returns:
+    - Basic cat info with primary photo
+    - Statistics (total sightings, unique locations, photos, date range)
+    - Recent sightings preview (last 5)
+    - Location summary with counts
+    - Insight generation status
+    - Legacy profile text for backward compatibility
+
+    Served from the versioned profile cache (see Cat Profile Cache).
+    """
+    return cached_profile_response("enhanced", cat_id, build_enhanced_cat_profile, background_tasks)
+
+
+def build_enhanced_cat_profile(cat_id: int) -> EnhancedCatProfile:
+    """
+    Build the enhanced cat profile (see load_enhanced_profiles).
+
+    Stats, locations and tags are read from the incrementally maintained
+    cat_stats / cat_location_stats / cat_keywords tables, so the cost doesn't
+    grow with the number of sightings.
+    """
+    conn = get_conn()
+    cur = get_cursor(conn)
+    profile = load_enhanced_profiles(cur, [cat_id]).get(cat_id)
+    conn.commit()  # load_enhanced_profiles may have built the stats rows
+    conn.close()
+
+    if profile is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"code": "CAT_NOT_FOUND", "message": f"Cat with ID {cat_id} not found", "retryable": False}
+        )
+    return profile
+
+
+@app.get("/cats/profiles/enhanced", response_model=List[EnhancedCatProfile])
+def enhanced_cat_profiles(
+    ids: str = Query(..., description=f"Comma-separated cat ids (?ids=1,2,3), at most {PROFILE_BATCH_MAX_IDS}"),
+):
+    """
+    Enhanced profiles of many cats at once (cat list and map views).
+
+    Cached profiles are reused; the others are built together by
+    load_enhanced_profiles with a fixed number of queries instead of one
+    round of queries per cat. Returned in the requested order; unknown ids
+    are skipped.
+    """
+    try:
+        cat_ids = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be a comma-separated list of integers")
+    if not cat_ids or len(cat_ids) > PROFILE_BATCH_MAX_IDS:
+        raise HTTPException(status_code=422, detail=f"Between 1 and {PROFILE_BATCH_MAX_IDS} ids are required")
+
+    conn = get_conn()
+    cur = get_cursor(conn)
+    execute_query(cur,
+        f"SELECT id, version FROM cats WHERE id IN ({', '.join('?' for _ in cat_ids)})",
+        tuple(cat_ids),
+    )
+    versions = {row_get(r, "id"): row_get(r, "version") for r in cur.fetchall()}
+
+    bodies: dict[int, bytes] = {}
+    for cat_id, version in versions.items():
+        body, _ = profile_cache.get("enhanced", cat_id, version)
+        if body is not None:
+            bodies[cat_id] = body
+
+    built = load_enhanced_profiles(cur, [cat_id for cat_id in versions if cat_id not in bodies])
+    conn.commit()  # load_enhanced_profiles may have built stats rows
+    conn.close()
+    for cat_id, profile in built.items():
+        bodies[cat_id] = profile.model_dump_json().encode()
+        profile_cache.put("enhanced", cat_id, versions[cat_id], bodies[cat_id])
+
+    content = b"[" + b",".join(bodies[cat_id] for cat_id in cat_ids if cat_id in bodies) + b"]"
+    return Response(content=content, media_type="application/json")
+
+
 # -----------------------------------------------------------------------------
 # Paginated Cat Sightings
 # -----------------------------------------------------------------------------
+#
+# Sightings and comments support two modes: page/limit (OFFSET, kept for
+# compatibility) and keyset pagination with the opaque nextCursor of the
+# previous page, which seeks straight to (createdAt, id) on a composite index
+# so deep pages cost the same as the first one.
+
+def encode_cursor(values: list) -> str:
+    """Opaque pagination cursor for the sort key values of the last returned row."""
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, length: int) -> list:
+    """Inverse of encode_cursor; 400 if the cursor is malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, UnicodeDecodeError):
+        values = None
+    if not isinstance(values, list) or len(values) != length:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def newest_first_after(cursor: Optional[str]) -> tuple[str, tuple]:
+    """SQL condition (and params) for rows after a (createdAt, id) cursor, newest first."""
+    if cursor is None:
+        return "", ()
+    return " AND (createdAt, id) < (?, ?)", tuple(decode_cursor(cursor, 2))
+
+
+def next_page_cursor(items: list, limit: int) -> Optional[str]:
+    """Cursor of the last item on the page, if the query's extra row shows more follow."""
+    if len(items) <= limit:
+        return None
+    last = items[limit - 1]
+    return encode_cursor([last.createdAt, last.id])
+
 
 class PaginatedSighting(BaseModel):
     """Individual sighting in paginated response."""
@@ -1676,37 +3471,47 @@ class PaginatedSighting(BaseModel):
     location_lat: Optional[float] = None
     location_lon: Optional[float] = None
     photo_url: Optional[str] = None
+    photo_thumb_url: Optional[str] = None
     nickname: Optional[str] = None
     isFavorite: bool = False
 
 
+sighting_mapper = RowMapper(PaginatedSighting)
+
+
 class PaginatedSightingsResponse(BaseModel):
     """Paginated sightings response with metadata."""
     sightings: List[PaginatedSighting]
-    total: int
+    total: Optional[int] = None  # None when include_total=false
     page: int
     limit: int
-    totalPages: int
+    totalPages: Optional[int] = None
     hasMore: bool
+    nextCursor: Optional[str] = None  # Pass as ?cursor= for the next page
 
 
 @app.get("/cats/{cat_id}/sightings", response_model=PaginatedSightingsResponse)
 def get_cat_sightings(
     cat_id: int,
-    page: int = Query(1, ge=1, description="Page number (1-indexed)"),
+    page: int = Query(1, ge=1, description="Page number (1-indexed, ignored with cursor)"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page"),
+    include_total: bool = Query(True, description="Include total / totalPages"),
 ):
     """
     Get paginated sightings for a specific cat.
 
-    Supports offset-based pagination with configurable page size.
-    Returns sightings ordered by date (newest first).
+    Supports offset-based pagination with configurable page size, or keyset
+    pagination with the nextCursor of the previous page. Returns sightings
+    ordered by date (newest first). The total comes from cat_stats, so it
+    doesn't need a COUNT over the cat's sightings (unless the cat has no
+    stats row yet).
     """
     conn = get_conn()
     cur = get_cursor(conn)
 
     # Verify cat exists
-    execute_query(cur, "SELECT id FROM cats WHERE id = ?", (cat_id,))
+    run_query(cur, "cat_exists", (cat_id,))
     cat_row = cur.fetchone()
     if cat_row is None:
         conn.close()
@@ -1715,53 +3520,44 @@ def get_cat_sightings(
             detail={"code": "CAT_NOT_FOUND", "message": f"Cat with ID {cat_id} not found", "retryable": False}
         )
 
-    # Get total count
-    execute_query(cur, "SELECT COUNT(*) as count FROM entries WHERE cat_id = ?", (cat_id,))
-    total = cur.fetchone()["count"]
-
-    # Calculate pagination
-    offset = (page - 1) * limit
-    total_pages = max(1, (total + limit - 1) // limit)
+    total = total_pages = None
+    if include_total:
+        execute_query(cur, "SELECT total_sightings FROM cat_stats WHERE cat_id = ?", (cat_id,))
+        stats_row = cur.fetchone()
+        if stats_row is None:
+            # Cat from before cat_stats, not backfilled yet
+            execute_query(cur, "SELECT COUNT(*) AS n FROM entries WHERE cat_id = ?", (cat_id,))
+            total = row_get(cur.fetchone(), "n")
+        else:
+            total = row_get(stats_row, "total_sightings")
+        total_pages = max(1, (total + limit - 1) // limit)
 
-    # Fetch sightings for this page
+    # Fetch sightings for this page (plus one row to tell whether more follow)
+    after_sql, after_params = newest_first_after(cursor)
+    offset = 0 if cursor else (page - 1) * limit
     execute_query(cur,
-        """
+        f"""
         SELECT id, text, createdAt, location, location_normalized,
-               location_lat, location_lon, photo_url, nickname, isFavorite
+               location_lat, location_lon, photo_url, photo_thumb_url, nickname, isFavorite
         FROM entries
-        WHERE cat_id = ?
-        ORDER BY createdAt DESC
+        WHERE cat_id = ?{after_sql}
+        ORDER BY createdAt DESC, id DESC
         LIMIT ? OFFSET ?
         """,
-        (cat_id, limit, offset),
+        (cat_id, *after_params, limit + 1, offset),
     )
-    rows = cur.fetchall()
+    sightings = sighting_mapper.map(cur, cur.fetchall())
     conn.close()
-
-    sightings = []
-    for row in rows:
-        created_at = row_get(row, "createdAt") or row_get(row, "createdat") or ""
-        is_favorite = row_get(row, "isFavorite") or row_get(row, "isfavorite") or False
-        sightings.append(PaginatedSighting(
-            id=row["id"],
-            text=row["text"],
-            createdAt=created_at,
-            location=row["location"],
-            location_normalized=row["location_normalized"],
-            location_lat=row["location_lat"],
-            location_lon=row["location_lon"],
-            photo_url=row["photo_url"],
-            nickname=row["nickname"],
-            isFavorite=bool(is_favorite),
-        ))
+    next_cursor = next_page_cursor(sightings, limit)
 
     return PaginatedSightingsResponse(
-        sightings=sightings,
+        sightings=sightings[:limit],
         total=total,
         page=page,
         limit=limit,
         totalPages=total_pages,
-        hasMore=page < total_pages,
+        hasMore=next_cursor is not None,
+        nextCursor=next_cursor,
     )
 
 
@@ -1814,6 +3610,7 @@ def update_cat(cat_id: int, payload: CatUpdatePayload):
         "UPDATE cats SET name = ?, updatedAt = ? WHERE id = ?",
         (new_name, now, cat_id),
     )
+    bump_cat_version(cur, cat_id)
     conn.commit()
     conn.close()
 
@@ -1844,14 +3641,18 @@ class Comment(BaseModel):
     updatedAt: str
 
 
+comment_mapper = RowMapper(Comment)
+
+
 class PaginatedCommentsResponse(BaseModel):
     """Paginated comments response."""
     comments: List[Comment]
-    total: int
+    total: Optional[int] = None  # None when include_total=false
     page: int
     limit: int
-    totalPages: int
+    totalPages: Optional[int] = None
     hasMore: bool
+    nextCursor: Optional[str] = None  # Pass as ?cursor= for the next page
 
 
 @app.post("/cats/{cat_id}/comments", response_model=Comment, status_code=201)
@@ -1866,7 +3667,7 @@ def create_comment(cat_id: int, payload: CommentCreate):
     cur = get_cursor(conn)
 
     # Verify cat exists
-    execute_query(cur, "SELECT id FROM cats WHERE id = ?", (cat_id,))
+    run_query(cur, "cat_exists", (cat_id,))
     cat_row = cur.fetchone()
     if cat_row is None:
         conn.close()
@@ -1902,19 +3703,22 @@ def create_comment(cat_id: int, payload: CommentCreate):
 @app.get("/cats/{cat_id}/comments", response_model=PaginatedCommentsResponse)
 def get_cat_comments(
     cat_id: int,
-    page: int = Query(1, ge=1, description="Page number (1-indexed)"),
+    page: int = Query(1, ge=1, description="Page number (1-indexed, ignored with cursor)"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page"),
+    include_total: bool = Query(True, description="Include total / totalPages (a COUNT query)"),
 ):
     """
     Get paginated comments for a cat's profile.
 
-    Returns comments ordered by date (newest first).
+    Page/limit or keyset pagination with the nextCursor of the previous
+    page. Returns comments ordered by date (newest first).
     """
     conn = get_conn()
     cur = get_cursor(conn)
 
     # Verify cat exists
-    execute_query(cur, "SELECT id FROM cats WHERE id = ?", (cat_id,))
+    run_query(cur, "cat_exists", (cat_id,))
     cat_row = cur.fetchone()
     if cat_row is None:
         conn.close()
@@ -1923,48 +3727,37 @@ def get_cat_comments(
             detail={"code": "CAT_NOT_FOUND", "message": f"Cat with ID {cat_id} not found", "retryable": False}
         )
 
-    # Get total count
-    execute_query(cur, "SELECT COUNT(*) as count FROM cat_comments WHERE cat_id = ?", (cat_id,))
-    total = cur.fetchone()["count"]
-
-    # Calculate pagination
-    offset = (page - 1) * limit
-    total_pages = max(1, (total + limit - 1) // limit)
+    total = total_pages = None
+    if include_total:
+        execute_query(cur, "SELECT COUNT(*) as count FROM cat_comments WHERE cat_id = ?", (cat_id,))
+        total = cur.fetchone()["count"]
+        total_pages = max(1, (total + limit - 1) // limit)
 
-    # Fetch comments for this page
+    # Fetch comments for this page (plus one row to tell whether more follow)
+    after_sql, after_params = newest_first_after(cursor)
+    offset = 0 if cursor else (page - 1) * limit
     execute_query(cur,
-        """
+        f"""
         SELECT id, cat_id, author_name, content, createdAt, updatedAt
         FROM cat_comments
-        WHERE cat_id = ?
-        ORDER BY createdAt DESC
+        WHERE cat_id = ?{after_sql}
+        ORDER BY createdAt DESC, id DESC
         LIMIT ? OFFSET ?
         """,
-        (cat_id, limit, offset),
+        (cat_id, *after_params, limit + 1, offset),
     )
-    rows = cur.fetchall()
+    comments = comment_mapper.map(cur, cur.fetchall())
     conn.close()
-
-    comments = []
-    for row in rows:
-        created_at = row_get(row, "createdAt") or row_get(row, "createdat") or ""
-        updated_at = row_get(row, "updatedAt") or row_get(row, "updatedat") or ""
-        comments.append(Comment(
-            id=row["id"],
-            cat_id=row["cat_id"],
-            author_name=row["author_name"],
-            content=row["content"],
-            createdAt=created_at,
-            updatedAt=updated_at,
-        ))
+    next_cursor = next_page_cursor(comments, limit)
 
     return PaginatedCommentsResponse(
-        comments=comments,
+        comments=comments[:limit],
         total=total,
         page=page,
         limit=limit,
         totalPages=total_pages,
-        hasMore=page < total_pages,
+        hasMore=next_cursor is not None,
+        nextCursor=next_cursor,
     )
 
 
@@ -2000,6 +3793,95 @@ def delete_comment(cat_id: int, comment_id: int):
     return None
 
 
+# Keyword candidates per /entries/{id}/matches lookup (newest first), so a
+# keyword nearly every note contains ("cat") can't make it a full scan
+MATCH_KEYWORD_CANDIDATE_LIMIT = 2000
+
+
+def entry_keywords(text: str, location: Optional[str]) -> set[str]:
+    """The keywords compute_match_score compares: text plus free-text location."""
+    return tokenize_keywords(text) | tokenize_keywords(location or "")
+
+
+def index_entry_keywords(cur, entries: List[tuple[int, str, Optional[str]]]) -> None:
+    """Index (id, text, location) of newly inserted entries for match lookups (caller commits)."""
+    execute_many(cur,
+        "INSERT INTO entry_keywords (keyword, entry_id) VALUES (?, ?) ON CONFLICT DO NOTHING",
+        [(keyword, entry_id) for entry_id, text, location in entries for keyword in entry_keywords(text, location)],
+    )
+    execute_many(cur, "UPDATE entries SET keywords_indexed = 1 WHERE id = ?", [(e[0],) for e in entries])
+
+
+def backfill_entry_keywords(batch_size: int = BACKFILL_BATCH_SIZE * 10) -> int:
+    """
+    Index the keywords of entries from before entry_keywords (see run_backfills).
+
+    Returns:
+        Number of entries indexed
+    """
+    done = 0
+    while True:
+        conn = get_conn()
+        cur = get_cursor(conn)
+        execute_query(cur,
+            "SELECT id, text, location FROM entries WHERE keywords_indexed = 0 ORDER BY id LIMIT ?",
+            (batch_size,),
+        )
+        rows = cur.fetchall()
+        index_entry_keywords(cur, [(row_get(r, "id"), row_get(r, "text"), row_get(r, "location")) for r in rows])
+        conn.commit()
+        conn.close()
+        done += len(rows)
+        if len(rows) < batch_size:
+            return done
+
+
+def match_candidate_ids(cur, base, photo_ids: List[int], include_recent: int = 0) -> List[int]:
+    """
+    Entries that can score above zero against base in compute_match_score.
+
+    A candidate shares a text/location keyword with base (entry_keywords;
+    past MATCH_KEYWORD_CANDIDATE_LIMIT, those sharing the most keywords are
+    kept, then the newest), lies within scoring distance of its coordinates (bounding box on
+    idx_entries_lat_lon), or has a similar photo (photo_ids, from the
+    BK-tree). Everything else scores 0, so it's never loaded. include_recent
+    adds the newest entries too (min_score 0 lists zero-score candidates).
+    """
+    entry_id = row_get(base, "id")
+    ids = set(photo_ids)
+
+    keywords = sorted(entry_keywords(row_get(base, "text"), row_get(base, "location")))
+    if keywords:
+        execute_query(cur,
+            f"""
+            SELECT entry_id FROM entry_keywords
+            WHERE keyword IN ({", ".join("?" for _ in keywords)}) AND entry_id != ?
+            GROUP BY entry_id
+            ORDER BY COUNT(*) DESC, entry_id DESC
+            LIMIT ?
+            """,
+            (*keywords, entry_id, MATCH_KEYWORD_CANDIDATE_LIMIT),
+        )
+        ids.update(row_get(r, "entry_id") for r in cur.fetchall())
+
+    lat, lon = row_get(base, "location_lat"), row_get(base, "location_lon")
+    if lat is not None and lon is not None:
+        dlat = MATCH_DISTANCE_METERS / 111320.0
+        dlon = MATCH_DISTANCE_METERS / (111320.0 * max(cos(radians(lat)), 0.01))
+        execute_query(cur,
+            "SELECT id FROM entries WHERE location_lat BETWEEN ? AND ? AND location_lon BETWEEN ? AND ? AND id != ?",
+            (lat - dlat, lat + dlat, lon - dlon, lon + dlon, entry_id),
+        )
+        ids.update(row_get(r, "id") for r in cur.fetchall())
+
+    if include_recent:
+        execute_query(cur, "SELECT id FROM entries WHERE id != ? ORDER BY id DESC LIMIT ?", (entry_id, include_recent))
+        ids.update(row_get(r, "id") for r in cur.fetchall())
+
+    ids.discard(entry_id)
+    return sorted(ids, reverse=True)
+
+
 @app.get("/entries/{entry_id}/matches", response_model=List[MatchCandidate])
 def find_matches(
     entry_id: int,
@@ -2010,7 +3892,10 @@ def find_matches(
     Suggest possible matches for a given entry.
 
     Uses geographic distance when coordinates are available (from location normalization),
-    otherwise falls back to text-based matching.
+    otherwise falls back to text-based matching. Candidates with a visually
+    similar photo (perceptual hash lookup in photo_hash_index) score higher.
+    Only entries that can score above zero are loaded and scored (see
+    match_candidate_ids), not the whole table.
 
     Parameters:
     - top_k: return at most N candidates (1-20, default 5)
@@ -2024,7 +3909,7 @@ def find_matches(
     # 1) Load the base entry with coordinates
     execute_query(cur,
         """
-        SELECT id, text, location, location_lat, location_lon
+        SELECT id, text, location, location_lat, location_lon, photo_dhash
         FROM entries
         WHERE id = ?
         """,
@@ -2035,22 +3920,30 @@ def find_matches(
         conn.close()
         raise HTTPException(status_code=404, detail="Entry not found")
 
+    # Visually similar photos: one BK-tree lookup instead of comparing every hash
+    base_dhash = row_get(base, "photo_dhash")
+    photo_distances = photo_hash_index.similar(base_dhash) if base_dhash else {}
+
     base_text = base["text"]
     base_location = base["location"] or ""
     base_lat = base["location_lat"]
     base_lon = base["location_lon"]
 
-    # 2) Load all other candidates with coordinates
-    execute_query(cur,
-        """
-        SELECT id, text, createdAt, nickname, location, location_lat, location_lon
-        FROM entries
-        WHERE id != ?
-        ORDER BY id DESC
-        """,
-        (entry_id,),
-    )
-    rows = cur.fetchall()
+    # 2) Load the candidates: keyword, bounding-box and photo hits (newest first)
+    candidate_ids = match_candidate_ids(cur, base, list(photo_distances), include_recent=top_k if min_score <= 0 else 0)
+    rows = []
+    for start in range(0, len(candidate_ids), IN_CLAUSE_CHUNK_SIZE):
+        chunk = candidate_ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+        execute_query(cur,
+            f"""
+            SELECT id, text, createdAt, nickname, location, location_lat, location_lon
+            FROM entries
+            WHERE id IN ({", ".join("?" for _ in chunk)})
+            ORDER BY id DESC
+            """,
+            tuple(chunk),
+        )
+        rows.extend(cur.fetchall())
     conn.close()
 
     candidates: list[MatchCandidate] = []
@@ -2071,6 +3964,7 @@ def find_matches(
             base_lon=base_lon,
             cand_lat=cand_lat,
             cand_lon=cand_lon,
+            photo_distance=photo_distances.get(r["id"]),
         )
 
         if score >= min_score:
@@ -2080,6 +3974,7 @@ def find_matches(
                     candidate_id=r["id"],
                     score=round(score, 3),
                     reasons=reasons,
+                    photo_distance=photo_distances.get(r["id"]),
                     candidate_nickname=r["nickname"],
                     candidate_location=r["location"],
                     candidate_text=r["text"],
@@ -2223,49 +4118,226 @@ def find_nearby_sightings(
     return nearby[:top_k]
 
 
+# UPDATE ... RETURNING: PostgreSQL, and SQLite from 3.35
+SUPPORTS_RETURNING = settings.is_postgres or sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+entry_mapper = RowMapper(Entry)
+
+
+def update_entry_returning(cur, entry_id: int, assignments: str, params: tuple = ()) -> Optional[Entry]:
+    """
+    UPDATE one entry and return it as updated (caller commits).
+
+    A single statement with RETURNING instead of read-modify-read; older
+    SQLite falls back to UPDATE + SELECT. Returns None if the entry doesn't exist.
+    """
+    sql = f"UPDATE entries SET {assignments} WHERE id = ?"
+    if SUPPORTS_RETURNING:
+        execute_query(cur, f"{sql} RETURNING {ENTRY_COLUMNS}", (*params, entry_id))
+        return entry_mapper.one(cur)
+
+    execute_query(cur, sql, (*params, entry_id))
+    if cur.rowcount == 0:
+        return None
+    run_query(cur, "entry_by_id", (entry_id,))
+    return entry_mapper.one(cur)
+
+
+def entry_filter_conditions(
+    favorites: bool = False,
+    cat_id: Optional[int] = None,
+    unassigned: bool = False,
+    has_coords: bool = False,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    city: Optional[str] = None,
+) -> tuple[list[str], list]:
+    """WHERE conditions (and params) for the GET /entries / export filters."""
+    if cat_id is not None and unassigned:
+        raise HTTPException(status_code=422, detail="cat_id and unassigned can't be combined")
+
+    conditions: list[str] = []
+    params: list = []
+    if favorites:
+        conditions.append("isFavorite = 1")
+    if cat_id is not None:
+        conditions.append("cat_id = ?")
+        params.append(cat_id)
+    if unassigned:
+        conditions.append("cat_id IS NULL")
+    if has_coords:
+        conditions.append("location_lat IS NOT NULL AND location_lon IS NOT NULL")
+    if since:
+        conditions.append("createdAt >= ?")
+        params.append(since)
+    if until:
+        conditions.append("createdAt < ?")
+        params.append(until)
+    if city:
+        conditions.append("LOWER(location_city) = ?")
+        params.append(city.strip().lower())
+    return conditions, params
+
+
+ENTRIES_DEFAULT_PAGE_SIZE = 100
+
+
 @app.get("/entries", response_model=List[Entry])
-def get_entries():
+def get_entries(
+    response: Response,
+    favorites: bool = Query(False, description="Only favorite entries"),
+    cat_id: Optional[int] = Query(None, description="Only sightings of this cat"),
+    unassigned: bool = Query(False, description="Only sightings not linked to a cat"),
+    has_coords: bool = Query(False, description="Only entries with coordinates (map view)"),
+    since: Optional[str] = Query(None, description="createdAt at/after this ISO timestamp"),
+    until: Optional[str] = Query(None, description="createdAt before this ISO timestamp"),
+    city: Optional[str] = Query(None, description="location_city (case-insensitive)"),
+    limit: int = Query(ENTRIES_DEFAULT_PAGE_SIZE, ge=1, le=500, description="Page size"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+):
     """
-    Return all entries, newest first.
+    Return entries, newest first, optionally filtered and paginated.
+
+    Filters are applied in SQL (each backed by an index). Pages hold limit
+    entries (ENTRIES_DEFAULT_PAGE_SIZE by default), with keyset pagination
+    on id: when more entries follow, the X-Next-Cursor response header
+    holds the cursor for the next page.
     """
+    conditions, params = entry_filter_conditions(favorites, cat_id, unassigned, has_coords, since, until, city)
+    if cursor:
+        conditions.append("id < ?")
+        params.extend(decode_cursor(cursor, 1))
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    params.append(limit + 1)  # One extra row tells whether there's a next page
+
     conn = get_conn()
     cur = get_cursor(conn)
     execute_query(cur,
-    """
-    SELECT id, text, createdAt, isFavorite, nickname, location, cat_id, photo_url,
-           location_normalized, location_lat, location_lon, location_osm_id,
-           location_street, location_number, location_zip, location_city, location_country
+    f"""
+    SELECT {ENTRY_COLUMNS}
     FROM entries
+    {where}
     ORDER BY id DESC
-    """
+    LIMIT ?
+    """,
+    tuple(params),
     )
-    rows = cur.fetchall()
+    entries = entry_mapper.map(cur, cur.fetchall())
     conn.close()
 
-    result: list[Entry] = []
-    for r in rows:
-        result.append(
-            Entry(
-                id=r["id"],
-                text=r["text"],
-                createdAt=row_get(r, "createdAt"),
-                isFavorite=bool(row_get(r, "isFavorite")),
-                nickname=r["nickname"],
-                location=r["location"],
-                cat_id=r["cat_id"],
-                photo_url=r["photo_url"],
-                location_normalized=r["location_normalized"],
-                location_lat=r["location_lat"],
-                location_lon=r["location_lon"],
-                location_osm_id=r["location_osm_id"],
-                location_street=r["location_street"],
-                location_number=r["location_number"],
-                location_zip=r["location_zip"],
-                location_city=r["location_city"],
-                location_country=r["location_country"],
-            )
-        )
-    return result
+    if len(entries) > limit:
+        entries = entries[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor([entries[-1].id])
+    return entries
+
+
+# Columns in sighting exports, in output order
+EXPORT_COLUMNS = (
+    "id", "text", "createdAt", "isFavorite", "nickname", "cat_id", "photo_url",
+    "location", "location_normalized", "location_lat", "location_lon",
+    "location_street", "location_number", "location_zip", "location_city", "location_country",
+)
+EXPORT_BATCH_SIZE = 500  # Rows fetched (and written) per chunk
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "geojson": "application/geo+json",
+}
+
+
+def _export_record(row) -> dict:
+    record = {column: row_get(row, column) for column in EXPORT_COLUMNS}
+    record["isFavorite"] = bool(record["isFavorite"])
+    return record
+
+
+def _export_chunks(fmt: str, batches):
+    """Serialize batches of rows as ndjson / csv / geojson text chunks."""
+    if fmt == "csv":
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(EXPORT_COLUMNS)
+        for batch in batches:
+            for row in batch:
+                writer.writerow(_export_record(row).values())
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+        if buf.getvalue():
+            yield buf.getvalue()  # Header only: no rows matched
+        return
+
+    if fmt == "geojson":
+        yield '{"type":"FeatureCollection","features":['
+    first = True
+    for batch in batches:
+        lines = []
+        for row in batch:
+            record = _export_record(row)
+            if fmt == "ndjson":
+                lines.append(json.dumps(record) + "\n")
+                continue
+            has_coords = record["location_lat"] is not None and record["location_lon"] is not None
+            feature = {
+                "type": "Feature",
+                "id": record["id"],
+                "geometry": {
+                    "type": "Point",
+                    "coordinates": [record["location_lon"], record["location_lat"]],
+                } if has_coords else None,
+                "properties": record,
+            }
+            lines.append(("" if first else ",") + json.dumps(feature))
+            first = False
+        yield "".join(lines)
+    if fmt == "geojson":
+        yield "]}"
+
+
+def _stream_entries(sql: str, params: tuple):
+    """Yield batches of rows from a server-side cursor; closes the connection at the end."""
+    conn = get_conn()
+    try:
+        cur = get_streaming_cursor(conn, "entries_export")
+        execute_query(cur, sql, params)
+        while True:
+            batch = cur.fetchmany(EXPORT_BATCH_SIZE)
+            if not batch:
+                break
+            yield batch
+    finally:
+        conn.close()
+
+
+@app.get("/entries/export")
+def export_entries(
+    fmt: Literal["ndjson", "csv", "geojson"] = Query("ndjson", alias="format", description="Output format"),
+    favorites: bool = Query(False, description="Only favorite entries"),
+    cat_id: Optional[int] = Query(None, description="Only sightings of this cat"),
+    unassigned: bool = Query(False, description="Only sightings not linked to a cat"),
+    has_coords: bool = Query(False, description="Only entries with coordinates"),
+    since: Optional[str] = Query(None, description="createdAt at/after this ISO timestamp"),
+    until: Optional[str] = Query(None, description="createdAt before this ISO timestamp"),
+    city: Optional[str] = Query(None, description="location_city (case-insensitive)"),
+):
+    """
+    Download sightings as NDJSON, CSV or GeoJSON (same filters as GET /entries).
+
+    Rows are streamed in batches from a server-side cursor, so memory use
+    stays constant regardless of how many sightings there are. GeoJSON
+    features of entries without coordinates have a null geometry.
+    """
+    conditions, params = entry_filter_conditions(favorites, cat_id, unassigned, has_coords, since, until, city)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM entries {where} ORDER BY id"
+
+    return StreamingResponse(
+        _export_chunks(fmt, _stream_entries(sql, tuple(params))),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="sightings.{fmt}"'},
+    )
 
 
 @app.post("/cats", response_model=Cat)
@@ -2276,19 +4348,8 @@ def create_cat(payload: CatCreate):
     conn = get_conn()
     cur = get_cursor(conn)
 
-    ph = sql_placeholder()
-    if settings.is_postgres:
-        execute_query(cur, 
-            f"INSERT INTO cats (name, createdAt) VALUES ({ph}, {ph}) RETURNING id",
-            (name, created_at),
-        )
-        new_id = cur.fetchone()['id']
-    else:
-        execute_query(cur, 
-            f"INSERT INTO cats (name, createdAt) VALUES ({ph}, {ph})",
-            (name, created_at),
-        )
-        new_id = cur.lastrowid
+    new_id = insert_returning_id(cur, "insert_cat", (name, created_at))
+    init_cat_stats(cur, new_id)
 
     conn.commit()
     conn.close()
@@ -2322,110 +4383,1010 @@ def build_location_string(
     if city_part:
         parts.append(" ".join(city_part))
 
-    # Country
-    if country:
-        parts.append(country)
+    # Country
+    if country:
+        parts.append(country)
+
+    return ", ".join(parts) if parts else None
+
+
+def clean_entry_payload(payload: EntryCreate) -> dict:
+    """
+    Trimmed column values for a new entry (empty strings become None).
+
+    The combined location is built from the structured address fields, or
+    taken from the legacy location field. Raises ValueError for blank text.
+    """
+    text = payload.text.strip()
+    if not text:
+        raise ValueError("text must not be empty")
+
+    nickname = payload.nickname.strip() if payload.nickname and payload.nickname.strip() else None
+    photo_url = payload.photo_url.strip() if payload.photo_url and payload.photo_url.strip() else None
+
+    # Structured address fields
+    location_street = payload.location_street.strip() if payload.location_street and payload.location_street.strip() else None
+    location_number = payload.location_number.strip() if payload.location_number and payload.location_number.strip() else None
+    location_zip = payload.location_zip.strip() if payload.location_zip and payload.location_zip.strip() else None
+    location_city = payload.location_city.strip() if payload.location_city and payload.location_city.strip() else None
+    location_country = payload.location_country.strip() if payload.location_country and payload.location_country.strip() else None
+
+    # Build combined location string from structured fields, or use legacy field
+    if any([location_street, location_number, location_zip, location_city, location_country]):
+        location = build_location_string(location_street, location_number, location_zip, location_city, location_country)
+    else:
+        location = payload.location.strip() if payload.location and payload.location.strip() else None
+
+    return {
+        "text": text,
+        "nickname": nickname,
+        "location": location,
+        "photo_url": photo_url,
+        "location_street": location_street,
+        "location_number": location_number,
+        "location_zip": location_zip,
+        "location_city": location_city,
+        "location_country": location_country,
+    }
+
+
+@app.post("/entries", response_model=Entry)
+def create_entry(payload: EntryCreate):
+    try:
+        values = clean_entry_payload(payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    text, nickname, location, photo_url = values["text"], values["nickname"], values["location"], values["photo_url"]
+    location_street, location_number, location_zip, location_city, location_country = (
+        values["location_street"], values["location_number"], values["location_zip"],
+        values["location_city"], values["location_country"],
+    )
+
+    created_at = datetime.utcnow().isoformat() + "Z"
+
+    conn = get_conn()
+    cur = get_cursor(conn)
+
+    new_id = insert_returning_id(cur, "insert_entry", (
+        text, created_at, 0, nickname, location, None, photo_url,
+        location_street, location_number, location_zip, location_city, location_country,
+    ))
+    index_entry_keywords(cur, [(new_id, text, location)])
+    if photo_url:
+        attach_image_urls(cur, [photo_url])
+
+    conn.commit()
+    conn.close()
+
+    schedule_geocoding(new_id, location)
+    schedule_analysis(new_id)
+
+    return Entry(
+        id=new_id,
+        text=text,
+        createdAt=created_at,
+        isFavorite=False,
+        nickname=nickname,
+        location=location,
+        cat_id=None,
+        photo_url=photo_url,
+        location_normalized=None,
+        location_lat=None,
+        location_lon=None,
+        location_osm_id=None,
+        location_street=location_street,
+        location_number=location_number,
+        location_zip=location_zip,
+        location_city=location_city,
+        location_country=location_country,
+    )
+
+
+# -----------------------------------------------------------------------------
+# Bulk Ingest (partner spreadsheets, field apps)
+# -----------------------------------------------------------------------------
+
+BULK_INGEST_MAX_ROWS = 10000
+BULK_INGEST_MAX_BYTES = 20 * 1024 * 1024  # Checked before the body is parsed
+BULK_INGEST_CHUNK_SIZE = 500  # Rows per insert statement batch / transaction
+
+# Same column order as the values built by clean_entry_payload (+ createdAt, isFavorite)
+BULK_INSERT_COLUMNS = (
+    "text", "nickname", "location", "photo_url",
+    "location_street", "location_number", "location_zip", "location_city", "location_country",
+    "createdAt", "isFavorite",
+)
+
+
+class BulkIngestRowResult(BaseModel):
+    """Outcome of one uploaded row."""
+    index: int  # 0-based position in the upload (data rows only for CSV)
+    status: Literal["created", "invalid", "failed"]
+    entry_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkIngestResponse(BaseModel):
+    """Per-row results of a bulk ingest."""
+    created: int
+    invalid: int
+    failed: int  # valid rows whose chunk couldn't be written
+    geocoding_queued: int
+    geocoding_deferred: int  # queue was full: geocoded later by requeue_deferred_geocoding
+    results: List[BulkIngestRowResult]
+
+
+def parse_bulk_rows(body: bytes, content_type: str) -> list:
+    """
+    Split an upload into raw rows (dicts; anything else fails validation).
+
+    JSON: an array of objects. NDJSON: one object per line (a malformed line
+    becomes an invalid row). CSV: a header row with EntryCreate field names;
+    empty cells are treated as missing. The body must be UTF-8 (a BOM is allowed).
+    """
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=400,
+            detail="Body must be UTF-8 encoded (re-save the file as UTF-8, e.g. \"CSV UTF-8\" in Excel)",
+        )
+    if content_type == "application/json":
+        try:
+            rows = json.loads(text)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body is not valid JSON")
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of sightings")
+        return rows
+    if content_type in ("application/x-ndjson", "application/jsonl"):
+        rows = []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                rows.append(None)
+        return rows
+    if content_type == "text/csv":
+        return [
+            {key: value for key, value in record.items() if key and value not in (None, "")}
+            for record in csv.DictReader(io.StringIO(text))
+        ]
+    raise HTTPException(
+        status_code=415,
+        detail="Use Content-Type application/json, application/x-ndjson or text/csv",
+    )
+
+
+def insert_entries(cur, rows: list[tuple]) -> list[int]:
+    """
+    Insert many entries (BULK_INSERT_COLUMNS values) in one batch; ids in row order.
+
+    PostgreSQL: a multi-row INSERT ... RETURNING id. SQLite: executemany; ids
+    are consecutive inside the write transaction (AUTOINCREMENT), so they
+    follow from last_insert_rowid().
+    """
+    columns = ", ".join(BULK_INSERT_COLUMNS)
+    if settings.is_postgres:
+        returned = psycopg2.extras.execute_values(
+            cur, f"INSERT INTO entries ({columns}) VALUES %s RETURNING id",
+            rows, page_size=len(rows), fetch=True,
+        )
+        return [row_get(r, "id") for r in returned]
+
+    placeholders = ", ".join("?" for _ in BULK_INSERT_COLUMNS)
+    cur.executemany(f"INSERT INTO entries ({columns}) VALUES ({placeholders})", rows)
+    cur.execute("SELECT last_insert_rowid() AS id")
+    last_id = cur.fetchone()["id"]
+    return list(range(last_id - len(rows) + 1, last_id + 1))
+
+
+def ingest_entries(raw_rows: list) -> BulkIngestResponse:
+    """Validate rows with EntryCreate and insert the valid ones, one transaction per chunk."""
+    results: list[BulkIngestRowResult] = []
+    valid: list[tuple[int, dict]] = []
+    for index, raw in enumerate(raw_rows):
+        try:
+            valid.append((index, clean_entry_payload(EntryCreate.model_validate(raw))))
+        except ValidationError as e:
+            error = "; ".join(f"{'.'.join(map(str, err['loc'])) or 'row'}: {err['msg']}" for err in e.errors())
+            results.append(BulkIngestRowResult(index=index, status="invalid", error=error))
+        except ValueError as e:
+            results.append(BulkIngestRowResult(index=index, status="invalid", error=str(e)))
+
+    created: list[tuple[int, int, Optional[str]]] = []  # (index, entry id, location)
+    conn = get_conn()
+    try:
+        cur = get_cursor(conn)
+        for start in range(0, len(valid), BULK_INGEST_CHUNK_SIZE):
+            chunk = valid[start:start + BULK_INGEST_CHUNK_SIZE]
+            created_at = datetime.utcnow().isoformat() + "Z"
+            rows = [tuple(values[c] for c in BULK_INSERT_COLUMNS[:-2]) + (created_at, 0) for _, values in chunk]
+            try:
+                ids = insert_entries(cur, rows)
+                index_entry_keywords(cur, [
+                    (entry_id, values["text"], values["location"]) for (_, values), entry_id in zip(chunk, ids)
+                ])
+                attach_image_urls(cur, [values["photo_url"] for _, values in chunk if values["photo_url"]])
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.warning(f"Bulk ingest chunk at row {chunk[0][0]} failed: {e}")
+                results.extend(
+                    BulkIngestRowResult(index=index, status="failed", error="Could not be stored")
+                    for index, _ in chunk
+                )
+                continue
+            for (index, values), entry_id in zip(chunk, ids):
+                created.append((index, entry_id, values["location"]))
+                results.append(BulkIngestRowResult(index=index, status="created", entry_id=entry_id))
+    finally:
+        conn.close()
+
+    # Same follow-up work as POST /entries, once the rows are committed
+    geocoding_queued = 0
+    geocoding_deferred: list[int] = []
+    for _, entry_id, location in created:
+        if schedule_geocoding(entry_id, location):
+            geocoding_queued += 1
+        elif settings.auto_geocode_entries and location:
+            geocoding_deferred.append(entry_id)  # Queue full: picked up by the sweep
+        schedule_analysis(entry_id)
+    if geocoding_deferred:
+        defer_geocoding(geocoding_deferred)
+
+    results.sort(key=lambda r: r.index)
+    return BulkIngestResponse(
+        created=len(created),
+        invalid=sum(1 for r in results if r.status == "invalid"),
+        failed=sum(1 for r in results if r.status == "failed"),
+        geocoding_queued=geocoding_queued,
+        geocoding_deferred=len(geocoding_deferred),
+        results=results,
+    )
+
+
+@app.post("/entries/bulk", response_model=BulkIngestResponse)
+async def bulk_ingest_entries(request: Request):
+    """
+    Import many sightings in one request.
+
+    The body is a UTF-8 JSON array, NDJSON or CSV (by Content-Type), at
+    most BULK_INGEST_MAX_BYTES and BULK_INGEST_MAX_ROWS rows. Each row is
+    validated like POST /entries; valid rows are inserted in batches of
+    BULK_INGEST_CHUNK_SIZE, one transaction per batch, and invalid rows are
+    reported without stopping the import. Imported addresses are queued for
+    geocoding when AUTO_GEOCODE_ENTRIES is enabled; what doesn't fit in the
+    queue is geocoded later (geocoding_deferred).
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    too_large = HTTPException(status_code=413, detail=f"At most {BULK_INGEST_MAX_BYTES // (1024 * 1024)} MB per request")
+    try:
+        declared_length = int(request.headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length")
+    if declared_length > BULK_INGEST_MAX_BYTES:
+        raise too_large
+
+    # Read up to the limit (the header may be missing or wrong with chunked uploads)
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > BULK_INGEST_MAX_BYTES:
+            raise too_large
+
+    raw_rows = parse_bulk_rows(bytes(body), content_type)
+    if len(raw_rows) > BULK_INGEST_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_INGEST_MAX_ROWS} rows per request")
+
+    # Blocking DB work runs in the threadpool, like sync endpoints
+    return await run_in_threadpool(ingest_entries, raw_rows)
+
+
+# -----------------------------------------------------------------------------
+# Image Upload Endpoints (Bunny.net CDN Storage)
+# -----------------------------------------------------------------------------
+
+IMAGE_VARIANT_NAMES = ("thumb", "medium", "webp")
+
+# Columns holding storage URLs: a file is in use while any of them references it
+STORED_URL_COLUMNS = (
+    ("entries", "photo_url"),
+    ("entries", "photo_thumb_url"),
+    ("entries", "photo_medium_url"),
+    ("entries", "photo_webp_url"),
+    ("image_blobs", "url"),
+    ("image_blobs", "thumb_url"),
+    ("image_blobs", "medium_url"),
+    ("image_blobs", "webp_url"),
+)
+
+# How long a stored image no entry references is kept: a standalone upload
+# (POST /upload/image) must be attached to an entry within this time
+IMAGE_BLOB_LEASE = timedelta(hours=24)
+IMAGE_BLOB_COLUMNS = "url, thumb_url, medium_url, webp_url, dhash"
+# Releasing the last reference keeps a blob leased more recently than this
+# (an upload of the same content is in flight); it expires later instead
+IMAGE_BLOB_LEASE_GUARD = timedelta(minutes=10)
+IMAGE_BLOB_EXPIRE_INTERVAL_SECONDS = 3600
+
+
+def set_server_timing(response: Response, timings: dict) -> None:
+    """Report upload stage durations (ms) in a Server-Timing header (browser devtools show them)."""
+    if timings:
+        response.headers["Server-Timing"] = ", ".join(f"{stage};dur={ms}" for stage, ms in timings.items())
+
+
+def find_image_blob(sha256: str) -> Optional[UploadedImage]:
+    """
+    Look up already stored content by hash (find_existing hook for upload_image).
+
+    The lookup renews the blob's lease in the same statement, so the image
+    can't be released and deleted between this lookup and the caller
+    attaching it to an entry (release_image_blob and expire_image_blobs
+    skip recently leased blobs).
+
+    Returns:
+        The stored image's URLs, or None if this content was never uploaded
+    """
+    conn = get_conn()
+    cur = get_cursor(conn)
+    sql = "UPDATE image_blobs SET leasedAt = ? WHERE sha256 = ?"
+    params = (_utc_timestamp(datetime.utcnow()), sha256)
+    if SUPPORTS_RETURNING:
+        execute_query(cur, f"{sql} RETURNING {IMAGE_BLOB_COLUMNS}", params)
+    else:
+        execute_query(cur, sql, params)
+        execute_query(cur, f"SELECT {IMAGE_BLOB_COLUMNS} FROM image_blobs WHERE sha256 = ?", (sha256,))
+    row = cur.fetchone()
+    conn.commit()
+    conn.close()
+    if row is None:
+        return None
+
+    variants = {
+        name: row_get(row, f"{name}_url")
+        for name in IMAGE_VARIANT_NAMES
+        if row_get(row, f"{name}_url")
+    }
+    return UploadedImage(
+        url=row_get(row, "url"), variants=variants, sha256=sha256, dhash=row_get(row, "dhash")
+    )
+
+
+def acquire_image_blob(cur, uploaded: UploadedImage, references: int = 1) -> None:
+    """
+    Record an uploaded image (inserting it on first use) and renew its lease.
+
+    references: entries the image is attached to by this call, which
+    consumes the lease taken by find_image_blob. 0 for a standalone upload,
+    which stays leased and expires unless an entry attaches its URL (see
+    attach_image_urls) within IMAGE_BLOB_LEASE.
+    """
+    if not uploaded.sha256:
+        return
+
+    now = datetime.utcnow()
+    execute_query(cur,
+        """
+        INSERT INTO image_blobs (sha256, url, thumb_url, medium_url, webp_url, dhash, refcount, createdAt, leasedAt)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (sha256) DO UPDATE SET refcount = image_blobs.refcount + excluded.refcount,
+            dhash = COALESCE(image_blobs.dhash, excluded.dhash), leasedAt = excluded.leasedAt
+        """,
+        (
+            uploaded.sha256,
+            uploaded.url,
+            uploaded.variants.get("thumb"),
+            uploaded.variants.get("medium"),
+            uploaded.variants.get("webp"),
+            uploaded.dhash,
+            references,
+            now.isoformat() + "Z",
+            None if references else _utc_timestamp(now),
+        ),
+    )
+
+    # Content-addressed URLs come back when the same bytes are uploaded again
+    urls = [uploaded.url, *uploaded.variants.values()]
+    execute_query(cur,
+        f"DELETE FROM pending_deletes WHERE url IN ({', '.join('?' for _ in urls)})",
+        tuple(urls),
+    )
+
+
+def attach_image_urls(cur, urls: List[str]) -> None:
+    """
+    Count entries created with a client-supplied photo_url (from POST /upload/image).
+
+    URLs that aren't tracked images are ignored.
+    """
+    execute_many(cur, "UPDATE image_blobs SET refcount = refcount + 1, leasedAt = NULL WHERE url = ?",
+                 [(url,) for url in urls])
+    execute_many(cur, "DELETE FROM pending_deletes WHERE url = ?", [(url,) for url in urls])
+
+
+def _blob_urls(row) -> List[str]:
+    columns = ("url",) + tuple(f"{name}_url" for name in IMAGE_VARIANT_NAMES)
+    return [row_get(row, column) for column in columns if row_get(row, column)]
+
+
+def release_image_blob(cur, url: str) -> Optional[List[str]]:
+    """
+    Drop one reference to the image stored at url.
+
+    Returns:
+        URLs (original + variants) to delete from storage once the last
+        reference is gone, [] while other entries still use the image (or
+        an upload of the same content leased it moments ago; then it
+        expires later unless attached), or None if the URL isn't tracked
+        (uploaded before deduplication)
+    """
+    execute_query(cur, "UPDATE image_blobs SET refcount = refcount - 1 WHERE url = ?", (url,))
+    if cur.rowcount == 0:
+        return None
+
+    execute_query(cur,
+        "SELECT sha256, refcount, url, thumb_url, medium_url, webp_url FROM image_blobs WHERE url = ?",
+        (url,),
+    )
+    row = cur.fetchone()
+    if row_get(row, "refcount") > 0:
+        return []
+
+    # Guarded delete: a concurrent find_image_blob renews the lease in one statement
+    lease_cutoff = _utc_timestamp(datetime.utcnow() - IMAGE_BLOB_LEASE_GUARD)
+    execute_query(cur,
+        "DELETE FROM image_blobs WHERE sha256 = ? AND refcount <= 0 AND (leasedAt IS NULL OR leasedAt < ?)",
+        (row_get(row, "sha256"), lease_cutoff),
+    )
+    return _blob_urls(row) if cur.rowcount else []
+
+
+def expire_image_blobs() -> int:
+    """
+    Forget images no entry references whose lease ran out, and schedule their deletion.
+
+    Covers standalone uploads that were never attached and releases that
+    were deferred because the content was being uploaded again.
+
+    Returns:
+        Number of expired images
+    """
+    cutoff = _utc_timestamp(datetime.utcnow() - IMAGE_BLOB_LEASE)
+    conn = get_conn()
+    cur = get_cursor(conn)
+    execute_query(cur,
+        "SELECT sha256, url, thumb_url, medium_url, webp_url FROM image_blobs "
+        "WHERE refcount <= 0 AND COALESCE(leasedAt, '') < ?",
+        (cutoff,),
+    )
+    expired = 0
+    for row in cur.fetchall():
+        # Re-checked in the DELETE: the content may have been leased or attached meanwhile
+        execute_query(cur,
+            "DELETE FROM image_blobs WHERE sha256 = ? AND refcount <= 0 AND COALESCE(leasedAt, '') < ?",
+            (row_get(row, "sha256"), cutoff),
+        )
+        if cur.rowcount:
+            schedule_storage_deletes(cur, _blob_urls(row))
+            expired += 1
+    conn.commit()
+    conn.close()
+    if expired:
+        logger.info(f"Expired {expired} unattached image(s)")
+    return expired
+
+
+# Background photo uploads (see settings.async_image_uploads). Retries and
+# uploads that didn't fit in the queue wait in pending_uploads with a
+# next_attempt_at, and a periodic sweep re-queues them once they're due.
+PHOTO_UPLOAD_RETRY_BASE_DELAY = 30  # seconds, doubled after each failed attempt
+PHOTO_UPLOAD_SWEEP_INTERVAL_SECONDS = 30
+_photo_upload_sweep_task: Optional[asyncio.Task] = None
+
+
+def queue_pending_upload(cur, entry_id: int, spooled: SpooledImage) -> int:
+    """Record a spooled photo for the background uploader. Returns the pending_uploads id."""
+    params = (
+        entry_id, spooled.path, spooled.ext, spooled.size, spooled.sha256,
+        datetime.utcnow().isoformat() + "Z",
+    )
+    return insert_returning_id(cur, "insert_pending_upload", params)
+
+
+def defer_pending_upload(pending_id: int) -> None:
+    """Leave an upload the queue had no room for to the next requeue_due_uploads sweep."""
+    conn = get_conn()
+    cur = get_cursor(conn)
+    execute_query(cur,
+        "UPDATE pending_uploads SET next_attempt_at = ? WHERE id = ?",
+        (_utc_timestamp(datetime.utcnow()), pending_id),
+    )
+    conn.commit()
+    conn.close()
+
+
+def requeue_due_uploads() -> int:
+    """
+    Queue pending uploads whose next attempt is due, as many as the queue has room for.
+
+    A row's next_attempt_at is cleared before it's submitted (so a job that
+    fails right away can't have its retry time overwritten), and restored
+    if the queue turns it down after all.
+
+    Returns:
+        Number of uploads queued
+    """
+    room = photo_upload_queue.max_size - photo_upload_queue.stats()["depth"]
+    if not photo_upload_queue.running or room <= 0:
+        return 0
+
+    now = _utc_timestamp(datetime.utcnow())
+    conn = get_conn()
+    cur = get_cursor(conn)
+    execute_query(cur,
+        """
+        SELECT id FROM pending_uploads
+        WHERE next_attempt_at <= ?
+        ORDER BY next_attempt_at, id
+        LIMIT ?
+        """,
+        (now, room),
+    )
+    due = [row_get(r, "id") for r in cur.fetchall()]
+    execute_many(cur, "UPDATE pending_uploads SET next_attempt_at = NULL WHERE id = ?", [(i,) for i in due])
+    conn.commit()
+
+    rejected = [pending_id for pending_id in due if not photo_upload_queue.submit(pending_id)]
+    if rejected:
+        execute_many(cur, "UPDATE pending_uploads SET next_attempt_at = ? WHERE id = ?", [(now, i) for i in rejected])
+        conn.commit()
+    conn.close()
+    return len(due) - len(rejected)
+
+
+def resume_pending_uploads() -> int:
+    """
+    Re-queue uploads left over from a previous run (called on startup).
+
+    Uploads that were in the queue when it stopped are due right away;
+    those waiting for a retry keep their backoff and are left to the sweep.
+    """
+    conn = get_conn()
+    cur = get_cursor(conn)
+    execute_query(cur,
+        "UPDATE pending_uploads SET next_attempt_at = ? WHERE next_attempt_at IS NULL",
+        (_utc_timestamp(datetime.utcnow()),),
+    )
+    conn.commit()
+    conn.close()
+    return requeue_due_uploads()
+
+
+async def _photo_upload_sweep_loop() -> None:
+    while True:
+        await asyncio.sleep(PHOTO_UPLOAD_SWEEP_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(requeue_due_uploads)
+        except Exception as e:
+            logger.warning(f"Pending upload sweep failed: {e}")
+
+
+def start_photo_uploads() -> None:
+    """Start the photo upload worker and the pending-upload sweep (idempotent)."""
+    global _photo_upload_sweep_task
+    photo_upload_queue.start()
+    if _photo_upload_sweep_task is None or _photo_upload_sweep_task.done():
+        _photo_upload_sweep_task = asyncio.get_running_loop().create_task(_photo_upload_sweep_loop())
+
+
+async def stop_photo_uploads() -> None:
+    global _photo_upload_sweep_task
+    task, _photo_upload_sweep_task = _photo_upload_sweep_task, None
+    if task is not None:
+        task.cancel()
+    await photo_upload_queue.stop()
+
+
+def _load_pending_upload(pending_id: int):
+    conn = get_conn()
+    cur = get_cursor(conn)
+    execute_query(cur,
+        "SELECT id, entry_id, spool_path, ext, size, sha256, attempts FROM pending_uploads WHERE id = ?",
+        (pending_id,),
+    )
+    pending = cur.fetchone()
+    conn.close()
+    return pending
+
+
+def _attach_uploaded_photo(pending_id: int, entry_id: int, uploaded: UploadedImage) -> bool:
+    """Attach a stored photo to its entry unless it got another one meanwhile; True if attached."""
+    variants = uploaded.variants
+    conn = get_conn()
+    cur = get_cursor(conn)
+    execute_query(cur,
+        """
+        UPDATE entries
+        SET photo_url = ?, photo_thumb_url = ?, photo_medium_url = ?, photo_webp_url = ?,
+            photo_status = 'ready'
+        WHERE id = ? AND photo_status = 'pending'
+        """,
+        (uploaded.url, variants.get("thumb"), variants.get("medium"), variants.get("webp"), entry_id),
+    )
+    attached = cur.rowcount > 0
+    if attached:
+        acquire_image_blob(cur, uploaded)
+        store_photo_hash(cur, entry_id, uploaded.dhash)
+        refresh_cat_stats_for_entry(cur, entry_id)  # Photo count / primary photo
+    else:
+        # Entry got another photo meanwhile: don't leave this one behind in storage
+        execute_query(cur, "SELECT 1 FROM image_blobs WHERE sha256 = ?", (uploaded.sha256,))
+        if cur.fetchone() is None:
+            schedule_storage_deletes(cur, [uploaded.url, *variants.values()])
+    execute_query(cur, "DELETE FROM pending_uploads WHERE id = ?", (pending_id,))
+    conn.commit()
+    conn.close()
+    return attached
+
+
+def _record_failed_upload(pending_id: int, entry_id: int, attempts: int, error: str, final: bool) -> None:
+    """Count a failed attempt and schedule the retry, or mark the entry's photo as failed after the last one."""
+    conn = get_conn()
+    cur = get_cursor(conn)
+    if final:
+        execute_query(cur,
+            "UPDATE entries SET photo_status = 'failed' WHERE id = ? AND photo_status = 'pending'",
+            (entry_id,),
+        )
+        execute_query(cur, "DELETE FROM pending_uploads WHERE id = ?", (pending_id,))
+    else:
+        delay = PHOTO_UPLOAD_RETRY_BASE_DELAY * (2 ** (attempts - 1))
+        execute_query(cur,
+            "UPDATE pending_uploads SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+            (attempts, _utc_timestamp(datetime.utcnow() + timedelta(seconds=delay)), error, pending_id),
+        )
+    conn.commit()
+    conn.close()
+
+
+async def _upload_photo_job(pending_id: int) -> None:
+    """
+    Background job: upload one spooled photo and attach it to its entry.
+
+    A failed attempt (storage error or any unexpected exception) gets a
+    next_attempt_at with exponential backoff and is re-queued by the sweep
+    (not slept on, so other uploads keep flowing). After photo_upload_max_attempts the entry's photo_status
+    becomes "failed" and the spool file is dropped. If the entry got another
+    photo in the meantime, this one is discarded. Database work runs in a
+    worker thread.
+    """
+    pending = await asyncio.to_thread(_load_pending_upload, pending_id)
+    if pending is None:
+        return
+
+    entry_id = row_get(pending, "entry_id")
+    spooled = SpooledImage(
+        path=row_get(pending, "spool_path"),
+        size=row_get(pending, "size"),
+        ext=row_get(pending, "ext"),
+        sha256=row_get(pending, "sha256"),
+    )
+
+    uploaded = None
+    error = None
+    if not os.path.exists(spooled.path):
+        error = "spool file missing"
+    else:
+        try:
+            uploaded = await store_upload(spooled, folder="sightings", find_existing=find_image_blob)
+        except HTTPException as e:
+            error = str(e.detail)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+    if uploaded is not None:
+        try:
+            attached = await asyncio.to_thread(_attach_uploaded_photo, pending_id, entry_id, uploaded)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        else:
+            spooled.cleanup()
+            if attached:
+                photo_hash_index.set(entry_id, uploaded.dhash)
+            return
+
+    attempts = row_get(pending, "attempts") + 1
+    final = attempts >= settings.photo_upload_max_attempts or not os.path.exists(spooled.path)
+    await asyncio.to_thread(_record_failed_upload, pending_id, entry_id, attempts, error, final)
+    if final:
+        spooled.cleanup()
+        logger.warning(f"Photo upload for entry {entry_id} failed after {attempts} attempt(s): {error}")
+    else:
+        logger.info(f"Photo upload for entry {entry_id} failed ({error}), attempt {attempts} will be retried")
+
+
+# Global queue for background photo uploads. Jobs are pending_uploads ids, and
+# the rows (plus spool files) outlive the process: anything not uploaded yet
+# is resumed on startup, and retries are re-queued by the sweep.
+photo_upload_queue = WriteBehindQueue("photo_uploads", _upload_photo_job)
+
+
+# -----------------------------------------------------------------------------
+# Storage Maintenance (deferred deletes + orphaned-file reconciliation)
+# -----------------------------------------------------------------------------
+
+PENDING_DELETE_RETRY_BASE_DELAY = 60  # seconds, doubled after each failed attempt
+PENDING_DELETE_RETRY_MAX_DELAY = 6 * 3600
+RECONCILE_GRACE_PERIOD = timedelta(hours=1)  # Younger files may belong to an in-flight request
+
+# Result of the last reconciliation pass (reported by /health/storage)
+storage_reconcile_state: dict = {"last_reconciled_at": None, "orphaned_objects": None}
+_storage_maintenance_task: Optional[asyncio.Task] = None
+
+
+def _utc_timestamp(dt: datetime) -> str:
+    """Fixed-width UTC timestamp, so string comparison in SQL orders correctly."""
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def schedule_storage_deletes(cur, urls: List[str]) -> None:
+    """
+    Record storage files for deletion by the background drainer.
+
+    Runs in the caller's transaction, so the delete is only scheduled if the
+    change that orphaned the files is committed. Already scheduled URLs are
+    left as they are.
+    """
+    now = _utc_timestamp(datetime.utcnow())
+    for url in urls:
+        execute_query(cur,
+            """
+            INSERT INTO pending_deletes (url, attempts, next_attempt_at, createdAt)
+            VALUES (?, 0, ?, ?)
+            ON CONFLICT (url) DO NOTHING
+            """,
+            (url, now, now),
+        )
+
+
+def _referenced_urls(cur, urls: List[str], extra_columns: Tuple[Tuple[str, str], ...] = ()) -> set:
+    """
+    The subset of urls still used by an entry or a stored image blob.
+
+    Looked up in chunks through the (indexed) URL columns, so only the
+    given URLs are read, never the whole reference set.
+    """
+    referenced = set()
+    for start in range(0, len(urls), IN_CLAUSE_CHUNK_SIZE):
+        chunk = tuple(urls[start:start + IN_CLAUSE_CHUNK_SIZE])
+        in_clause = ", ".join("?" for _ in chunk)
+        for table, column in STORED_URL_COLUMNS + extra_columns:
+            execute_query(cur, f"SELECT {column} AS url FROM {table} WHERE {column} IN ({in_clause})", chunk)
+            referenced.update(row_get(r, "url") for r in cur.fetchall())
+    return referenced
+
+
+def _claim_due_deletes(batch_size: int, now: datetime) -> Tuple[list, set]:
+    """Due pending_deletes rows and the subset of their URLs that is referenced again."""
+    conn = get_conn()
+    cur = get_cursor(conn)
+    execute_query(cur,
+        """
+        SELECT id, url, attempts FROM pending_deletes
+        WHERE next_attempt_at <= ?
+        ORDER BY next_attempt_at, id
+        LIMIT ?
+        """,
+        (_utc_timestamp(now), batch_size),
+    )
+    rows = cur.fetchall()
+    still_referenced = _referenced_urls(cur, [row_get(r, "url") for r in rows])
+    conn.close()
+    return rows, still_referenced
+
+
+def _record_delete_results(rows: list, still_referenced: set, due: list, results: List[bool], now: datetime) -> int:
+    """Remove done/skipped pending_deletes and reschedule failures with backoff; returns the number deleted."""
+    conn = get_conn()
+    cur = get_cursor(conn)
+    deleted = 0
+    for row in rows:
+        url = row_get(row, "url")
+        if url in still_referenced:
+            execute_query(cur, "DELETE FROM pending_deletes WHERE id = ?", (row_get(row, "id"),))
+    for row, ok in zip(due, results):
+        if ok:
+            deleted += 1
+            execute_query(cur, "DELETE FROM pending_deletes WHERE id = ?", (row_get(row, "id"),))
+            continue
+        attempts = row_get(row, "attempts") + 1
+        delay = min(PENDING_DELETE_RETRY_BASE_DELAY * (2 ** (attempts - 1)), PENDING_DELETE_RETRY_MAX_DELAY)
+        execute_query(cur,
+            "UPDATE pending_deletes SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+            (attempts, _utc_timestamp(now + timedelta(seconds=delay)), "delete failed", row_get(row, "id")),
+        )
+    conn.commit()
+    conn.close()
+    return deleted
+
 
-    return ", ".join(parts) if parts else None
+async def drain_pending_deletes(batch_size: Optional[int] = None) -> int:
+    """
+    Delete one batch of due pending_deletes from storage (concurrently).
 
+    Successful deletes are removed from the table. Failures (including the
+    circuit breaker being open) are retried later with exponential backoff,
+    so nothing is silently dropped. URLs that got referenced again since they
+    were scheduled are skipped. Database work runs in a worker thread.
 
-@app.post("/entries", response_model=Entry)
-def create_entry(payload: EntryCreate):
-    text = payload.text.strip()
-    if not text:
-        raise HTTPException(status_code=400, detail="text must not be empty")
+    Returns:
+        Number of files deleted
+    """
+    batch_size = batch_size or settings.storage_delete_batch_size
+    now = datetime.utcnow()
 
-    created_at = datetime.utcnow().isoformat() + "Z"
+    rows, still_referenced = await asyncio.to_thread(_claim_due_deletes, batch_size, now)
+    if not rows:
+        return 0
 
-    nickname = payload.nickname.strip() if payload.nickname and payload.nickname.strip() else None
-    photo_url = payload.photo_url.strip() if payload.photo_url and payload.photo_url.strip() else None
+    due = [r for r in rows if row_get(r, "url") not in still_referenced]
+    results = await asyncio.gather(*(delete_stored_file(row_get(r, "url")) for r in due))
+    deleted = await asyncio.to_thread(_record_delete_results, rows, still_referenced, due, results, now)
 
-    # Structured address fields
-    location_street = payload.location_street.strip() if payload.location_street and payload.location_street.strip() else None
-    location_number = payload.location_number.strip() if payload.location_number and payload.location_number.strip() else None
-    location_zip = payload.location_zip.strip() if payload.location_zip and payload.location_zip.strip() else None
-    location_city = payload.location_city.strip() if payload.location_city and payload.location_city.strip() else None
-    location_country = payload.location_country.strip() if payload.location_country and payload.location_country.strip() else None
+    if len(due) > deleted:
+        logger.info(f"Storage deletes: {deleted} done, {len(due) - deleted} rescheduled")
+    return deleted
 
-    # Build combined location string from structured fields, or use legacy field
-    if any([location_street, location_number, location_zip, location_city, location_country]):
-        location = build_location_string(location_street, location_number, location_zip, location_city, location_country)
-    else:
-        location = payload.location.strip() if payload.location and payload.location.strip() else None
 
+def _find_orphaned_urls(urls: List[str]) -> List[str]:
+    """The urls nothing references (not even a pending delete); scheduled for deletion if enabled."""
     conn = get_conn()
     cur = get_cursor(conn)
+    referenced = _referenced_urls(cur, urls, extra_columns=(("pending_deletes", "url"),))
+    orphans = [url for url in urls if url not in referenced]
+    if orphans and settings.storage_reconcile_delete_orphans:
+        schedule_storage_deletes(cur, orphans)
+        conn.commit()
+    conn.close()
+    return orphans
 
-    ph = sql_placeholder()
-    if settings.is_postgres:
-        execute_query(cur,
-            f"""
-            INSERT INTO entries (text, createdAt, isFavorite, nickname, location, cat_id, photo_url,
-                                 location_street, location_number, location_zip, location_city, location_country)
-            VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
-            RETURNING id
-            """,
-            (text, created_at, 0, nickname, location, None, photo_url,
-             location_street, location_number, location_zip, location_city, location_country),
-        )
-        new_id = cur.fetchone()['id']
-    else:
-        execute_query(cur,
-            f"""
-            INSERT INTO entries (text, createdAt, isFavorite, nickname, location, cat_id, photo_url,
-                                 location_street, location_number, location_zip, location_city, location_country)
-            VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
-            """,
-            (text, created_at, 0, nickname, location, None, photo_url,
-             location_street, location_number, location_zip, location_city, location_country),
-        )
-        new_id = cur.lastrowid
 
-    conn.commit()
-    conn.close()
+async def reconcile_storage(folder: str = "sightings") -> List[str]:
+    """
+    List stored files that no entry or image blob references.
 
-    return Entry(
-        id=new_id,
-        text=text,
-        createdAt=created_at,
-        isFavorite=False,
-        nickname=nickname,
-        location=location,
-        cat_id=None,
-        photo_url=photo_url,
-        location_normalized=None,
-        location_lat=None,
-        location_lon=None,
-        location_osm_id=None,
-        location_street=location_street,
-        location_number=location_number,
-        location_zip=location_zip,
-        location_city=location_city,
-        location_country=location_country,
-    )
+    Files younger than RECONCILE_GRACE_PERIOD are ignored (their entry may
+    not be committed yet). Orphans are only scheduled for deletion when
+    settings.storage_reconcile_delete_orphans is enabled.
 
+    The listed files are checked against the database in chunks (see
+    _referenced_urls) in a worker thread, so the database's reference set
+    is never loaded as a whole.
+
+    Returns:
+        CDN URLs of the orphaned files
+    """
+    objects = await list_storage_objects(folder)
+    cutoff = datetime.utcnow() - RECONCILE_GRACE_PERIOD
+    candidates = [obj.url for obj in objects if obj.last_changed is not None and obj.last_changed < cutoff]
+    orphans = await asyncio.to_thread(_find_orphaned_urls, candidates)
+
+    storage_reconcile_state["last_reconciled_at"] = datetime.utcnow().isoformat() + "Z"
+    storage_reconcile_state["orphaned_objects"] = len(orphans)
+    if orphans:
+        action = "scheduled for deletion" if settings.storage_reconcile_delete_orphans else "found (not deleted)"
+        logger.warning(f"Storage reconciliation: {len(orphans)} orphaned file(s) in {folder}/ {action}")
+    return orphans
+
+
+async def _storage_maintenance_loop() -> None:
+    """Drain pending deletes every few seconds; expire unattached images hourly; reconcile every few hours."""
+    last_reconcile = last_expire = time.monotonic()
+    while True:
+        try:
+            if time.monotonic() - last_expire >= IMAGE_BLOB_EXPIRE_INTERVAL_SECONDS:
+                last_expire = time.monotonic()
+                await asyncio.to_thread(expire_image_blobs)
+            while await drain_pending_deletes() >= settings.storage_delete_batch_size:
+                pass  # Full batch: more may be due
+            reconcile_every = settings.storage_reconcile_interval_hours * 3600
+            if reconcile_every and time.monotonic() - last_reconcile >= reconcile_every:
+                last_reconcile = time.monotonic()
+                await reconcile_storage()
+        except Exception as e:
+            logger.warning(f"Storage maintenance pass failed: {e}")
+        await asyncio.sleep(settings.storage_delete_interval_seconds)
+
+
+def start_storage_maintenance() -> None:
+    """Start the storage maintenance task on the running event loop (idempotent)."""
+    global _storage_maintenance_task
+    if _storage_maintenance_task is None or _storage_maintenance_task.done():
+        _storage_maintenance_task = asyncio.get_running_loop().create_task(_storage_maintenance_loop())
+
+
+async def stop_storage_maintenance() -> None:
+    global _storage_maintenance_task
+    task, _storage_maintenance_task = _storage_maintenance_task, None
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+MEDIA_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@app.get("/media/{storage_path:path}")
+def serve_media(storage_path: str, request: Request):
+    """
+    Serve a stored image (local storage backend only).
+
+    File names are content hashes, so a URL's bytes never change: responses
+    are cacheable for a year, the ETag is the hash, and If-None-Match gets a
+    304. Range requests are supported. The body is sent by the server from
+    the file (zero-copy pathsend where the server supports it), never read
+    into Python as a whole.
+    """
+    storage = get_storage()
+    file_path = storage.resolve(storage_path) if isinstance(storage, LocalStorage) else None
+    if file_path is None or not os.path.isfile(file_path):
+        raise HTTPException(status_code=404, detail="Not found")
+
+    etag = f'"{Path(file_path).stem}"'
+    headers = {"ETag": etag, "Cache-Control": MEDIA_CACHE_CONTROL}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+
+    return FileResponse(file_path, headers=headers)
 
-# -----------------------------------------------------------------------------
-# Image Upload Endpoints (Bunny.net CDN Storage)
-# -----------------------------------------------------------------------------
 
 @app.post("/upload/image")
-async def upload_image_endpoint(file: UploadFile = File(...)):
+async def upload_image_endpoint(response: Response, file: UploadFile = File(...)):
     """
     Upload an image and return its CDN URL.
 
     This is a standalone endpoint that can be called independently
     or as part of creating/updating a sighting.
 
+    Identical content is stored once: re-uploading a known image returns the
+    existing URLs without uploading again. The returned URL counts as one
+    reference once an entry is created with it (POST /entries photo_url);
+    unattached uploads are deleted after IMAGE_BLOB_LEASE.
+
+    Per-stage durations (spool, header, verify, store) are reported in the
+    Server-Timing response header.
+
     Returns:
-        {"url": "https://catatlas.b-cdn.net/sightings/..."}
+        {"url": "https://catatlas.b-cdn.net/sightings/...",
+         "variants": {"thumb": "...", "medium": "...", "webp": "..."}}
     """
-    url = await upload_to_bunny(file, folder="sightings")
-    return {"url": url}
+    uploaded = await upload_image(file, folder="sightings", find_existing=find_image_blob)
+    set_server_timing(response, uploaded.timings)
+
+    # No reference yet: one is counted when an entry is created with the URL
+    conn = get_conn()
+    cur = get_cursor(conn)
+    acquire_image_blob(cur, uploaded, references=0)
+    conn.commit()
+    conn.close()
+
+    return {"url": uploaded.url, "variants": uploaded.variants}
 
 
 @app.post("/entries/with-image", response_model=Entry)
 async def create_entry_with_image(
+    response: Response,
     text: str = Form(..., min_length=1, max_length=5000),
     nickname: Optional[str] = Form(None, max_length=100),
     location: Optional[str] = Form(None, max_length=200),
@@ -2448,15 +5409,37 @@ async def create_entry_with_image(
     - location: max 200 characters (optional, legacy field)
     - location_street/number/zip/city/country: structured address fields (optional)
     - image: max 10MB, types: jpeg/png/webp/gif (optional)
+
+    With ASYNC_IMAGE_UPLOADS enabled, the image is validated and spooled to
+    local disk, the entry is returned with photo_status "pending" and the
+    upload happens in the background (photo_url is filled in when done).
     """
     # Upload image if provided
     photo_url = None
-    if image:
-        photo_url = await upload_to_bunny(image, folder="sightings")
+    photo_gps = None
+    photo_status = None
+    variants = {}
+    uploaded = None
+    spooled = None
+    if image and settings.async_image_uploads and photo_upload_queue.running:
+        try:
+            validate_storage_config()
+        except RuntimeError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        spooled = await spool_upload(image, spool_dir=settings.upload_spool_dir)
+        photo_gps, photo_status = spooled.info.gps, "pending"
+        set_server_timing(response, spooled.timings)
+    elif image:
+        uploaded = await upload_image(image, folder="sightings", find_existing=find_image_blob)
+        photo_url, photo_gps, variants = uploaded.url, uploaded.info.gps, uploaded.variants
+        photo_status = "ready"
+        set_server_timing(response, uploaded.timings)
 
     # Validate text
     text_clean = text.strip()
     if not text_clean:
+        if spooled is not None:
+            spooled.cleanup()
         raise HTTPException(status_code=400, detail="text must not be empty")
 
     created_at = datetime.utcnow().isoformat() + "Z"
@@ -2479,34 +5462,34 @@ async def create_entry_with_image(
     conn = get_conn()
     cur = get_cursor(conn)
 
-    ph = sql_placeholder()
-    if settings.is_postgres:
-        execute_query(cur,
-            f"""
-            INSERT INTO entries (text, createdAt, isFavorite, nickname, location, cat_id, photo_url,
-                                 location_street, location_number, location_zip, location_city, location_country)
-            VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
-            RETURNING id
-            """,
-            (text_clean, created_at, 0, nickname_clean, location_clean, None, photo_url,
-             street_clean, number_clean, zip_clean, city_clean, country_clean),
-        )
-        new_id = cur.fetchone()['id']
-    else:
-        execute_query(cur,
-            f"""
-            INSERT INTO entries (text, createdAt, isFavorite, nickname, location, cat_id, photo_url,
-                                 location_street, location_number, location_zip, location_city, location_country)
-            VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
-            """,
-            (text_clean, created_at, 0, nickname_clean, location_clean, None, photo_url,
-             street_clean, number_clean, zip_clean, city_clean, country_clean),
-        )
-        new_id = cur.lastrowid
+    new_id = insert_returning_id(cur, "insert_entry_with_photo", (
+        text_clean, created_at, 0, nickname_clean, location_clean, None, photo_url,
+        variants.get("thumb"), variants.get("medium"), variants.get("webp"), photo_status,
+        street_clean, number_clean, zip_clean, city_clean, country_clean,
+    ))
+    index_entry_keywords(cur, [(new_id, text_clean, location_clean)])
+
+    if uploaded is not None:
+        acquire_image_blob(cur, uploaded)
+        store_photo_hash(cur, new_id, uploaded.dhash)
+    pending_upload_id = queue_pending_upload(cur, new_id, spooled) if spooled is not None else None
+
+    # Phone photos often carry a GPS fix: use it directly instead of geocoding
+    photo_location = store_photo_gps(cur, new_id, photo_gps) if photo_gps else None
 
     conn.commit()
     conn.close()
 
+    if uploaded is not None:
+        photo_hash_index.set(new_id, uploaded.dhash)
+    if pending_upload_id is not None and not photo_upload_queue.submit(pending_upload_id):
+        defer_pending_upload(pending_upload_id)  # Queue full: the sweep picks it up
+
+    schedule_analysis(new_id)
+    if photo_location is None:
+        schedule_geocoding(new_id, location_clean)
+        photo_location = {}
+
     return Entry(
         id=new_id,
         text=text_clean,
@@ -2516,9 +5499,13 @@ async def create_entry_with_image(
         location=location_clean,
         cat_id=None,
         photo_url=photo_url,
-        location_normalized=None,
-        location_lat=None,
-        location_lon=None,
+        photo_thumb_url=variants.get("thumb"),
+        photo_medium_url=variants.get("medium"),
+        photo_webp_url=variants.get("webp"),
+        photo_status=photo_status,
+        location_normalized=photo_location.get("location_normalized"),
+        location_lat=photo_location.get("location_lat"),
+        location_lon=photo_location.get("location_lon"),
         location_osm_id=None,
         location_street=street_clean,
         location_number=number_clean,
@@ -2529,22 +5516,20 @@ async def create_entry_with_image(
 
 
 @app.patch("/entries/{entry_id}/image", response_model=Entry)
-async def update_entry_image(entry_id: int, image: UploadFile = File(...)):
+async def update_entry_image(entry_id: int, response: Response, image: UploadFile = File(...)):
     """
     Add or replace an image for an existing sighting.
 
-    If the entry already has an image, the old one will be deleted from Bunny.net.
+    If the entry already has an image, the old one (and its resized variants)
+    is scheduled for deletion from Bunny.net, unless other entries still use it.
     """
     conn = get_conn()
     cur = get_cursor(conn)
 
-    # Get existing entry
-    ph = sql_placeholder()
+    # Current photo (released below) and cat
     execute_query(cur,
-        f"""SELECT id, text, createdAt, isFavorite, nickname, location, cat_id, photo_url,
-                   location_normalized, location_lat, location_lon, location_osm_id,
-                   location_street, location_number, location_zip, location_city, location_country
-            FROM entries WHERE id = {ph}""",
+        """SELECT cat_id, photo_url, photo_thumb_url, photo_medium_url, photo_webp_url
+           FROM entries WHERE id = ?""",
         (entry_id,)
     )
     row = cur.fetchone()
@@ -2552,41 +5537,50 @@ async def update_entry_image(entry_id: int, image: UploadFile = File(...)):
         conn.close()
         raise HTTPException(status_code=404, detail="Entry not found")
 
-    # Delete old image if exists
-    old_url = row_get(row, "photo_url")
-    if old_url:
-        await delete_from_bunny(old_url)  # Best effort, don't fail if deletion fails
-
-    # Upload new image
-    new_url = await upload_to_bunny(image, folder="sightings")
+    # Upload new image (known content is reused, not uploaded again)
+    uploaded = await upload_image(image, folder="sightings", find_existing=find_image_blob)
+    set_server_timing(response, uploaded.timings)
+    new_url = uploaded.url
+    variants = uploaded.variants
 
-    # Update entry
-    execute_query(cur,
-        f"UPDATE entries SET photo_url = {ph} WHERE id = {ph}",
-        (new_url, entry_id)
+    # Update entry (returns the response)
+    entry = update_entry_returning(cur, entry_id,
+        "photo_url = ?, photo_thumb_url = ?, photo_medium_url = ?, photo_webp_url = ?, photo_status = 'ready'",
+        (new_url, variants.get("thumb"), variants.get("medium"), variants.get("webp")),
     )
+    if entry is None:  # Deleted during the upload
+        conn.close()
+        raise HTTPException(status_code=404, detail="Entry not found")
+    acquire_image_blob(cur, uploaded)
+    store_photo_hash(cur, entry_id, uploaded.dhash)
+
+    # Release old image; storage is only cleaned up once no entry references it
+    stale_urls: List[str] = []
+    old_url = row_get(row, "photo_url")
+    if old_url:
+        stale_urls = release_image_blob(cur, old_url)
+        if stale_urls is None:
+            # Untracked upload: owned by this entry alone
+            stale_urls = [
+                row_get(row, column)
+                for column in ("photo_url", "photo_thumb_url", "photo_medium_url", "photo_webp_url")
+                if row_get(row, column)
+            ]
+
+    # Deleted from storage in the background (retried until it succeeds)
+    schedule_storage_deletes(cur, stale_urls)
+
+    # Fill in coordinates from the photo if the entry has none yet
+    photo_location = store_photo_gps(cur, entry_id, uploaded.info.gps) if uploaded.info.gps else None
+    if row_get(row, "cat_id") is not None:
+        rebuild_cat_stats(cur, row_get(row, "cat_id"))  # Photo count / primary photo
     conn.commit()
     conn.close()
+    photo_hash_index.set(entry_id, uploaded.dhash)
 
-    return Entry(
-        id=row_get(row, "id"),
-        text=row_get(row, "text"),
-        createdAt=row_get(row, "createdAt"),
-        isFavorite=bool(row_get(row, "isFavorite")),
-        nickname=row_get(row, "nickname"),
-        location=row_get(row, "location"),
-        cat_id=row_get(row, "cat_id"),
-        photo_url=new_url,
-        location_normalized=row_get(row, "location_normalized"),
-        location_lat=row_get(row, "location_lat"),
-        location_lon=row_get(row, "location_lon"),
-        location_osm_id=row_get(row, "location_osm_id"),
-        location_street=row_get(row, "location_street"),
-        location_number=row_get(row, "location_number"),
-        location_zip=row_get(row, "location_zip"),
-        location_city=row_get(row, "location_city"),
-        location_country=row_get(row, "location_country"),
-    )
+    if photo_location:
+        entry = entry.model_copy(update=photo_location)
+    return entry
 
 
 @app.post("/entries/{entry_id}/favorite", response_model=Entry)
@@ -2597,49 +5591,14 @@ def toggle_favorite(entry_id: int):
     conn = get_conn()
     cur = get_cursor(conn)
 
-    execute_query(cur,
-        """
-        SELECT id, text, createdAt, isFavorite, nickname, location, cat_id, photo_url,
-               location_normalized, location_lat, location_lon, location_osm_id,
-               location_street, location_number, location_zip, location_city, location_country
-        FROM entries
-        WHERE id = ?
-        """,
-        (entry_id,),
-    )
-    row = cur.fetchone()
-    if row is None:
+    entry = update_entry_returning(cur, entry_id, "isFavorite = CASE WHEN isFavorite = 1 THEN 0 ELSE 1 END")
+    if entry is None:
         conn.close()
         raise HTTPException(status_code=404, detail="Entry not found")
-
-    new_fav = 0 if row_get(row, "isFavorite") else 1
-
-    execute_query(cur,
-        "UPDATE entries SET isFavorite = ? WHERE id = ?",
-        (new_fav, entry_id),
-    )
     conn.commit()
     conn.close()
 
-    return Entry(
-        id=row["id"],
-        text=row["text"],
-        createdAt=row_get(row, "createdAt"),
-        isFavorite=bool(new_fav),
-        nickname=row["nickname"],
-        location=row["location"],
-        cat_id=row["cat_id"],
-        photo_url=row["photo_url"],
-        location_normalized=row["location_normalized"],
-        location_lat=row["location_lat"],
-        location_lon=row["location_lon"],
-        location_osm_id=row["location_osm_id"],
-        location_street=row["location_street"],
-        location_number=row["location_number"],
-        location_zip=row["location_zip"],
-        location_city=row["location_city"],
-        location_country=row["location_country"],
-    )
+    return entry
 
 
 @app.post("/entries/{entry_id}/normalize-location", response_model=LocationNormalizationResult)
@@ -2705,23 +5664,7 @@ async def normalize_entry_location(entry_id: int, force: bool = Query(False, des
     # Check if we got coordinates
     if geo_result.get("lat") and geo_result.get("lon"):
         # Update the entry with normalized data
-        execute_query(cur,
-            """
-            UPDATE entries
-            SET location_normalized = ?,
-                location_lat = ?,
-                location_lon = ?,
-                location_osm_id = ?
-            WHERE id = ?
-            """,
-            (
-                geo_result["display_name"],
-                float(geo_result["lat"]),
-                float(geo_result["lon"]),
-                geo_result.get("osm_id"),
-                entry_id,
-            ),
-        )
+        store_geocode_result(cur, entry_id, geo_result)
         conn.commit()
         conn.close()
 
@@ -2764,15 +5707,186 @@ def geocoding_health():
     )
 
 
-@app.get("/cats", response_model=List[Cat])
-def list_cats():
+@app.get("/health/queues", response_model=List[BackgroundQueueStats])
+def background_queue_health():
+    """
+    Metrics for the write-behind background queues.
+
+    `dropped` > 0 means jobs were rejected because the queue was full.
+    """
+    queues = (geocoding_queue, photo_upload_queue, analysis_queue)
+    return [BackgroundQueueStats(**queue.stats()) for queue in queues]
+
+
+@app.get("/health/profile-cache", response_model=ProfileCacheStats)
+def profile_cache_health():
+    """Hit rates and size of the cat profile response cache."""
+    return ProfileCacheStats(**profile_cache.stats())
+
+
+@app.get("/health/storage", response_model=StorageMaintenanceStats)
+def storage_maintenance_health():
+    """
+    Deferred storage deletes and orphaned-file reconciliation status.
+
+    A growing `retrying_deletes` count means Bunny.net deletes keep failing.
+    """
+    conn = get_conn()
+    cur = get_cursor(conn)
+    execute_query(cur,
+        """
+        SELECT COUNT(*) AS total,
+               SUM(CASE WHEN attempts > 0 THEN 1 ELSE 0 END) AS retrying,
+               MIN(createdAt) AS oldest
+        FROM pending_deletes
+        """
+    )
+    row = cur.fetchone()
+    conn.close()
+
+    return StorageMaintenanceStats(
+        running=_storage_maintenance_task is not None and not _storage_maintenance_task.done(),
+        pending_deletes=row_get(row, "total") or 0,
+        retrying_deletes=row_get(row, "retrying") or 0,
+        oldest_pending_delete=row_get(row, "oldest"),
+        last_reconciled_at=storage_reconcile_state["last_reconciled_at"],
+        orphaned_objects=storage_reconcile_state["orphaned_objects"],
+    )
+
+
+# sort -> (sort key expression, id column, direction). A cat whose cat_stats
+# row isn't backfilled yet (see backfill_cat_stats) sorts as never seen.
+CAT_LIST_SORTS = {
+    "newest": (None, "c.id", "DESC"),
+    "last_seen": ("COALESCE(s.last_seen, '')", "c.id", "DESC"),
+    "sightings": ("COALESCE(s.total_sightings, 0)", "c.id", "DESC"),
+    "name": ("LOWER(COALESCE(c.name, ''))", "c.id", "ASC"),
+}
+
+
+@app.get("/cats", response_model=List[Cat], response_model_exclude_unset=True)
+def list_cats(
+    response: Response,
+    sort: Literal["newest", "last_seen", "sightings", "name"] = Query("newest"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (all cats if omitted)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_stats: bool = Query(False, description="Add sightingsCount, lastSeen and primaryPhoto"),
+):
+    """
+    List cats, optionally paginated and with sighting aggregates.
+
+    Keyset pagination: when more cats follow, the X-Next-Cursor response
+    header holds the cursor for the next page. Aggregates come from the
+    maintained cat_stats table in the same query, so a page costs one
+    query however many sightings there are. Cats whose cat_stats row isn't
+    backfilled yet are listed with zero sightings.
+    """
+    key_expr, id_col, direction = CAT_LIST_SORTS[sort]
+    select_key = f", {key_expr} AS sort_key" if key_expr else ""
+    comparison = "<" if direction == "DESC" else ">"
+
+    where = ""
+    params: tuple = ()
+    if cursor:
+        if key_expr:
+            where = f"WHERE ({key_expr}, {id_col}) {comparison} (?, ?)"
+            params = tuple(decode_cursor(cursor, 2))
+        else:
+            where = f"WHERE {id_col} {comparison} ?"
+            params = tuple(decode_cursor(cursor, 1))
+
+    order_by = f"{key_expr} {direction}, {id_col} {direction}" if key_expr else f"{id_col} {direction}"
+    limit_clause = ""
+    if limit is not None:
+        limit_clause = "LIMIT ?"
+        params += (limit + 1,)  # One extra row tells whether there's a next page
+
+    # Selected only when requested: unselected fields stay unset (and out of the response)
+    stats_columns = (", COALESCE(s.total_sightings, 0) AS sightingsCount, s.last_seen AS lastSeen,"
+                     " s.primary_photo AS primaryPhoto" if include_stats else "")
+
     conn = get_conn()
     cur = get_cursor(conn)
-    execute_query(cur, "SELECT id, name, createdAt FROM cats ORDER BY id DESC")
+    execute_query(cur,
+        f"""
+        SELECT c.id, c.name, c.createdAt{stats_columns}{select_key}
+        FROM cats c
+        LEFT JOIN cat_stats s ON s.cat_id = c.id
+        {where}
+        ORDER BY {order_by}
+        {limit_clause}
+        """,
+        params,
+    )
     rows = cur.fetchall()
+    cats = cat_mapper.map(cur, rows)
+    conn.close()
+
+    if limit is not None and len(rows) > limit:
+        cats = cats[:limit]
+        last = rows[limit - 1]
+        key_values = [row_get(last, "sort_key")] if key_expr else []
+        response.headers["X-Next-Cursor"] = encode_cursor(key_values + [row_get(last, "id")])
+    return cats
+
+
+@app.get("/entries/analyses", response_model=List[EntryAnalysis])
+def list_entry_analyses(
+    ids: Optional[List[int]] = Query(None, description="Only these entries (repeat: ?ids=1&ids=2)"),
+    since: Optional[str] = Query(None, description="Only analyses updated at/after this ISO timestamp"),
+):
+    """
+    Return stored analyses for many entries at once (dashboard tag counts).
+
+    Replaces one /entries/{id}/analysis call per sighting: a single
+    connection and one query (per 500 ids). Without filters, every stored
+    analysis is returned. Entries without analysis are simply absent.
+    """
+    conn = get_conn()
+    cur = get_cursor(conn)
+
+    base_sql = "SELECT entry_id, summary, tags_json, sentiment, updatedAt FROM analyses"
+    since_clause = " AND updatedAt >= ?" if since else ""
+    since_params = (since,) if since else ()
+
+    rows = []
+    if ids is None:
+        execute_query(cur,
+            f"{base_sql} WHERE 1=1{since_clause} ORDER BY entry_id",
+            since_params,
+        )
+        rows = cur.fetchall()
+    else:
+        unique_ids = sorted(set(ids))
+        for i in range(0, len(unique_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = unique_ids[i:i + IN_CLAUSE_CHUNK_SIZE]
+            execute_query(cur,
+                f"{base_sql} WHERE entry_id IN ({', '.join('?' for _ in chunk)}){since_clause} ORDER BY entry_id",
+                tuple(chunk) + since_params,
+            )
+            rows.extend(cur.fetchall())
+    conn.close()
+
+    return [analysis_from_row(r) for r in rows]
+
+
+@app.post("/entries/analyze", response_model=List[EntryAnalysis])
+def analyze_entries_batch(payload: AnalyzeBatchRequest):
+    """
+    Analyze many entries in one request (batch version of /entries/{id}/analyze).
+
+    Same caching rule per entry (unchanged text hash -> stored result), but
+    entries and stored analyses are loaded with one query and all fresh
+    results are written with one executemany in a single transaction.
+    Unknown entry ids are skipped.
+    """
+    conn = get_conn()
+    cur = get_cursor(conn)
+    results = analyze_entries(cur, payload.entry_ids)
+    conn.commit()
     conn.close()
 
-    return [Cat(id=r["id"], name=r["name"], createdAt=row_get(r, "createdAt")) for r in rows]
+    return results
 
 
 @app.get("/entries/{entry_id}/analysis", response_model=EntryAnalysis)
@@ -2798,13 +5912,7 @@ def get_entry_analysis(entry_id: int):
     if row is None:
         raise HTTPException(status_code=404, detail="No analysis found for this entry")
 
-    return EntryAnalysis(
-        entry_id=row["entry_id"],
-        summary=row["summary"],
-        tags=tags_from_json(row["tags_json"]),
-        sentiment=row["sentiment"],
-        updatedAt=row_get(row, "updatedAt"),
-    )
+    return analysis_from_row(row)
 
 
 @app.post("/entries/{entry_id}/assign/{cat_id}", response_model=Entry)
@@ -2812,59 +5920,28 @@ def assign_entry_to_cat(entry_id: int, cat_id: int):
     conn = get_conn()
     cur = get_cursor(conn)
 
-    # Ensure cat exists
-    execute_query(cur, "SELECT id FROM cats WHERE id = ?", (cat_id,))
-    if cur.fetchone() is None:
-        conn.close()
-        raise HTTPException(status_code=404, detail="Cat not found")
-
-    # Ensure entry exists
+    # Ensure cat and entry exist, and get the entry's current cat (for the statistics)
     execute_query(cur,
-        """SELECT id, text, createdAt, isFavorite, nickname, location, cat_id, photo_url,
-                  location_normalized, location_lat, location_lon, location_osm_id,
-                  location_street, location_number, location_zip, location_city, location_country
-           FROM entries WHERE id = ?""",
-        (entry_id,),
+        """SELECT c.id AS found_cat, e.id AS found_entry, e.cat_id
+           FROM (SELECT 1 AS one) probe
+           LEFT JOIN cats c ON c.id = ?
+           LEFT JOIN entries e ON e.id = ?""",
+        (cat_id, entry_id),
     )
-    row = cur.fetchone()
-    if row is None:
+    found = cur.fetchone()
+    if row_get(found, "found_cat") is None:
+        conn.close()
+        raise HTTPException(status_code=404, detail="Cat not found")
+    if row_get(found, "found_entry") is None:
         conn.close()
         raise HTTPException(status_code=404, detail="Entry not found")
 
-    # Assign
-    execute_query(cur, "UPDATE entries SET cat_id = ? WHERE id = ?", (cat_id, entry_id))
+    # Assign (keeps both cats' statistics current); returns the updated entry
+    entry = link_sighting_to_cat(cur, entry_id, cat_id, previous_cat_id=row_get(found, "cat_id"))
     conn.commit()
-
-    # Return updated entry
-    execute_query(cur,
-        """SELECT id, text, createdAt, isFavorite, nickname, location, cat_id, photo_url,
-                  location_normalized, location_lat, location_lon, location_osm_id,
-                  location_street, location_number, location_zip, location_city, location_country
-           FROM entries WHERE id = ?""",
-        (entry_id,),
-    )
-    updated = cur.fetchone()
     conn.close()
 
-    return Entry(
-        id=updated["id"],
-        text=updated["text"],
-        createdAt=row_get(updated, "createdAt"),
-        isFavorite=bool(row_get(updated, "isFavorite")),
-        nickname=updated["nickname"],
-        location=updated["location"],
-        cat_id=updated["cat_id"],
-        photo_url=updated["photo_url"],
-        location_normalized=updated["location_normalized"],
-        location_lat=updated["location_lat"],
-        location_lon=updated["location_lon"],
-        location_osm_id=updated["location_osm_id"],
-        location_street=updated["location_street"],
-        location_number=updated["location_number"],
-        location_zip=updated["location_zip"],
-        location_city=updated["location_city"],
-        location_country=updated["location_country"],
-    )
+    return entry
 
 
 # -----------------------------------------------------------------------------
@@ -2888,33 +5965,13 @@ def link_sightings_to_cat(cat_id: int, payload: LinkSightingsRequest):
     cur = get_cursor(conn)
 
     # Ensure cat exists
-    execute_query(cur, "SELECT id FROM cats WHERE id = ?", (cat_id,))
+    run_query(cur, "cat_exists", (cat_id,))
     if cur.fetchone() is None:
         conn.close()
         raise HTTPException(status_code=404, detail="Cat not found")
 
-    already_linked: List[int] = []
-    newly_linked: List[int] = []
-    failed: List[int] = []
-
-    for entry_id in payload.entry_ids:
-        # Check if entry exists
-        execute_query(cur, "SELECT id, cat_id FROM entries WHERE id = ?", (entry_id,))
-        entry = cur.fetchone()
-
-        if entry is None:
-            failed.append(entry_id)
-            continue
-
-        current_cat_id = entry["cat_id"]
-
-        if current_cat_id == cat_id:
-            # Already linked to this cat
-            already_linked.append(entry_id)
-        else:
-            # Link to the cat (even if previously linked to another cat)
-            execute_query(cur, "UPDATE entries SET cat_id = ? WHERE id = ?", (cat_id, entry_id))
-            newly_linked.append(entry_id)
+    # Entries linked to another cat are moved to this one
+    newly_linked, already_linked, failed = link_sightings_to_cat_bulk(cur, payload.entry_ids, cat_id)
 
     conn.commit()
     conn.close()
@@ -2951,26 +6008,11 @@ def create_cat_from_sightings(payload: CreateCatFromSightingsRequest):
     cur = get_cursor(conn)
 
     # Create the new cat
-    ph = sql_placeholder()
-    if settings.is_postgres:
-        execute_query(cur,
-            f"INSERT INTO cats (name, createdAt) VALUES ({ph}, {ph}) RETURNING id",
-            (name, created_at),
-        )
-        new_cat_id = cur.fetchone()['id']
-    else:
-        execute_query(cur,
-            f"INSERT INTO cats (name, createdAt) VALUES ({ph}, {ph})",
-            (name, created_at),
-        )
-        new_cat_id = cur.lastrowid
+    new_cat_id = insert_returning_id(cur, "insert_cat", (name, created_at))
+    init_cat_stats(cur, new_cat_id)
 
     # Link all specified entries to the new cat
-    for entry_id in payload.entry_ids:
-        # Check if entry exists before updating
-        execute_query(cur, "SELECT id FROM entries WHERE id = ?", (entry_id,))
-        if cur.fetchone() is not None:
-            execute_query(cur, "UPDATE entries SET cat_id = ? WHERE id = ?", (new_cat_id, entry_id))
+    link_sightings_to_cat_bulk(cur, payload.entry_ids, new_cat_id)
 
     conn.commit()
     conn.close()
@@ -3274,33 +6316,14 @@ def analyze_and_store(entry_id: int):
     # If analysis exists and text has not changed -> return cached analysis
     if existing is not None and existing["text_hash"] == current_hash:
         conn.close()
-        return EntryAnalysis(
-            entry_id=existing["entry_id"],
-            summary=existing["summary"],
-            tags=tags_from_json(existing["tags_json"]),
-            sentiment=existing["sentiment"],
-            updatedAt=row_get(existing, "updatedAt"),
-        )
+        return analysis_from_row(existing)
 
     # 3) Compute fresh analysis (baseline "AI")
-    summary = baseline_summary(text)
-    tags = baseline_tags(text)
-    sentiment = baseline_sentiment(text)
+    summary, tags, sentiment = compute_analysis(text)
     now = datetime.utcnow().isoformat() + "Z"
 
     # 4) Upsert analysis
-    # ON CONFLICT(entry_id) means: if entry_id already exists, update that row.
-    execute_query(cur, 
-        """
-        INSERT INTO analyses (entry_id, text_hash, summary, tags_json, sentiment, createdAt, updatedAt)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(entry_id) DO UPDATE SET
-            text_hash=excluded.text_hash,
-            summary=excluded.summary,
-            tags_json=excluded.tags_json,
-            sentiment=excluded.sentiment,
-            updatedAt=excluded.updatedAt
-        """,
+    execute_query(cur, ANALYSIS_UPSERT_SQL,
         (entry_id, current_hash, summary, tags_to_json(tags), sentiment, now, now),
     )
     conn.commit()
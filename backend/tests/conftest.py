@@ -1,11 +1,19 @@
 """
-Pytest configuration for config tests.
+Pytest configuration shared by the backend tests.
 
 This file sets up test fixtures and prevents .env file loading during tests.
 """
 
+import sys
+from pathlib import Path
+
+# Ensure backend/ is importable
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
 import pytest
 import os
+from fastapi.testclient import TestClient
 
 
 @pytest.fixture(autouse=True)
@@ -42,3 +50,29 @@ def isolate_environment(monkeypatch, tmp_path):
 
     # Set DEBUG=True for tests to avoid production validation
     monkeypatch.setenv("DEBUG", "True")
+
+
+@pytest.fixture(autouse=True)
+def reset_in_memory_indexes():
+    """Drop the app's process-wide photo index and profile cache: each test has its own database."""
+    main = sys.modules.get("main")
+    if main is not None:
+        main.photo_hash_index.clear()
+        main.profile_cache.clear()
+
+
+@pytest.fixture()
+def main(tmp_path: Path, monkeypatch):
+    """Import the app module pointed at a fresh SQLite DB."""
+    db_path = tmp_path / "test.db"
+    monkeypatch.setenv("CATATLAS_DB_PATH", str(db_path))
+
+    import main
+    monkeypatch.setattr(main, "DB_PATH", db_path)
+    main.init_db()
+    return main
+
+
+@pytest.fixture()
+def client(main):
+    return TestClient(main.app)
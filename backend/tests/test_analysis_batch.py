@@ -0,0 +1,145 @@
+"""
+Tests for the batched analysis endpoints.
+
+- GET /entries/analyses returns many stored analyses in one call (ids / since filters)
+- POST /entries/analyze analyzes many entries, reusing cached results
+- stale analyses (text changed) are recomputed in the batch
+- new entries are analyzed in the background, coalesced into one batch
+- the background batch runs in a worker thread, not on the event loop
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# Ensure backend/ is importable
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def make_entries(main, texts):
+    return [main.create_entry(main.EntryCreate(text=t)).id for t in texts]
+
+
+def test_batch_analyze_then_list(main, client: TestClient):
+    ids = make_entries(main, ["Friendly orange cat", "Shy black cat hiding", "Grey cat sleeping"])
+
+    r = client.post("/entries/analyze", json={"entry_ids": ids + [99999]})
+    assert r.status_code == 200
+    analyzed = r.json()
+    assert [a["entry_id"] for a in analyzed] == ids  # Unknown id skipped
+    assert "orange" in analyzed[0]["tags"]
+
+    # Same results as the single-entry endpoint
+    single = client.get(f"/entries/{ids[1]}/analysis").json()
+    assert single == analyzed[1]
+
+    r = client.get("/entries/analyses", params={"ids": [ids[0], ids[2]]})
+    assert r.status_code == 200
+    assert [a["entry_id"] for a in r.json()] == [ids[0], ids[2]]
+
+    assert [a["entry_id"] for a in client.get("/entries/analyses").json()] == ids
+
+
+def test_list_analyses_since(main, client: TestClient):
+    ids = make_entries(main, ["Tabby in the garden", "Calico on the fence"])
+    client.post("/entries/analyze", json={"entry_ids": ids})
+
+    assert len(client.get("/entries/analyses", params={"since": "2000-01-01T00:00:00Z"}).json()) == 2
+    assert client.get("/entries/analyses", params={"since": "2999-01-01T00:00:00Z"}).json() == []
+
+
+def test_batch_analyze_reuses_cache_and_refreshes_stale(main, client: TestClient):
+    ids = make_entries(main, ["Fluffy white cat", "Small brown kitten"])
+    first = {a["entry_id"]: a for a in client.post("/entries/analyze", json={"entry_ids": ids}).json()}
+
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, "UPDATE entries SET text = 'Huge striped tomcat' WHERE id = ?", (ids[1],))
+    conn.commit()
+    conn.close()
+
+    second = {a["entry_id"]: a for a in client.post("/entries/analyze", json={"entry_ids": ids}).json()}
+    assert second[ids[0]] == first[ids[0]]  # Cached
+    assert "striped" in second[ids[1]]["tags"]  # Recomputed
+    assert "striped" in client.get(f"/entries/{ids[1]}/analysis").json()["tags"]
+
+
+def test_batch_analyze_validates_payload(client: TestClient):
+    assert client.post("/entries/analyze", json={"entry_ids": []}).status_code == 422
+    assert client.post("/entries/analyze", json={"entry_ids": list(range(501))}).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_queue_coalesces_jobs_into_batches(main):
+    batches = []
+
+    async def handler(jobs):
+        batches.append(jobs)
+
+    queue = main.WriteBehindQueue("test", handler, max_size=10, batch_size=3, batch_delay=0.01)
+    queue.start()
+    try:
+        for job in range(5):
+            assert queue.submit(job)
+        await queue.join()
+    finally:
+        await queue.stop()
+
+    assert batches == [[0, 1, 2], [3, 4]]
+    assert queue.stats()["processed"] == 5
+    assert queue.stats()["depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_new_entries_are_analyzed_in_one_background_batch(main):
+    assert main.settings.precompute_analyses is True
+    client = TestClient(main.app)
+
+    main.analysis_queue.start()
+    try:
+        with patch("main.execute_many", wraps=main.execute_many) as execute_many:
+            ids = make_entries(main, ["Orange cat on a wall", "Black cat in the rain", "Tiny grey kitten"])
+            # Not analyzed yet when the request returns
+            assert client.get(f"/entries/{ids[0]}/analysis").status_code == 404
+
+            await main.analysis_queue.join()
+
+        upserts = [c for c in execute_many.call_args_list if "INSERT INTO analyses" in c.args[1]]
+        assert len(upserts) == 1  # One batched upsert for all three
+        assert len(upserts[0].args[2]) == 3
+    finally:
+        await main.analysis_queue.stop()
+
+    for entry_id in ids:
+        assert client.get(f"/entries/{entry_id}/analysis").status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_background_analysis_runs_off_the_event_loop(main):
+    ids = make_entries(main, ["Orange cat on a wall"])
+    threads = []
+    analyze = main.analyze_entries
+
+    def record_thread(cur, entry_ids):
+        threads.append(threading.current_thread())
+        return analyze(cur, entry_ids)
+
+    with patch("main.analyze_entries", side_effect=record_thread):
+        await main._precompute_analyses_job(ids)
+
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_precompute_can_be_disabled(main, monkeypatch):
+    monkeypatch.setattr(main.settings, "precompute_analyses", False)
+    before = main.analysis_queue.stats()["submitted"]
+
+    make_entries(main, ["Cat under a car"])
+
+    assert main.analysis_queue.stats()["submitted"] == before
@@ -86,6 +86,38 @@ def test_create_entry_with_photo_and_assign_to_cat(client: TestClient):
     assert updated["cat_id"] == cat_id
 
 
+@pytest.mark.parametrize("returning", [True, False])
+def test_mutations_return_updated_entry(client: TestClient, monkeypatch, returning):
+    import main
+    from unittest.mock import patch
+
+    # False: the UPDATE + SELECT path for SQLite before 3.35
+    monkeypatch.setattr(main, "SUPPORTS_RETURNING", returning)
+    cat_id = client.post("/cats", json={"name": "Park Kitty"}).json()["id"]
+    entry = client.post("/entries", json={"text": "Grey cat", "location": "Harbour"}).json()
+
+    with patch("main.execute_query", wraps=main.execute_query) as execute_query, \
+            patch("main.run_query", wraps=main.run_query) as run_query:
+        r = client.post(f"/entries/{entry['id']}/favorite")
+    assert r.json() == {**entry, "isFavorite": True}
+    assert execute_query.call_count + run_query.call_count == (1 if returning else 2)
+    assert client.post(f"/entries/{entry['id']}/favorite").json()["isFavorite"] is False
+
+    r = client.post(f"/entries/{entry['id']}/assign/{cat_id}")
+    assert r.json() == {**entry, "cat_id": cat_id}
+    assert r.json() == client.get("/entries", params={"cat_id": cat_id}).json()[0]
+
+
+def test_mutations_on_missing_rows(client: TestClient):
+    cat_id = client.post("/cats", json={"name": "Park Kitty"}).json()["id"]
+    entry_id = client.post("/entries", json={"text": "Grey cat"}).json()["id"]
+
+    assert client.post("/entries/999/favorite").status_code == 404
+    assert client.post(f"/entries/{entry_id}/assign/999").json()["detail"] == "Cat not found"
+    assert client.post(f"/entries/999/assign/{cat_id}").json()["detail"] == "Entry not found"
+    assert client.post("/entries/999/assign/999").json()["detail"] == "Cat not found"
+
+
 def test_cat_profile_requires_assigned_sightings(client: TestClient):
     # Create cat
     cat = client.post("/cats", json={"name": "Shadow"}).json()
@@ -667,6 +699,43 @@ def test_get_cat_sightings_not_found(client: TestClient):
     assert r.status_code == 404
 
 
+def test_get_cat_sightings_cursor_pagination(client: TestClient):
+    """Test keyset pagination of cat sightings with nextCursor."""
+    cat = client.post("/cats", json={"name": "Cursor Cat"}).json()
+
+    entry_ids = []
+    for i in range(12):
+        entry = client.post("/entries", json={"text": f"Sighting {i+1}"}).json()
+        client.post(f"/entries/{entry['id']}/assign/{cat['id']}")
+        entry_ids.append(entry["id"])
+
+    seen = []
+    params = {"limit": 5, "include_total": False}
+    while True:
+        result = client.get(f"/cats/{cat['id']}/sightings", params=params).json()
+        assert result["total"] is None
+        seen.extend(s["id"] for s in result["sightings"])
+        if not result["hasMore"]:
+            assert result["nextCursor"] is None
+            break
+        params["cursor"] = result["nextCursor"]
+
+    # Newest first, nothing skipped or repeated (ids break createdAt ties)
+    assert seen == sorted(entry_ids, reverse=True)
+
+    # Page mode still works and agrees with the cursor order
+    page2 = client.get(f"/cats/{cat['id']}/sightings", params={"page": 2, "limit": 5}).json()
+    assert [s["id"] for s in page2["sightings"]] == seen[5:10]
+    assert page2["total"] == 12
+
+
+def test_get_cat_sightings_invalid_cursor(client: TestClient):
+    """Test that a malformed cursor is rejected."""
+    cat = client.post("/cats", json={"name": "Cursor Cat"}).json()
+    r = client.get(f"/cats/{cat['id']}/sightings", params={"cursor": "garbage"})
+    assert r.status_code == 400
+
+
 # =============================================================================
 # Cat Profile Page Tests: Cat Update
 # =============================================================================
@@ -809,6 +878,24 @@ def test_get_cat_comments_pagination(client: TestClient):
     assert result["hasMore"] is True
 
 
+def test_get_cat_comments_cursor_pagination(client: TestClient):
+    """Test keyset pagination of comments with nextCursor."""
+    cat = client.post("/cats", json={"name": "Chatty Cat"}).json()
+    for i in range(7):
+        client.post(f"/cats/{cat['id']}/comments", json={"author_name": "User", "content": f"Comment {i+1}"})
+
+    first = client.get(f"/cats/{cat['id']}/comments", params={"limit": 4}).json()
+    assert first["total"] == 7
+    assert first["hasMore"] is True
+
+    second = client.get(f"/cats/{cat['id']}/comments",
+                        params={"limit": 4, "cursor": first["nextCursor"], "include_total": False}).json()
+    assert second["total"] is None
+    assert second["hasMore"] is False
+    contents = [c["content"] for c in first["comments"] + second["comments"]]
+    assert contents == [f"Comment {i}" for i in range(7, 0, -1)]
+
+
 def test_get_cat_comments_empty(client: TestClient):
     """Test getting comments for cat with no comments."""
     cat = client.post("/cats", json={"name": "Quiet Cat"}).json()
@@ -912,3 +999,132 @@ def test_enhanced_cat_profile_not_found(client: TestClient):
     """Test enhanced profile for non-existent cat."""
     r = client.get("/cats/99999/profile/enhanced")
     assert r.status_code == 404
+
+
+def test_create_entry_with_image_uses_photo_gps(client: TestClient):
+    """EXIF GPS from the photo becomes the entry's coordinates, named after a nearby sighting."""
+    from unittest.mock import AsyncMock, patch
+    from image_upload import ImageInfo, UploadedImage
+
+    # An already geocoded sighting ~30m away provides the display name
+    neighbour = client.post("/entries", json={"text": "Black cat", "location": "Harbour Street 1"}).json()
+    geo = {"display_name": "Harbour Street 1, Kiel", "lat": "54.32001", "lon": "10.13001", "osm_id": "42", "fallback": None}
+    with patch("main.geocode_with_fallback", new=AsyncMock(return_value=geo)):
+        client.post(f"/entries/{neighbour['id']}/normalize-location")
+
+    uploaded = UploadedImage(
+        url="https://test.b-cdn.net/sightings/cat.jpg",
+        info=ImageInfo(width=100, height=100, format="JPEG", gps=(54.32025, 10.13010)),
+    )
+    with patch("main.upload_image", new=AsyncMock(return_value=uploaded)):
+        r = client.post(
+            "/entries/with-image",
+            data={"text": "Black cat on the pier"},
+            files={"image": ("cat.jpg", b"fake-image-bytes", "image/jpeg")},
+        )
+
+    assert r.status_code == 200
+    entry = r.json()
+    assert entry["photo_url"] == "https://test.b-cdn.net/sightings/cat.jpg"
+    assert entry["location_lat"] == pytest.approx(54.32025)
+    assert entry["location_lon"] == pytest.approx(10.13010)
+    assert entry["location_normalized"] == "Harbour Street 1, Kiel"
+
+    # Persisted, not just echoed
+    stored = next(e for e in client.get("/entries").json() if e["id"] == entry["id"])
+    assert stored["location_lat"] == pytest.approx(54.32025)
+
+
+def test_create_entry_with_image_stores_variant_urls(client: TestClient):
+    """Resized variant URLs are stored with the entry and returned by list endpoints."""
+    from unittest.mock import AsyncMock, patch
+    from image_upload import UploadedImage
+
+    uploaded = UploadedImage(
+        url="https://test.b-cdn.net/sightings/cat.jpg",
+        variants={
+            "thumb": "https://test.b-cdn.net/sightings/cat_thumb.jpg",
+            "medium": "https://test.b-cdn.net/sightings/cat_medium.jpg",
+            "webp": "https://test.b-cdn.net/sightings/cat_webp.webp",
+        },
+    )
+    with patch("main.upload_image", new=AsyncMock(return_value=uploaded)):
+        r = client.post(
+            "/entries/with-image",
+            data={"text": "Tabby in the garden"},
+            files={"image": ("cat.jpg", b"fake-image-bytes", "image/jpeg")},
+        )
+
+    assert r.status_code == 200
+    assert r.json()["photo_thumb_url"] == "https://test.b-cdn.net/sightings/cat_thumb.jpg"
+
+    stored = next(e for e in client.get("/entries").json() if e["id"] == r.json()["id"])
+    assert stored["photo_thumb_url"] == "https://test.b-cdn.net/sightings/cat_thumb.jpg"
+    assert stored["photo_medium_url"] == "https://test.b-cdn.net/sightings/cat_medium.jpg"
+    assert stored["photo_webp_url"] == "https://test.b-cdn.net/sightings/cat_webp.webp"
+
+
+def test_same_photo_is_stored_once_and_deleted_with_last_reference(client: TestClient, monkeypatch):
+    """Re-uploading identical bytes reuses the stored file; it's deleted only when unreferenced."""
+    import asyncio
+    import io
+    import httpx
+    from unittest.mock import patch
+    from PIL import Image
+    import image_upload
+    from main import drain_pending_deletes
+
+    for key, value in {
+        "bunny_storage_zone": "test-zone",
+        "bunny_api_key": "test-api-key",
+        "bunny_cdn_hostname": "test.b-cdn.net",
+        "image_variants_enabled": False,
+    }.items():
+        monkeypatch.setattr(image_upload.settings, key, value)
+    image_upload.bunny_circuit_breaker.call_succeeded()
+
+    def png(seed: bytes) -> bytes:
+        buf = io.BytesIO()
+        Image.frombytes("RGB", (8, 8), (seed * 192)[:192]).save(buf, format="PNG")
+        return buf.getvalue()
+
+    shared, other = png(os.urandom(16)), png(os.urandom(16))
+    requests_seen = []
+
+    async def handler(request):
+        await request.aread()
+        requests_seen.append((request.method, request.url.path.rsplit("/", 1)[-1]))
+        return httpx.Response(201 if request.method == "PUT" else 200)
+
+    storage = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with patch("image_upload.get_http_client", return_value=storage):
+        first = client.post(
+            "/entries/with-image",
+            data={"text": "Cat on the wall"},
+            files={"image": ("a.png", shared, "image/png")},
+        ).json()
+        second = client.post(
+            "/entries/with-image",
+            data={"text": "Same cat, same photo"},
+            files={"image": ("b.png", shared, "image/png")},
+        ).json()
+
+        assert first["photo_url"] == second["photo_url"]
+        assert [method for method, _ in requests_seen] == ["PUT"]  # Second upload skipped
+        shared_name = first["photo_url"].rsplit("/", 1)[-1]
+
+        # Replacing one entry's photo keeps the file the other entry still uses
+        r = client.patch(f"/entries/{first['id']}/image", files={"image": ("c.png", other, "image/png")})
+        assert r.status_code == 200
+        assert ("DELETE", shared_name) not in requests_seen
+
+        # ...and schedules its deletion once the last reference is gone
+        r = client.patch(f"/entries/{second['id']}/image", files={"image": ("c.png", other, "image/png")})
+        assert r.status_code == 200
+        assert ("DELETE", shared_name) not in requests_seen  # Deferred, not inline
+
+        assert asyncio.run(drain_pending_deletes()) == 1
+        assert ("DELETE", shared_name) in requests_seen
+
+    # Both entries now share the second photo, uploaded once
+    assert [method for method, _ in requests_seen].count("PUT") == 2
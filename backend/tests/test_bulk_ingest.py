@@ -0,0 +1,153 @@
+"""
+Tests for bulk sighting ingest (POST /entries/bulk).
+
+- JSON array, NDJSON and CSV bodies
+- invalid rows are reported per row without stopping the import
+- rows are inserted in chunks, one transaction each
+- imported addresses are queued for geocoding (when enabled)
+- non-UTF-8 and oversized bodies are rejected before parsing
+- addresses that don't fit in the geocoding queue are re-queued by the sweep
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure backend/ is importable
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def stored(client: TestClient):
+    return {e["id"]: e for e in client.get("/entries").json()}
+
+
+def test_json_array_with_invalid_rows(client: TestClient):
+    rows = [
+        {"text": "Orange cat", "location_street": "Main St", "location_number": "5", "location_city": "Berlin"},
+        {"text": "   "},
+        {"nickname": "no text"},
+        "not an object",
+        {"text": "Black cat", "location": "Harbour", "nickname": " Shadow "},
+    ]
+    r = client.post("/entries/bulk", json=rows)
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["created"], body["invalid"], body["failed"]) == (2, 3, 0)
+    assert [res["status"] for res in body["results"]] == ["created", "invalid", "invalid", "invalid", "created"]
+    assert "text" in body["results"][2]["error"]
+
+    entries = stored(client)
+    first = entries[body["results"][0]["entry_id"]]
+    assert first["location"] == "Main St 5, Berlin"
+    assert entries[body["results"][4]["entry_id"]]["nickname"] == "Shadow"
+
+
+def test_ndjson_and_csv(client: TestClient):
+    ndjson = "\n".join([json.dumps({"text": "Cat one"}), "{broken", "", json.dumps({"text": "Cat two"})])
+    r = client.post("/entries/bulk", content=ndjson, headers={"Content-Type": "application/x-ndjson"})
+    assert [res["status"] for res in r.json()["results"]] == ["created", "invalid", "created"]
+
+    csv_body = "text,location_city,nickname\nTabby on a wall,Hamburg,\n,Hamburg,Nameless\n"
+    r = client.post("/entries/bulk", content=csv_body, headers={"Content-Type": "text/csv"})
+    results = r.json()["results"]
+    assert [res["status"] for res in results] == ["created", "invalid"]
+    entry = stored(client)[results[0]["entry_id"]]
+    assert (entry["location_city"], entry["nickname"]) == ("Hamburg", None)
+
+
+def test_bad_bodies(client: TestClient):
+    assert client.post("/entries/bulk", content="{", headers={"Content-Type": "application/json"}).status_code == 400
+    assert client.post("/entries/bulk", json={"text": "not a list"}).status_code == 400
+    assert client.post("/entries/bulk", content="x", headers={"Content-Type": "text/plain"}).status_code == 415
+
+
+def test_rows_are_inserted_in_chunks(main, client: TestClient, monkeypatch):
+    monkeypatch.setattr(main, "BULK_INGEST_CHUNK_SIZE", 4)
+    with patch("main.insert_entries", wraps=main.insert_entries) as insert:
+        body = client.post("/entries/bulk", json=[{"text": f"Cat {i}"} for i in range(10)]).json()
+
+    assert [len(call.args[1]) for call in insert.call_args_list] == [4, 4, 2]
+    ids = [res["entry_id"] for res in body["results"]]
+    entries = stored(client)
+    assert [entries[i]["text"] for i in ids] == [f"Cat {i}" for i in range(10)]
+
+
+def test_failed_chunk_is_reported(main, client: TestClient, monkeypatch):
+    monkeypatch.setattr(main, "BULK_INGEST_CHUNK_SIZE", 2)
+    original = main.insert_entries
+    calls = []
+
+    def flaky(cur, rows):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise RuntimeError("disk full")
+        return original(cur, rows)
+
+    with patch("main.insert_entries", side_effect=flaky):
+        body = client.post("/entries/bulk", json=[{"text": f"Cat {i}"} for i in range(5)]).json()
+
+    assert [res["status"] for res in body["results"]] == ["created", "created", "failed", "failed", "created"]
+    assert len(stored(client)) == 3
+
+
+def test_imported_addresses_are_queued_for_geocoding(main, client: TestClient, monkeypatch):
+    monkeypatch.setattr(main.settings, "auto_geocode_entries", True)
+    with patch.object(main.geocoding_queue, "submit", return_value=True) as submit:
+        body = client.post("/entries/bulk", json=[
+            {"text": "Cat", "location": "Harbour"},
+            {"text": "Cat without address"},
+        ]).json()
+
+    assert body["geocoding_queued"] == 1
+    submit.assert_called_once_with((body["results"][0]["entry_id"], "Harbour"))
+
+
+def test_non_utf8_and_oversized_bodies(main, client: TestClient, monkeypatch):
+    cp1252 = "text,location\nCat,Café Müller\n".encode("cp1252")
+    r = client.post("/entries/bulk", content=cp1252, headers={"Content-Type": "text/csv"})
+    assert r.status_code == 400
+    assert "UTF-8" in r.json()["detail"]
+
+    monkeypatch.setattr(main, "BULK_INGEST_MAX_BYTES", 64)
+    with patch("main.parse_bulk_rows") as parse:
+        r = client.post("/entries/bulk", json=[{"text": f"Cat {i}"} for i in range(10)])
+    assert r.status_code == 413
+    parse.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_geocoding_beyond_queue_capacity_is_deferred(main, client: TestClient, monkeypatch):
+    monkeypatch.setattr(main.settings, "auto_geocode_entries", True)
+    monkeypatch.setattr(main.geocoding_queue, "max_size", 2)
+    released = asyncio.Event()
+    jobs = []
+
+    async def geocode(job):
+        await released.wait()  # Geocoder busy: the queue stays full
+        jobs.append(job)
+
+    monkeypatch.setattr(main.geocoding_queue, "handler", geocode)
+    main.geocoding_queue.start()
+    try:
+        body = client.post("/entries/bulk", json=[{"text": "Cat", "location": f"Street {i}"} for i in range(5)]).json()
+        assert (body["geocoding_queued"], body["geocoding_deferred"]) == (2, 3)
+        assert main.requeue_deferred_geocoding() == 0  # Still full
+
+        released.set()
+        await main.geocoding_queue.join()
+        assert main.requeue_deferred_geocoding() == 2
+        await main.geocoding_queue.join()
+        assert main.requeue_deferred_geocoding() == 1
+        await main.geocoding_queue.join()
+        assert main.requeue_deferred_geocoding() == 0
+    finally:
+        await main.geocoding_queue.stop()
+
+    assert sorted(job[0] for job in jobs) == [r["entry_id"] for r in body["results"]]
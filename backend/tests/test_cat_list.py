@@ -0,0 +1,99 @@
+"""
+Tests for the cat directory (GET /cats).
+
+- without parameters every cat is returned, newest first (unchanged)
+- keyset pagination walks each sort order without gaps or repeats
+- include_stats adds sighting count, last seen and primary photo
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure backend/ is importable
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture()
+def cats(main, client: TestClient):
+    """Seven cats with 0-3 sightings each; returns {cat_id: (name, sightings, last_seen)}."""
+    names = ["mia", "Bella", None, "oscar", "Felix", "bella", "Zorro"]
+    result = {}
+    for n, name in enumerate(names):
+        cat_id = client.post("/cats", json={"name": name}).json()["id"]
+        last_seen = None
+        for i in range(n % 4):
+            entry = main.create_entry(main.EntryCreate(text=f"Sighting {i} of cat {n}"))
+            last_seen = f"2026-05-{(n * 3 + i) % 28 + 1:02d}T10:00:00Z"
+            conn = main.get_conn()
+            cur = main.get_cursor(conn)
+            main.execute_query(cur, "UPDATE entries SET createdAt = ? WHERE id = ?", (last_seen, entry.id))
+            conn.commit()
+            conn.close()
+            client.post(f"/entries/{entry.id}/assign/{cat_id}")
+        result[cat_id] = (name, n % 4, last_seen)
+    return result
+
+
+def walk(client: TestClient, **params):
+    """Follow X-Next-Cursor to the end; returns the cats and the number of pages."""
+    seen, pages, cursor = [], 0, None
+    while True:
+        r = client.get("/cats", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert r.status_code == 200
+        seen.extend(r.json())
+        pages += 1
+        cursor = r.headers.get("x-next-cursor")
+        if cursor is None:
+            return seen, pages
+
+
+def test_default_lists_all_cats_newest_first(client: TestClient, cats):
+    r = client.get("/cats")
+    assert "x-next-cursor" not in r.headers
+    body = r.json()
+    assert [c["id"] for c in body] == sorted(cats, reverse=True)
+    assert set(body[0]) == {"id", "name", "createdAt"}  # No stats unless asked for
+
+
+@pytest.mark.parametrize("sort,key,descending", [
+    ("newest", lambda cat_id, c: cat_id, True),
+    ("name", lambda cat_id, c: ((c[0] or "").lower(), cat_id), False),
+    ("sightings", lambda cat_id, c: (c[1], cat_id), True),
+    ("last_seen", lambda cat_id, c: (c[2] or "", cat_id), True),  # Never seen: last
+])
+def test_keyset_pages_cover_each_sort_order(client: TestClient, cats, sort, key, descending):
+    listed, pages = walk(client, sort=sort, limit=3)
+    assert pages == 3
+    expected = sorted(cats, key=lambda cat_id: key(cat_id, cats[cat_id]), reverse=descending)
+    assert [c["id"] for c in listed] == expected
+
+
+def test_include_stats(client: TestClient, main, cats):
+    busiest = max(cats, key=lambda cat_id: (cats[cat_id][1], cat_id))
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, "UPDATE entries SET photo_url = 'https://cdn/p.jpg' WHERE cat_id = ?", (busiest,))
+    main.execute_query(cur, "SELECT id FROM entries WHERE cat_id = ?", (busiest,))
+    for row in cur.fetchall():
+        main.refresh_cat_stats_for_entry(cur, row["id"])
+    conn.commit()
+    conn.close()
+
+    first = client.get("/cats", params={"sort": "sightings", "limit": 1, "include_stats": True}).json()[0]
+    assert first["id"] == busiest
+    assert first["sightingsCount"] == 3
+    assert first["lastSeen"] == cats[busiest][2]
+    assert first["primaryPhoto"] == "https://cdn/p.jpg"
+
+    empty = next(cat_id for cat_id, c in cats.items() if c[1] == 0)
+    listed = {c["id"]: c for c in client.get("/cats", params={"include_stats": True}).json()}
+    assert (listed[empty]["sightingsCount"], listed[empty]["lastSeen"]) == (0, None)
+
+
+def test_invalid_cursor_is_400(client: TestClient, cats):
+    assert client.get("/cats", params={"limit": 2, "cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/cats", params={"sort": "name", "cursor": "WzFd"}).status_code == 400  # [1]: wrong length
@@ -0,0 +1,282 @@
+"""
+Tests for the incrementally maintained per-cat statistics.
+
+- linking sightings (assign, link-sightings, from-sightings) updates cat_stats
+- the enhanced profile matches a full recomputation over the cat's sightings
+- moving a sighting to another cat rebuilds the cat it left
+- bulk linking reports newly/already linked and failed ids in payload order
+- bulk linking reports what its UPDATE changed, not what an earlier SELECT saw
+- cats from before the stats tables are built on first profile view
+- their sightings list counts the sightings instead of reporting 0
+- cats without a stats row are still listed, and backfilled in the background
+- the batch endpoint returns the same profiles with a fixed number of queries
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure backend/ is importable
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from collections import Counter
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def add_sighting(main, text, location=None, created_at=None, photo_url=None):
+    entry = main.create_entry(main.EntryCreate(text=text, location=location))
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    if created_at:
+        main.execute_query(cur, "UPDATE entries SET createdAt = ? WHERE id = ?", (created_at, entry.id))
+    if photo_url:
+        main.execute_query(cur, "UPDATE entries SET photo_url = ? WHERE id = ?", (photo_url, entry.id))
+    conn.commit()
+    conn.close()
+    return entry.id
+
+
+def expected_stats(main, cat_id):
+    """Recompute the profile stats the old way: scan every sighting."""
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur,
+        "SELECT text, createdAt, location, location_normalized, photo_url FROM entries "
+        "WHERE cat_id = ? ORDER BY createdAt DESC",
+        (cat_id,),
+    )
+    rows = cur.fetchall()
+    conn.close()
+
+    locations = Counter(r["location"] or r["location_normalized"] for r in rows
+                        if r["location"] or r["location_normalized"])
+    photos = [r["photo_url"] for r in rows if r["photo_url"]]
+    return {
+        "totalSightings": len(rows),
+        "uniqueLocations": len(locations),
+        "photoCount": len(photos),
+        "firstSeen": rows[-1]["createdAt"] if rows else None,
+        "lastSeen": rows[0]["createdAt"] if rows else None,
+        "mostFrequentLocation": locations.most_common(1)[0][0] if locations else None,
+    }, (photos[0] if photos else None)
+
+
+def test_profile_stats_follow_links(main, client: TestClient):
+    ids = [
+        add_sighting(main, "Happy orange cat, nice and friendly", "Harbour", "2026-01-01T10:00:00Z"),
+        add_sighting(main, "Orange cat near the bakery", "Bakery", "2026-01-03T10:00:00Z", "https://cdn/a.jpg"),
+        add_sighting(main, "Orange cat at the harbour again", "Harbour", "2026-01-05T10:00:00Z"),
+        add_sighting(main, "Orange cat sleeping", None, "2026-01-02T10:00:00Z", "https://cdn/b.jpg"),
+    ]
+
+    cat = client.post("/cats/from-sightings", json={"entry_ids": ids[:2], "name": "Ginger"}).json()
+    client.post(f"/entries/{ids[2]}/assign/{cat['id']}")
+    client.post(f"/cats/{cat['id']}/link-sightings", json={"entry_ids": [ids[3]]})
+
+    profile = client.get(f"/cats/{cat['id']}/profile/enhanced").json()
+    stats, primary_photo = expected_stats(main, cat["id"])
+    assert profile["stats"] == stats
+    assert profile["cat"]["primaryPhoto"] == primary_photo == "https://cdn/a.jpg"
+    assert profile["stats"]["mostFrequentLocation"] == "Harbour"
+
+    harbour = profile["locationSummary"][0]
+    assert (harbour["location"], harbour["count"], harbour["lastSeen"]) == ("Harbour", 2, "2026-01-05T10:00:00Z")
+    assert profile["top_tags"][:2] == ["cat", "orange"]  # 4 each: ties by keyword
+    assert profile["temperament_guess"] == "friendly"  # "happy", "nice"
+    assert [s["id"] for s in profile["recentSightings"]] == [ids[2], ids[1], ids[3], ids[0]]
+    assert "Orange cat at the harbour again" in profile["profile_text"]
+
+
+def test_moving_sighting_rebuilds_previous_cat(main, client: TestClient):
+    ids = [
+        add_sighting(main, "Black cat", "Park", "2026-02-01T10:00:00Z"),
+        add_sighting(main, "Black cat with broken tail", "Station", "2026-02-09T10:00:00Z", "https://cdn/c.jpg"),
+    ]
+    first = client.post("/cats/from-sightings", json={"entry_ids": ids}).json()
+    second = client.post("/cats", json={"name": "Other"}).json()
+
+    client.post(f"/entries/{ids[1]}/assign/{second['id']}")
+
+    for cat_id in (first["id"], second["id"]):
+        profile = client.get(f"/cats/{cat_id}/profile/enhanced").json()
+        assert profile["stats"] == expected_stats(main, cat_id)[0]
+
+    first_profile = client.get(f"/cats/{first['id']}/profile/enhanced").json()
+    assert first_profile["cat"]["primaryPhoto"] is None
+    assert "broken" not in first_profile["top_tags"]
+    assert first_profile["temperament_guess"] == "unknown / neutral"
+
+
+def test_bulk_link_results_and_stats(main, client: TestClient):
+    ids = [add_sighting(main, f"Ginger cat {i}", ("Harbour", "Bakery")[i % 2]) for i in range(30)]
+    other = client.post("/cats/from-sightings", json={"entry_ids": ids[:3], "name": "Other"}).json()
+    cat = client.post("/cats/from-sightings", json={"entry_ids": ids[3:5], "name": "Ginger"}).json()
+
+    payload = [ids[3], 99999, ids[0], ids[5], ids[5]] + ids[6:]
+    with patch("main.execute_query", wraps=main.execute_query) as execute_query:
+        r = client.post(f"/cats/{cat['id']}/link-sightings", json={"entry_ids": payload})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["newly_linked"] == [ids[0], ids[5]] + ids[6:]
+    assert body["already_linked"] == [ids[3], ids[5]]  # Repeats count as already linked
+    assert body["failed"] == [99999]
+    assert execute_query.call_count < 30  # Not a SELECT and UPDATE per id
+
+    for cat_id in (cat["id"], other["id"]):
+        profile = client.get(f"/cats/{cat_id}/profile/enhanced").json()
+        assert profile["stats"] == expected_stats(main, cat_id)[0]
+    assert client.get(f"/cats/{other['id']}/profile/enhanced").json()["stats"]["totalSightings"] == 2
+
+
+def test_bulk_link_reports_rows_changed_after_select(main, client: TestClient):
+    if not main.SUPPORTS_RETURNING:
+        pytest.skip("needs UPDATE ... RETURNING")
+    ids = [add_sighting(main, f"Tabby cat {i}", "Harbour") for i in range(3)]
+    cat = client.post("/cats", json={"name": "Tabby"}).json()
+
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    execute_query = main.execute_query
+
+    def link_after_select(cur, sql, params=()):
+        if sql.startswith("UPDATE entries SET cat_id") and not other_request:
+            # Another request links ids[1] between the SELECT and the UPDATE
+            other_request.append(main.get_conn())
+            execute_query(main.get_cursor(other_request[0]), "UPDATE entries SET cat_id = ? WHERE id = ?", (cat["id"], ids[1]))
+            other_request[0].commit()
+            other_request[0].close()
+        return execute_query(cur, sql, params)
+
+    other_request = []
+    with patch("main.execute_query", side_effect=link_after_select):
+        newly, already, failed = main.link_sightings_to_cat_bulk(cur, ids, cat["id"])
+    conn.commit()
+    conn.close()
+
+    assert newly == [ids[0], ids[2]]
+    assert already == [ids[1]]
+    assert failed == []
+
+
+def test_photo_update_refreshes_stats(main, client: TestClient):
+    entry_id = add_sighting(main, "Grey cat", "Market", "2026-03-01T10:00:00Z")
+    cat = client.post("/cats/from-sightings", json={"entry_ids": [entry_id]}).json()
+
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, "UPDATE entries SET photo_url = 'https://cdn/d.jpg' WHERE id = ?", (entry_id,))
+    main.refresh_cat_stats_for_entry(cur, entry_id)
+    conn.commit()
+    conn.close()
+
+    profile = client.get(f"/cats/{cat['id']}/profile/enhanced").json()
+    assert profile["stats"]["photoCount"] == 1
+    assert profile["cat"]["primaryPhoto"] == "https://cdn/d.jpg"
+
+
+def test_profile_does_not_rescan_sightings(main, client: TestClient):
+    ids = [add_sighting(main, f"Tabby number {i}", "Square") for i in range(3)]
+    cat = client.post("/cats/from-sightings", json={"entry_ids": ids}).json()
+
+    with patch("main.rebuild_cat_stats", wraps=main.rebuild_cat_stats) as rebuild:
+        profile = client.get(f"/cats/{cat['id']}/profile/enhanced").json()
+    rebuild.assert_not_called()
+    assert profile["stats"]["totalSightings"] == 3
+
+
+def test_cat_without_stats_row_is_built_on_first_view(main, client: TestClient):
+    entry_id = add_sighting(main, "Calico cat", "Bridge")
+    cat = client.post("/cats", json={"name": "Legacy"}).json()
+
+    # Linked behind the stats tables' back (as in databases from before them)
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, "UPDATE entries SET cat_id = ? WHERE id = ?", (cat["id"], entry_id))
+    main.execute_query(cur, "DELETE FROM cat_stats WHERE cat_id = ?", (cat["id"],))
+    conn.commit()
+    conn.close()
+
+    sightings = client.get(f"/cats/{cat['id']}/sightings", params={"limit": 1}).json()
+    assert (sightings["total"], sightings["totalPages"]) == (1, 1)
+
+    profile = client.get(f"/cats/{cat['id']}/profile/enhanced").json()
+    assert profile["stats"]["totalSightings"] == 1
+    assert profile["stats"]["mostFrequentLocation"] == "Bridge"
+
+
+def test_cats_without_stats_rows_are_listed_and_backfilled(main, client: TestClient):
+    entry_id = add_sighting(main, "Tortoiseshell cat", "Station")
+    cat = client.post("/cats/from-sightings", json={"entry_ids": [entry_id]}).json()
+    other = client.post("/cats", json={"name": "Nobody"}).json()
+
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, "DELETE FROM cat_stats")
+    conn.commit()
+    conn.close()
+
+    # Listed (as never seen) until the background backfill has run
+    for sort in ("newest", "last_seen", "sightings", "name"):
+        cats = client.get("/cats", params={"include_stats": True, "sort": sort}).json()
+        assert {c["id"]: c["sightingsCount"] for c in cats} == {cat["id"]: 0, other["id"]: 0}
+
+    assert main.backfill_cat_stats(batch_size=1) == 2
+    assert main.backfill_cat_stats() == 0
+    cats = client.get("/cats", params={"include_stats": True, "sort": "sightings"}).json()
+    assert [(c["id"], c["sightingsCount"]) for c in cats] == [(cat["id"], 1), (other["id"], 0)]
+
+
+def test_batch_profiles_match_single_profiles(main, client: TestClient):
+    long_note = "Long note about the cat " * 6
+    ginger = client.post("/cats/from-sightings", json={"entry_ids": [
+        add_sighting(main, f"Orange cat {i}. {long_note}", ("Harbour", "Bakery")[i % 2],
+                     f"2026-04-{i + 1:02d}T10:00:00Z", f"https://cdn/{i}.jpg" if i % 3 == 0 else None)
+        for i in range(9)
+    ], "name": "Ginger"}).json()["id"]
+    shy = client.post("/cats/from-sightings", json={"entry_ids": [
+        add_sighting(main, "Shy black cat, scared", "Park", "2026-04-02T10:00:00Z"),
+    ]}).json()["id"]
+    empty = client.post("/cats", json={"name": "Nobody"}).json()["id"]
+    client.post(f"/cats/{shy}/insights", json={"mode": "care"})
+
+    cat_ids = [shy, ginger, empty]
+    r = client.get("/cats/profiles/enhanced", params={"ids": f"{shy},{ginger},999,{empty},{shy}"})
+    assert r.status_code == 200
+    profiles = r.json()
+    assert [p["cat"]["id"] for p in profiles] == cat_ids  # Requested order, unknown and repeats skipped
+
+    main.profile_cache.clear()
+    for profile in profiles:
+        assert profile == client.get(f"/cats/{profile['cat']['id']}/profile/enhanced").json()
+    assert len(profiles[1]["recentSightings"]) == 5
+    assert profiles[0]["insightStatus"]["hasCare"] is True
+
+
+def test_batch_profiles_use_constant_queries(main, client: TestClient):
+    cat_ids = [
+        client.post("/cats/from-sightings", json={"entry_ids": [
+            add_sighting(main, f"Cat {n} sighting {i}", f"Spot {i}") for i in range(3)
+        ]}).json()["id"]
+        for n in range(6)
+    ]
+    main.profile_cache.clear()
+
+    with patch("main.execute_query", wraps=main.execute_query) as execute_query:
+        r = client.get("/cats/profiles/enhanced", params={"ids": ",".join(map(str, cat_ids))})
+    assert len(r.json()) == 6
+    assert execute_query.call_count == 6  # Versions, cats, sightings, locations, keywords, insights
+
+    # Now cached: only the version lookup
+    with patch("main.execute_query", wraps=main.execute_query) as execute_query:
+        client.get("/cats/profiles/enhanced", params={"ids": ",".join(map(str, cat_ids))})
+    assert execute_query.call_count == 1
+
+
+def test_batch_profiles_validate_ids(client: TestClient):
+    assert client.get("/cats/profiles/enhanced", params={"ids": "1,x"}).status_code == 422
+    assert client.get("/cats/profiles/enhanced", params={"ids": ""}).status_code == 422
+    assert client.get("/cats/profiles/enhanced",
+                      params={"ids": ",".join(map(str, range(101)))}).status_code == 422
@@ -0,0 +1,145 @@
+"""
+Tests for GET /entries filters and pagination.
+
+- without parameters the first ENTRIES_DEFAULT_PAGE_SIZE entries are returned, newest first
+- favorites / cat_id / unassigned / has_coords / since-until / city filter in SQL
+- keyset pagination with X-Next-Cursor, combinable with filters
+- X-Next-Cursor is exposed to cross-origin (browser) clients
+- RowMapper builds models from SQLite rows, tuples and PostgreSQL-style dict rows
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure backend/ is importable
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture()
+def entries(main, client: TestClient):
+    """Ten entries: even ones favorite, every third in Berlin with coordinates, 0-3 linked to a cat."""
+    cat_id = client.post("/cats", json={"name": "Linked"}).json()["id"]
+    ids = [
+        main.create_entry(main.EntryCreate(text=f"Entry {i}", location_city="Berlin" if i % 3 == 0 else "Hamburg")).id
+        for i in range(10)
+    ]
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    for i, entry_id in enumerate(ids):
+        main.execute_query(cur, "UPDATE entries SET createdAt = ? WHERE id = ?",
+                           (f"2026-06-{i + 1:02d}T12:00:00Z", entry_id))
+        if i % 2 == 0:
+            main.execute_query(cur, "UPDATE entries SET isFavorite = 1 WHERE id = ?", (entry_id,))
+        if i % 3 == 0:
+            main.execute_query(cur, "UPDATE entries SET location_lat = 52.5, location_lon = 13.4 WHERE id = ?",
+                               (entry_id,))
+    conn.commit()
+    conn.close()
+    for entry_id in ids[:4]:
+        client.post(f"/entries/{entry_id}/assign/{cat_id}")
+    return ids, cat_id
+
+
+def listed(client: TestClient, **params):
+    r = client.get("/entries", params=params)
+    assert r.status_code == 200
+    return [e["id"] for e in r.json()]
+
+
+def test_no_parameters_returns_first_page(main, client: TestClient, entries):
+    ids, _ = entries
+    r = client.get("/entries")
+    assert [e["id"] for e in r.json()] == ids[::-1]
+    assert "x-next-cursor" not in r.headers
+
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_many(cur, "INSERT INTO entries (text, createdAt, isFavorite) VALUES (?, ?, 0)",
+                      [(f"Bulk {i}", "2026-07-01T12:00:00Z") for i in range(main.ENTRIES_DEFAULT_PAGE_SIZE)])
+    conn.commit()
+    conn.close()
+
+    r = client.get("/entries")
+    assert len(r.json()) == main.ENTRIES_DEFAULT_PAGE_SIZE  # Not the whole table
+    assert "x-next-cursor" in r.headers
+
+
+def test_filters(client: TestClient, entries):
+    ids, cat_id = entries
+    newest_first = ids[::-1]
+
+    assert listed(client, favorites=True) == [i for n, i in enumerate(ids) if n % 2 == 0][::-1]
+    assert listed(client, cat_id=cat_id) == newest_first[-4:]
+    assert listed(client, unassigned=True) == newest_first[:-4]
+    assert listed(client, has_coords=True) == [i for n, i in enumerate(ids) if n % 3 == 0][::-1]
+    assert listed(client, city="berlin") == listed(client, has_coords=True)
+    assert listed(client, since="2026-06-03T00:00:00Z", until="2026-06-06T00:00:00Z") == ids[2:5][::-1]
+    assert listed(client, favorites=True, unassigned=True, city="Berlin") == [ids[6]]
+
+
+def test_cursor_pages_follow_filters(client: TestClient, entries):
+    ids, _ = entries
+    seen, cursor = [], None
+    while True:
+        params = {"unassigned": True, "limit": 4, **({"cursor": cursor} if cursor else {})}
+        r = client.get("/entries", params=params)
+        seen.extend(e["id"] for e in r.json())
+        cursor = r.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert seen == ids[4:][::-1]
+
+
+def test_cursor_header_is_exposed_to_frontend(main, client: TestClient, entries):
+    origin = main.settings.allowed_origins_list[0]
+    r = client.get("/entries", params={"limit": 2}, headers={"Origin": origin})
+    assert r.headers["access-control-allow-origin"] == origin
+    assert "x-next-cursor" in r.headers["access-control-expose-headers"].lower()
+    assert "x-next-cursor" in r.headers
+
+
+def test_invalid_parameters(client: TestClient, entries):
+    _, cat_id = entries
+    assert client.get("/entries", params={"cat_id": cat_id, "unassigned": True}).status_code == 422
+    assert client.get("/entries", params={"limit": 2, "cursor": "bogus"}).status_code == 400
+
+
+class FakeCursor:
+    def __init__(self, names):
+        self.description = [(name, None, None, None, None, None, None) for name in names]
+
+
+@pytest.mark.parametrize("postgres", [False, True])
+def test_row_mapper(main, postgres):
+    names = ["id", "name", "createdAt", "sort_key"]
+    rows = [(1, "Ginger", "2026-01-01T00:00:00Z", "x"), (2, None, "2026-01-02T00:00:00Z", "y")]
+    if postgres:
+        # RealDictRow: unquoted identifiers come back lowercased
+        names = [name.lower() for name in names]
+        rows = [dict(zip(names, row)) for row in rows]
+
+    cats = main.RowMapper(main.Cat).map(FakeCursor(names), rows)
+    assert [(c.id, c.name, c.createdAt) for c in cats] == [
+        (1, "Ginger", "2026-01-01T00:00:00Z"), (2, None, "2026-01-02T00:00:00Z"),
+    ]
+    assert cats[0].model_fields_set == {"id", "name", "createdAt"}  # sort_key ignored, stats unset
+
+
+def test_row_mapper_converts_like_entry_model(main, client: TestClient):
+    entry_id = client.post("/entries", json={"text": "Grey cat", "location": "Harbour"}).json()["id"]
+    client.post(f"/entries/{entry_id}/favorite")
+
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, f"SELECT {main.ENTRY_COLUMNS} FROM entries WHERE id = ?", (entry_id,))
+    entry = main.entry_mapper.one(cur)
+    assert main.entry_mapper.one(cur) is None  # No more rows
+    conn.close()
+
+    assert entry.isFavorite is True  # 1 -> bool
+    assert entry.model_dump() == client.get("/entries").json()[0]
+
@@ -0,0 +1,91 @@
+"""
+Tests for the streaming sightings export (GET /entries/export).
+
+- NDJSON, CSV and GeoJSON contain every (filtered) sighting
+- rows are fetched in fixed-size batches, not all at once
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure backend/ is importable
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import csv
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture()
+def entry_ids(main):
+    ids = [main.create_entry(main.EntryCreate(text=f'Cat {i}, "quoted", comma', location_city="Berlin")).id
+           for i in range(7)]
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, "UPDATE entries SET location_lat = 52.5, location_lon = 13.4 WHERE id = ?", (ids[0],))
+    main.execute_query(cur, "UPDATE entries SET isFavorite = 1 WHERE id IN (?, ?)", (ids[1], ids[2]))
+    conn.commit()
+    conn.close()
+    return ids
+
+
+def test_ndjson_export(client: TestClient, entry_ids):
+    r = client.get("/entries/export")
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="sightings.ndjson"' in r.headers["content-disposition"]
+
+    records = [json.loads(line) for line in r.text.splitlines()]
+    assert [rec["id"] for rec in records] == entry_ids
+    assert records[0]["text"] == 'Cat 0, "quoted", comma'
+    assert records[1]["isFavorite"] is True
+    assert records[0]["location_lat"] == 52.5
+
+
+def test_csv_export_with_filter(client: TestClient, entry_ids):
+    r = client.get("/entries/export", params={"format": "csv", "favorites": True})
+    assert r.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [int(row["id"]) for row in rows] == entry_ids[1:3]
+    assert rows[0]["text"] == 'Cat 1, "quoted", comma'
+
+    empty = client.get("/entries/export", params={"format": "csv", "city": "Nowhere"}).text
+    assert empty.strip() == ",".join(["id", "text", "createdAt", "isFavorite", "nickname", "cat_id", "photo_url",
+                                      "location", "location_normalized", "location_lat", "location_lon",
+                                      "location_street", "location_number", "location_zip", "location_city",
+                                      "location_country"])
+
+
+def test_geojson_export(client: TestClient, entry_ids):
+    r = client.get("/entries/export", params={"format": "geojson"})
+    collection = json.loads(r.text)
+    assert collection["type"] == "FeatureCollection"
+    features = collection["features"]
+    assert [f["id"] for f in features] == entry_ids
+    assert features[0]["geometry"] == {"type": "Point", "coordinates": [13.4, 52.5]}
+    assert features[1]["geometry"] is None
+
+    with_coords = json.loads(client.get("/entries/export", params={"format": "geojson", "has_coords": True}).text)
+    assert [f["id"] for f in with_coords["features"]] == entry_ids[:1]
+    assert json.loads(client.get("/entries/export", params={"format": "geojson", "city": "x"}).text)["features"] == []
+
+
+def test_export_streams_in_batches(main, client: TestClient, entry_ids, monkeypatch):
+    monkeypatch.setattr(main, "EXPORT_BATCH_SIZE", 3)
+    batches = []
+    original = main._stream_entries
+
+    def recording(sql, params):
+        for batch in original(sql, params):
+            batches.append(len(batch))
+            yield batch
+
+    monkeypatch.setattr(main, "_stream_entries", recording)
+    lines = client.get("/entries/export").text.splitlines()
+    assert len(lines) == 7
+    assert batches == [3, 3, 1]
@@ -0,0 +1,120 @@
+"""
+Tests for the write-behind geocoding queue.
+
+- bounded queue drops jobs (and counts them) instead of blocking
+- new entries get coordinates in the background when enabled
+- the job's database reads and writes run in a worker thread
+- disabled by default: creating an entry schedules nothing
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure backend/ is importable
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import asyncio
+import threading
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_queue_drops_jobs_when_full(main):
+    release = asyncio.Event()
+    handled = []
+
+    async def slow_handler(job):
+        await release.wait()
+        handled.append(job)
+
+    queue = main.WriteBehindQueue("test", slow_handler, max_size=2)
+    queue.start()
+    try:
+        assert queue.submit(1) is True
+        assert queue.submit(2) is True
+        assert queue.submit(3) is False  # full -> dropped, caller not blocked
+
+        stats = queue.stats()
+        assert stats["depth"] == 2
+        assert stats["dropped"] == 1
+        assert stats["high_water_mark"] == 2
+
+        release.set()
+        await queue.join()
+        assert handled == [1, 2]
+        assert queue.stats()["processed"] == 2
+        assert queue.stats()["depth"] == 0
+    finally:
+        await queue.stop()
+
+
+def test_submit_without_running_worker_is_noop(main):
+    queue = main.WriteBehindQueue("test", lambda job: None, max_size=10)
+    assert queue.submit("job") is False
+    assert queue.stats()["submitted"] == 0
+
+
+@pytest.mark.asyncio
+async def test_new_entry_is_geocoded_in_background(main, monkeypatch):
+    monkeypatch.setattr(main.settings, "auto_geocode_entries", True)
+    calls = []
+
+    async def fake_geocode(location: str) -> dict:
+        calls.append(location)
+        return {"display_name": "Central Park, New York", "lat": "40.78", "lon": "-73.96", "osm_id": "123"}
+
+    monkeypatch.setattr(main, "geocode_with_fallback", fake_geocode)
+
+    main.geocoding_queue.start()
+    try:
+        entry = main.create_entry(main.EntryCreate(text="Orange cat", location="Central Park"))
+        # Response is returned before geocoding happens
+        assert entry.location_lat is None
+
+        await main.geocoding_queue.join()
+    finally:
+        await main.geocoding_queue.stop()
+
+    assert calls == ["Central Park"]
+
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, "SELECT location_normalized, location_lat, location_lon FROM entries WHERE id = ?", (entry.id,))
+    row = cur.fetchone()
+    conn.close()
+    assert row["location_normalized"] == "Central Park, New York"
+    assert row["location_lat"] == pytest.approx(40.78)
+    assert row["location_lon"] == pytest.approx(-73.96)
+
+
+@pytest.mark.asyncio
+async def test_geocode_job_db_work_runs_off_the_event_loop(main, monkeypatch):
+    entry = main.create_entry(main.EntryCreate(text="Orange cat", location="Central Park"))
+    threads = []
+
+    async def fake_geocode(location: str) -> dict:
+        return {"display_name": "Central Park, New York", "lat": "40.78", "lon": "-73.96", "osm_id": "123"}
+
+    original_get_conn = main.get_conn
+
+    def record_get_conn():
+        threads.append(threading.current_thread())
+        return original_get_conn()
+
+    monkeypatch.setattr(main, "geocode_with_fallback", fake_geocode)
+    monkeypatch.setattr(main, "get_conn", record_get_conn)
+    await main._geocode_entry_job((entry.id, "Central Park"))
+
+    assert len(threads) == 2  # Read before, write after the geocoder call
+    assert all(thread is not threading.main_thread() for thread in threads)
+
+
+def test_auto_geocoding_disabled_by_default(main):
+    assert main.settings.auto_geocode_entries is False
+    before = main.geocoding_queue.stats()["submitted"]
+
+    main.create_entry(main.EntryCreate(text="Grey cat", location="Harbour"))
+
+    assert main.geocoding_queue.stats()["submitted"] == before
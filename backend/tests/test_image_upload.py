@@ -11,20 +11,34 @@ Tests cover:
 """
 
 import pytest
+import asyncio
+import hashlib
 import io
-from unittest.mock import Mock, patch, MagicMock
-from PIL import Image
+import os
+import tempfile
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
+from PIL import Image, ExifTags
 from fastapi import UploadFile, HTTPException
-import requests
+from starlette.datastructures import Headers
+import httpx
 
 from image_upload import (
     validate_bunny_config,
     validate_image_file,
     validate_image_content,
+    ImageInfo,
     upload_to_bunny,
     delete_from_bunny,
     CircuitBreaker,
     bunny_circuit_breaker,
+    UPLOAD_CHUNK_SIZE,
+    upload_image,
+    spool_upload,
+    UploadedImage,
+    render_variants,
+    compute_dhash,
+    shutdown_variant_executor,
+    list_storage_objects,
 )
 
 
@@ -48,9 +62,29 @@ def mock_bunny_settings():
         mock_settings.allowed_image_types_list = [
             "image/jpeg", "image/png", "image/webp", "image/gif"
         ]
+        mock_settings.storage_backend = "bunny"
+        mock_settings.image_variants_enabled = False
+        mock_settings.image_variant_workers = 1
+        mock_settings.image_validation_workers = 1
         yield mock_settings
 
 
+def make_upload_file(content: bytes, content_type: str, filename: str, size=...) -> UploadFile:
+    """Build a real UploadFile (supports chunked reads) around in-memory content."""
+    return UploadFile(
+        file=io.BytesIO(content),
+        size=len(content) if size is ... else size,
+        filename=filename,
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+def mock_http_client(handler):
+    """Patch the pooled Bunny.net client with one answered by `handler(request)`."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return patch("image_upload.get_http_client", return_value=client)
+
+
 # ============================================================================
 # Validation Tests
 # ============================================================================
@@ -159,6 +193,91 @@ def test_validate_image_content_too_large_dimensions():
         assert "dimensions too large" in error.lower()
 
 
+def test_validate_image_content_extracts_gps():
+    """Test EXIF GPS coordinates are collected during validation."""
+    exif = Image.Exif()
+    exif[ExifTags.IFD.GPSInfo] = {
+        ExifTags.GPS.GPSLatitudeRef: "S",
+        ExifTags.GPS.GPSLatitude: (33.0, 51.0, 54.0),
+        ExifTags.GPS.GPSLongitudeRef: "E",
+        ExifTags.GPS.GPSLongitude: (151.0, 12.0, 36.0),
+    }
+    img = Image.new("RGB", (120, 80), color="white")
+    img_bytes = io.BytesIO()
+    img.save(img_bytes, format="JPEG", exif=exif)
+
+    info = ImageInfo()
+    is_valid, error = validate_image_content(img_bytes.getvalue(), info)
+
+    assert is_valid is True
+    assert error is None
+    assert (info.width, info.height, info.format) == (120, 80, "JPEG")
+    assert info.gps == pytest.approx((-33.865, 151.21))
+
+
+def test_validate_image_content_without_gps():
+    """Test images without EXIF GPS yield no coordinates."""
+    img = Image.new("RGB", (50, 50))
+    img_bytes = io.BytesIO()
+    img.save(img_bytes, format="PNG")
+
+    info = ImageInfo()
+    is_valid, _ = validate_image_content(img_bytes.getvalue(), info)
+
+    assert is_valid is True
+    assert info.gps is None
+
+
+def _png_header_only(width: int, height: int) -> bytes:
+    """A tiny PNG whose header claims the given dimensions (no real pixel data)."""
+    import struct
+    import zlib
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"IDAT", zlib.compress(b"")) + chunk(b"IEND", b"")
+
+
+def test_validate_image_content_rejects_bomb_from_header():
+    """Test too many pixels are rejected from the header, before verify() runs."""
+    content = _png_header_only(9000, 9000)  # 81 megapixels in ~60 bytes
+    timings = {}
+
+    with patch("PIL.PngImagePlugin.PngImageFile.verify") as verify:
+        is_valid, error = validate_image_content(content, timings=timings)
+
+    assert is_valid is False
+    assert "too many pixels" in error.lower()
+    verify.assert_not_called()
+    assert "verify" not in timings
+
+
+@pytest.mark.asyncio
+async def test_spool_upload_validates_off_event_loop(mock_bunny_settings):
+    """Test validation runs in the validation thread pool and stage timings are recorded."""
+    import threading
+    import image_upload
+
+    img_bytes = io.BytesIO()
+    Image.new("RGB", (64, 64), color="navy").save(img_bytes, format="PNG")
+    threads = []
+    real_validate = image_upload.validate_image_content
+
+    def spy(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return real_validate(*args, **kwargs)
+
+    with patch("image_upload.validate_image_content", side_effect=spy):
+        spooled = await spool_upload(make_upload_file(img_bytes.getvalue(), "image/png", "cat.png"))
+    spooled.cleanup()
+
+    assert len(threads) == 1 and threads[0].startswith("image-validation")
+    assert set(spooled.timings) == {"spool", "header", "verify"}
+    assert (spooled.info.width, spooled.info.height) == (64, 64)
+
+
 # ============================================================================
 # Circuit Breaker Tests
 # ============================================================================
@@ -232,21 +351,16 @@ async def test_upload_to_bunny_success(mock_bunny_settings):
     img_content = img_bytes.getvalue()
 
     # Mock UploadFile with async read
-    mock_file = Mock(spec=UploadFile)
-    mock_file.content_type = "image/jpeg"
-    mock_file.size = len(img_content)
-    mock_file.filename = "test.jpg"
-    # Make read an async function
-    async def async_read():
-        return img_content
-    mock_file.read = async_read
-
-    # Mock requests.put
-    with patch("image_upload.requests.put") as mock_put:
-        mock_response = Mock()
-        mock_response.status_code = 201
-        mock_put.return_value = mock_response
+    mock_file = make_upload_file(img_content, "image/jpeg", "test.jpg")
+
+    # Mock the storage API
+    requests_seen = []
 
+    def handler(request):
+        requests_seen.append(request)
+        return httpx.Response(201)
+
+    with mock_http_client(handler):
         # Upload
         cdn_url = await upload_to_bunny(mock_file, folder="test")
 
@@ -254,7 +368,8 @@ async def test_upload_to_bunny_success(mock_bunny_settings):
         assert "test.b-cdn.net" in cdn_url
         assert "test/" in cdn_url
         assert cdn_url.endswith(".jpg")
-        mock_put.assert_called_once()
+        assert len(requests_seen) == 1
+        assert requests_seen[0].method == "PUT"
 
 
 @pytest.mark.asyncio
@@ -284,14 +399,7 @@ async def test_upload_to_bunny_circuit_breaker_open(mock_bunny_settings):
     img.save(img_bytes, format="JPEG")
     img_content = img_bytes.getvalue()
 
-    mock_file = Mock(spec=UploadFile)
-    mock_file.content_type = "image/jpeg"
-    mock_file.size = len(img_content)
-    mock_file.filename = "test.jpg"
-    # Make read async
-    async def async_read():
-        return img_content
-    mock_file.read = async_read
+    mock_file = make_upload_file(img_content, "image/jpeg", "test.jpg")
 
     with pytest.raises(HTTPException) as exc_info:
         await upload_to_bunny(mock_file)
@@ -316,27 +424,24 @@ async def test_upload_to_bunny_retry_on_timeout(mock_bunny_settings):
     img.save(img_bytes, format="PNG")
     img_content = img_bytes.getvalue()
 
-    mock_file = Mock(spec=UploadFile)
-    mock_file.content_type = "image/png"
-    mock_file.size = len(img_content)
-    mock_file.filename = "test.png"
-    # Make read async
-    async def async_read():
-        return img_content
-    mock_file.read = async_read
-
-    # Mock requests to timeout first, then succeed
-    with patch("image_upload.requests.put") as mock_put:
-        with patch("image_upload.time.sleep"):  # Skip sleep delays in test
-            mock_put.side_effect = [
-                requests.exceptions.Timeout("Timeout"),
-                Mock(status_code=201)
-            ]
+    mock_file = make_upload_file(img_content, "image/png", "test.png")
+
+    # Mock storage to timeout first, then succeed
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        if len(attempts) == 1:
+            raise httpx.ReadTimeout("Timeout", request=request)
+        return httpx.Response(201)
 
+    with mock_http_client(handler):
+        with patch("image_upload.asyncio.sleep", new=AsyncMock()) as mock_sleep:  # Skip delays
             cdn_url = await upload_to_bunny(mock_file)
 
-            # Should have retried
-            assert mock_put.call_count == 2
+            # Should have retried, backing off without blocking
+            assert len(attempts) == 2
+            mock_sleep.assert_awaited_once_with(1.0)
             assert "test.b-cdn.net" in cdn_url
 
 
@@ -352,28 +457,362 @@ async def test_upload_to_bunny_retry_exhausted(mock_bunny_settings):
     img.save(img_bytes, format="PNG")
     img_content = img_bytes.getvalue()
 
-    mock_file = Mock(spec=UploadFile)
-    mock_file.content_type = "image/png"
-    mock_file.size = len(img_content)
-    mock_file.filename = "test.png"
-    # Make read async
-    async def async_read():
-        return img_content
-    mock_file.read = async_read
-
-    # Mock requests to always timeout
-    with patch("image_upload.requests.put") as mock_put:
-        with patch("image_upload.time.sleep"):  # Skip sleep delays
-            mock_put.side_effect = requests.exceptions.Timeout("Always timeout")
+    mock_file = make_upload_file(img_content, "image/png", "test.png")
+
+    # Mock storage to always timeout
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        raise httpx.ReadTimeout("Always timeout", request=request)
 
+    with mock_http_client(handler):
+        with patch("image_upload.asyncio.sleep", new=AsyncMock()):  # Skip delays
             with pytest.raises(HTTPException) as exc_info:
                 await upload_to_bunny(mock_file)
 
             # Should have tried 3 times
-            assert mock_put.call_count == 3
+            assert len(attempts) == 3
             assert exc_info.value.status_code == 504
 
 
+@pytest.mark.asyncio
+async def test_concurrent_uploads_overlap(mock_bunny_settings):
+    """Test a slow upload doesn't block the event loop for other uploads."""
+    bunny_circuit_breaker.state = "CLOSED"
+    bunny_circuit_breaker.failures = 0
+
+    def make_file(color):
+        img_bytes = io.BytesIO()
+        Image.new("RGB", (50, 50), color=color).save(img_bytes, format="PNG")
+        return make_upload_file(img_bytes.getvalue(), "image/png", "test.png")
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_handler(request):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.2)  # Slow CDN
+        in_flight -= 1
+        return httpx.Response(201)
+
+    with mock_http_client(slow_handler):
+        urls = await asyncio.gather(*(upload_to_bunny(make_file(c)) for c in ("red", "green", "blue")))
+
+    # All three PUTs were in flight at the same time
+    assert max_in_flight == 3
+    assert len(set(urls)) == 3
+
+
+class RecordingUploadFile(UploadFile):
+    """UploadFile that records the size argument of every read() call."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.read_sizes = []
+        self.bytes_read = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        self.read_sizes.append(size)
+        chunk = await super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+@pytest.mark.asyncio
+async def test_upload_rejects_oversized_stream_early(mock_bunny_settings):
+    """Test the size limit is enforced while reading, not after reading everything."""
+    mock_bunny_settings.max_upload_size_mb = 1
+    mock_bunny_settings.max_upload_size_bytes = 256 * 1024
+
+    content = os.urandom(4 * 1024 * 1024)  # 4MB, size unknown up front
+    upload = RecordingUploadFile(
+        file=io.BytesIO(content), size=None, filename="big.jpg",
+        headers=Headers({"content-type": "image/jpeg"}),
+    )
+    spool_paths = []
+    real_mkstemp = tempfile.mkstemp
+
+    def recording_mkstemp(*args, **kwargs):
+        fd, path = real_mkstemp(*args, **kwargs)
+        spool_paths.append(path)
+        return fd, path
+
+    with patch("image_upload.tempfile.mkstemp", side_effect=recording_mkstemp):
+        with pytest.raises(HTTPException) as exc_info:
+            await upload_to_bunny(upload)
+
+    assert exc_info.value.status_code == 400
+    assert "too large" in exc_info.value.detail.lower()
+    assert upload.bytes_read <= 256 * 1024 + UPLOAD_CHUNK_SIZE
+    assert spool_paths and not os.path.exists(spool_paths[0])  # Spool cleaned up
+
+
+@pytest.mark.asyncio
+async def test_upload_streams_in_bounded_chunks(mock_bunny_settings):
+    """Test the image is read and sent in chunks, never as one buffer."""
+    bunny_circuit_breaker.state = "CLOSED"
+    bunny_circuit_breaker.failures = 0
+
+    # Noise doesn't compress, so this PNG spans many chunks
+    img = Image.frombytes("RGB", (400, 400), os.urandom(400 * 400 * 3))
+    img_bytes = io.BytesIO()
+    img.save(img_bytes, format="PNG")
+    img_content = img_bytes.getvalue()
+    assert len(img_content) > 4 * UPLOAD_CHUNK_SIZE
+
+    upload = RecordingUploadFile(
+        file=io.BytesIO(img_content), size=len(img_content), filename="noise.png",
+        headers=Headers({"content-type": "image/png"}),
+    )
+    sent_chunks = []
+    from image_upload import _iter_file as real_iter_file
+
+    async def recording_iter_file(*args, **kwargs):
+        async for chunk in real_iter_file(*args, **kwargs):
+            sent_chunks.append(chunk)
+            yield chunk
+
+    async def handler(request):
+        await request.aread()
+        return httpx.Response(201)
+
+    with mock_http_client(handler), patch("image_upload._iter_file", recording_iter_file):
+        await upload_to_bunny(upload)
+
+    assert all(0 < size <= UPLOAD_CHUNK_SIZE for size in upload.read_sizes)
+    assert len(sent_chunks) > 1
+    assert max(len(c) for c in sent_chunks) <= UPLOAD_CHUNK_SIZE
+    assert b"".join(sent_chunks) == img_content
+
+
+@pytest.mark.asyncio
+async def test_upload_image_uses_content_hash_as_name(mock_bunny_settings):
+    """Test the same bytes always map to the same storage path."""
+    bunny_circuit_breaker.state = "CLOSED"
+    bunny_circuit_breaker.failures = 0
+
+    img_bytes = io.BytesIO()
+    Image.new("RGB", (20, 20), color="red").save(img_bytes, format="PNG")
+    content = img_bytes.getvalue()
+    digest = hashlib.sha256(content).hexdigest()
+
+    with mock_http_client(lambda request: httpx.Response(201)):
+        first = await upload_image(make_upload_file(content, "image/png", "a.png"))
+        second = await upload_image(make_upload_file(content, "image/png", "b.png"))
+
+    assert first.sha256 == digest
+    assert first.url == second.url == f"https://test.b-cdn.net/sightings/{digest}.png"
+    assert first.deduplicated is False
+
+
+@pytest.mark.asyncio
+async def test_upload_image_skips_put_for_known_content(mock_bunny_settings):
+    """Test find_existing short-circuits the upload when the hash is already stored."""
+    img_bytes = io.BytesIO()
+    Image.new("RGB", (20, 20), color="blue").save(img_bytes, format="JPEG")
+    content = img_bytes.getvalue()
+    lookups = []
+
+    def find_existing(sha256):
+        lookups.append(sha256)
+        return UploadedImage(
+            url="https://test.b-cdn.net/sightings/existing.jpg",
+            variants={"thumb": "https://test.b-cdn.net/sightings/existing_thumb.jpg"},
+        )
+
+    def handler(request):
+        raise AssertionError(f"Unexpected storage request: {request.method} {request.url}")
+
+    with mock_http_client(handler):
+        uploaded = await upload_image(
+            make_upload_file(content, "image/jpeg", "cat.jpg"), find_existing=find_existing
+        )
+
+    assert lookups == [hashlib.sha256(content).hexdigest()]
+    assert uploaded.deduplicated is True
+    assert uploaded.url == "https://test.b-cdn.net/sightings/existing.jpg"
+    assert uploaded.variants == {"thumb": "https://test.b-cdn.net/sightings/existing_thumb.jpg"}
+    assert uploaded.info.width == 20  # Metadata still comes from this upload
+
+
+@pytest.mark.asyncio
+async def test_list_storage_objects_parses_listing(mock_bunny_settings):
+    """Test the Bunny.net folder listing is mapped to CDN URLs (directories skipped)."""
+    listing = [
+        {"ObjectName": "abc.jpg", "Length": 1234, "LastChanged": "2026-01-26T10:00:00.123", "IsDirectory": False},
+        {"ObjectName": "nested", "Length": 0, "LastChanged": "2026-01-26T10:00:00", "IsDirectory": True},
+    ]
+
+    def handler(request):
+        assert request.method == "GET"
+        assert request.url.path == "/test-zone/sightings/"
+        return httpx.Response(200, json=listing)
+
+    with mock_http_client(handler):
+        objects = await list_storage_objects("sightings")
+
+    assert len(objects) == 1
+    assert objects[0].url == "https://test.b-cdn.net/sightings/abc.jpg"
+    assert objects[0].size == 1234
+    assert objects[0].last_changed.year == 2026
+
+
+# ============================================================================
+# Variant Tests
+# ============================================================================
+
+def test_render_variants_downscales_and_converts(tmp_path):
+    """Test variants are bounded by their max edge, keep aspect ratio and use their format."""
+    source = tmp_path / "wide.jpg"
+    Image.new("RGB", (2000, 1000), color="green").save(source, format="JPEG")
+
+    rendered = render_variants(str(source))
+    try:
+        assert set(rendered) == {"thumb", "medium", "webp"}
+        sizes = {}
+        for name, (path, size) in rendered.items():
+            assert os.path.getsize(path) == size
+            with Image.open(path) as variant:
+                sizes[name] = (variant.size, variant.format)
+    finally:
+        for path, _ in rendered.values():
+            os.remove(path)
+
+    assert sizes["thumb"] == ((320, 160), "JPEG")
+    assert sizes["medium"] == ((1280, 640), "JPEG")
+    assert sizes["webp"] == ((1280, 640), "WEBP")
+
+
+def test_render_variants_does_not_upscale_small_images(tmp_path):
+    """Test images smaller than a variant keep their size (RGBA converted for JPEG)."""
+    source = tmp_path / "small.png"
+    Image.new("RGBA", (200, 100), color=(255, 0, 0, 128)).save(source, format="PNG")
+
+    rendered = render_variants(str(source))
+    try:
+        for path, _ in rendered.values():
+            with Image.open(path) as variant:
+                assert variant.size == (200, 100)
+    finally:
+        for path, _ in rendered.values():
+            os.remove(path)
+
+
+def _scene(seed: int, size=(640, 480)) -> Image.Image:
+    """Deterministic image with some structure (random rectangles)."""
+    import random
+    from PIL import ImageDraw
+
+    rng = random.Random(seed)
+    image = Image.new("RGB", size, color="white")
+    draw = ImageDraw.Draw(image)
+    w, h = size
+    for _ in range(12):
+        x0, y0 = rng.randrange(w), rng.randrange(h)
+        x1, y1 = x0 + rng.randrange(w // 2), y0 + rng.randrange(h // 2)
+        draw.rectangle((x0, y0, x1, y1), fill=tuple(rng.randrange(256) for _ in range(3)))
+    return image
+
+
+def test_compute_dhash_is_stable_across_resize_and_recompression(tmp_path):
+    """Test copies of a photo hash within a few bits, unrelated photos don't."""
+    original = tmp_path / "original.png"
+    copy = tmp_path / "copy.jpg"
+    other = tmp_path / "other.png"
+    _scene(1).save(original, format="PNG")
+    _scene(1).resize((320, 240)).save(copy, format="JPEG", quality=60)
+    _scene(2).save(other, format="PNG")
+
+    h_original, h_copy, h_other = (compute_dhash(str(p)) for p in (original, copy, other))
+    assert len(h_original) == 16
+
+    distance = lambda a, b: (int(a, 16) ^ int(b, 16)).bit_count()
+    assert distance(h_original, h_copy) <= 4
+    assert distance(h_original, h_other) > 10
+
+
+@pytest.mark.asyncio
+async def test_upload_image_returns_perceptual_hash(mock_bunny_settings):
+    """Test uploads carry the dhash; dedup hits reuse the stored one."""
+    buf = io.BytesIO()
+    _scene(3).save(buf, format="PNG")
+    content = buf.getvalue()
+
+    with mock_http_client(lambda request: httpx.Response(201)):
+        uploaded = await upload_image(make_upload_file(content, "image/png", "cat.png"))
+    assert uploaded.dhash is not None and len(uploaded.dhash) == 16
+
+    existing = UploadedImage(url="https://test.b-cdn.net/sightings/x.png", dhash="00ff00ff00ff00ff")
+    uploaded = await upload_image(
+        make_upload_file(content, "image/png", "cat.png"), find_existing=lambda sha256: existing
+    )
+    assert uploaded.deduplicated
+    assert uploaded.dhash == "00ff00ff00ff00ff"
+
+
+@pytest.mark.asyncio
+async def test_upload_image_stores_variants_next_to_original(mock_bunny_settings):
+    """Test variants are rendered in the process pool and uploaded beside the original."""
+    bunny_circuit_breaker.state = "CLOSED"
+    bunny_circuit_breaker.failures = 0
+    mock_bunny_settings.image_variants_enabled = True
+
+    img = Image.new("RGB", (1600, 1200), color="blue")
+    img_bytes = io.BytesIO()
+    img.save(img_bytes, format="JPEG")
+    upload = make_upload_file(img_bytes.getvalue(), "image/jpeg", "cat.jpg")
+
+    stored = {}
+
+    async def handler(request):
+        stored[request.url.path] = await request.aread()
+        return httpx.Response(201)
+
+    try:
+        with mock_http_client(handler):
+            uploaded = await upload_image(upload)
+    finally:
+        shutdown_variant_executor()
+
+    assert set(uploaded.variants) == {"thumb", "medium", "webp"}
+    basename = uploaded.url.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+    assert uploaded.variants["thumb"] == f"https://test.b-cdn.net/sightings/{basename}_thumb.jpg"
+    assert uploaded.variants["webp"] == f"https://test.b-cdn.net/sightings/{basename}_webp.webp"
+    assert len(stored) == 4
+
+    thumb = Image.open(io.BytesIO(stored[f"/test-zone/sightings/{basename}_thumb.jpg"]))
+    assert thumb.size == (320, 240)
+
+
+@pytest.mark.asyncio
+async def test_variant_upload_failure_keeps_original(mock_bunny_settings):
+    """Test a failed variant upload is skipped instead of failing the whole upload."""
+    bunny_circuit_breaker.state = "CLOSED"
+    bunny_circuit_breaker.failures = 0
+    mock_bunny_settings.image_variants_enabled = True
+
+    img_bytes = io.BytesIO()
+    Image.new("RGB", (100, 100), color="red").save(img_bytes, format="PNG")
+    upload = make_upload_file(img_bytes.getvalue(), "image/png", "cat.png")
+
+    def handler(request):
+        if request.url.path.endswith("_thumb.jpg"):
+            return httpx.Response(400, text="Bad request")
+        return httpx.Response(201)
+
+    try:
+        with mock_http_client(handler):
+            uploaded = await upload_image(upload)
+    finally:
+        shutdown_variant_executor()
+
+    assert uploaded.url.endswith(".png")
+    assert set(uploaded.variants) == {"medium", "webp"}
+
+
 # ============================================================================
 # Delete Tests
 # ============================================================================
@@ -386,15 +825,19 @@ async def test_delete_from_bunny_success(mock_bunny_settings):
 
     test_url = "https://test.b-cdn.net/sightings/test.jpg"
 
-    with patch("image_upload.requests.delete") as mock_delete:
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_delete.return_value = mock_response
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request)
+        return httpx.Response(200)
 
+    with mock_http_client(handler):
         result = await delete_from_bunny(test_url)
 
         assert result is True
-        mock_delete.assert_called_once()
+        assert len(requests_seen) == 1
+        assert requests_seen[0].method == "DELETE"
+        assert str(requests_seen[0].url).endswith("/sightings/test.jpg")
 
 
 @pytest.mark.asyncio
@@ -404,11 +847,7 @@ async def test_delete_from_bunny_already_deleted(mock_bunny_settings):
 
     test_url = "https://test.b-cdn.net/sightings/test.jpg"
 
-    with patch("image_upload.requests.delete") as mock_delete:
-        mock_response = Mock()
-        mock_response.status_code = 404
-        mock_delete.return_value = mock_response
-
+    with mock_http_client(lambda request: httpx.Response(404)):
         result = await delete_from_bunny(test_url)
 
         assert result is True  # 404 is OK for deletes
@@ -421,9 +860,10 @@ async def test_delete_from_bunny_fails_gracefully(mock_bunny_settings):
 
     test_url = "https://test.b-cdn.net/sightings/test.jpg"
 
-    with patch("image_upload.requests.delete") as mock_delete:
-        mock_delete.side_effect = requests.exceptions.ConnectionError("Network error")
+    def handler(request):
+        raise httpx.ConnectError("Network error", request=request)
 
+    with mock_http_client(handler), patch("image_upload.asyncio.sleep", new=AsyncMock()):
         # Should not raise, just return False
         result = await delete_from_bunny(test_url)
 
@@ -452,21 +892,17 @@ async def test_upload_flow_end_to_end(mock_bunny_settings):
     img.save(img_bytes, format="JPEG", quality=85)
     img_content = img_bytes.getvalue()
 
-    mock_file = Mock(spec=UploadFile)
-    mock_file.content_type = "image/jpeg"
-    mock_file.size = len(img_content)
-    mock_file.filename = "cat_sighting.jpg"
-    # Make read async
-    async def async_read():
-        return img_content
-    mock_file.read = async_read
+    mock_file = make_upload_file(img_content, "image/jpeg", "cat_sighting.jpg")
 
     # Mock successful upload
-    with patch("image_upload.requests.put") as mock_put:
-        mock_response = Mock()
-        mock_response.status_code = 201
-        mock_put.return_value = mock_response
+    requests_seen = []
+
+    async def handler(request):
+        await request.aread()  # Body is streamed from the spool file
+        requests_seen.append(request)
+        return httpx.Response(201)
 
+    with mock_http_client(handler):
         # Execute
         cdn_url = await upload_to_bunny(mock_file, folder="sightings")
 
@@ -476,7 +912,7 @@ async def test_upload_flow_end_to_end(mock_bunny_settings):
         assert len(cdn_url.split("/")[-1]) > 20  # Has timestamp and UUID
 
         # Verify API call
-        call_args = mock_put.call_args
-        assert "de.storage.bunnycdn.com" in call_args[0][0]
-        assert call_args[1]["headers"]["AccessKey"] == "test-api-key"
-        assert call_args[1]["data"] == img_content
+        request = requests_seen[0]
+        assert "de.storage.bunnycdn.com" in str(request.url)
+        assert request.headers["AccessKey"] == "test-api-key"
+        assert request.content == img_content
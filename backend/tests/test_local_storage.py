@@ -0,0 +1,111 @@
+"""
+Tests for the local-filesystem storage backend (STORAGE_BACKEND=local).
+
+- uploads are written under content-addressed paths
+- GET /media serves them with ETag, Range and long-lived Cache-Control
+- delete/list work on disk; paths can't escape the storage root
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure backend/ is importable
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import hashlib
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+
+@pytest.fixture()
+def local_storage(tmp_path: Path, monkeypatch):
+    """Switch image storage to a temp directory."""
+    import image_upload
+    media_dir = tmp_path / "media"
+    for key, value in {
+        "storage_backend": "local",
+        "local_storage_dir": str(media_dir),
+        "local_storage_base_url": "/media",
+        "image_variants_enabled": False,
+    }.items():
+        monkeypatch.setattr(image_upload.settings, key, value)
+    return media_dir
+
+
+@pytest.fixture()
+def client(main, local_storage):
+    return TestClient(main.app)
+
+
+def png_bytes(color: str = "purple") -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (32, 32), color=color).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_upload_is_stored_on_disk_and_served(client: TestClient, local_storage: Path):
+    content = png_bytes()
+    digest = hashlib.sha256(content).hexdigest()
+
+    r = client.post("/upload/image", files={"file": ("cat.png", content, "image/png")})
+    assert r.status_code == 200
+    url = r.json()["url"]
+    assert url == f"/media/sightings/{digest}.png"
+    assert "verify;dur=" in r.headers["server-timing"]
+    assert (local_storage / "sightings" / f"{digest}.png").read_bytes() == content
+
+    r = client.get(url)
+    assert r.status_code == 200
+    assert r.content == content
+    assert r.headers["content-type"] == "image/png"
+    assert r.headers["etag"] == f'"{digest}"'
+    assert "immutable" in r.headers["cache-control"]
+
+
+def test_media_conditional_and_range_requests(client: TestClient):
+    content = png_bytes("teal")
+    url = client.post("/upload/image", files={"file": ("cat.png", content, "image/png")}).json()["url"]
+    etag = client.get(url).headers["etag"]
+
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+
+    r = client.get(url, headers={"Range": "bytes=0-9"})
+    assert r.status_code == 206
+    assert r.content == content[:10]
+    assert r.headers["content-range"] == f"bytes 0-9/{len(content)}"
+
+
+def test_media_missing_file_is_404(client: TestClient):
+    assert client.get("/media/sightings/missing.png").status_code == 404
+    assert client.get("/media/%2e%2e/test.db").status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_local_storage_store_list_delete(local_storage: Path, tmp_path: Path):
+    from fastapi import HTTPException
+    from image_upload import LocalStorage
+
+    storage = LocalStorage()
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"image-bytes")
+
+    url = await storage.store_file(str(source), 11, "sightings/abc.jpg")
+    assert url == "/media/sightings/abc.jpg"
+
+    objects = await storage.list_objects("sightings")
+    assert [(o.url, o.size) for o in objects] == [(url, 11)]
+
+    assert await storage.delete(url) is True
+    assert not (local_storage / "sightings" / "abc.jpg").exists()
+    assert await storage.delete(url) is True  # Already gone is fine
+    assert await storage.delete("https://elsewhere.example/sightings/abc.jpg") is False
+
+    assert storage.resolve("../outside.jpg") is None
+    with pytest.raises(HTTPException):
+        await storage.store_file(str(source), 11, "../outside.jpg")
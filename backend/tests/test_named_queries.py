@@ -0,0 +1,70 @@
+"""
+Tests for the named query registry.
+
+- registered statements are compiled once for SQLite and PostgreSQL (incl. RETURNING)
+- on PostgreSQL, registered queries run their precompiled %s form
+- registered INSERTs return the new id on both databases
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure backend/ is importable
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+class RecordingCursor:
+    """Stands in for a psycopg2 cursor: records statements instead of running them."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params))
+
+    def fetchone(self):
+        return {"id": 7}
+
+
+class Connection:
+    pass
+
+
+def test_queries_are_compiled_for_both_databases(main):
+    query = main.QUERIES["cat_exists"]
+    assert query.sqlite == "SELECT id FROM cats WHERE id = ?"
+    assert query.postgres == "SELECT id FROM cats WHERE id = %s"
+
+    insert = main.QUERIES["insert_pending_upload"]
+    assert insert.postgres_returning.endswith("VALUES (%s, %s, %s, %s, %s, %s) RETURNING id")
+    for query in main.QUERIES.values():
+        assert "?" not in query.postgres
+
+
+def test_postgres_runs_compiled_statements(main, monkeypatch):
+    monkeypatch.setattr(type(main.settings), "is_postgres", property(lambda self: True))
+
+    cur = RecordingCursor(Connection())
+    main.run_query(cur, "cat_exists", (1,))
+    assert cur.statements == [("SELECT id FROM cats WHERE id = %s", (1,))]
+
+    assert main.insert_returning_id(cur, "insert_cat", ("Ginger", "2026-01-01T00:00:00Z")) == 7
+    assert cur.statements[-1][0] == "INSERT INTO cats (name, createdAt) VALUES (%s, %s) RETURNING id"
+
+
+def test_sqlite_uses_registered_queries(main):
+    client = TestClient(main.app)
+    cat = client.post("/cats", json={"name": "Ginger"}).json()
+    assert cat["id"] > 0
+    assert client.get(f"/cats/{cat['id']}/sightings").status_code == 200
+    assert client.get("/cats/999/sightings").status_code == 404
+
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    assert main.run_query(cur, "cat_exists", (cat["id"],)).fetchone()["id"] == cat["id"]
+    conn.close()
@@ -0,0 +1,113 @@
+"""
+Benchmarks for set-based bulk operations (marked slow).
+
+- linking 1k sightings to a cat uses a fixed handful of statements
+- list endpoints build models with RowMapper instead of per-value row_get()
+- RowMapper builds the same models as row_get() (timings printed, not asserted)
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure backend/ is importable
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import gc
+import time
+import timeit
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("endpoint", ["link-sightings", "from-sightings"])
+def test_link_1k_sightings(main, client: TestClient, endpoint):
+    result = main.ingest_entries([{"text": f"Cat sighting {i}", "location": f"Spot {i % 25}"}
+                                  for i in range(1000)])
+    ids = [r.entry_id for r in result.results]
+
+    with patch("main.execute_query", wraps=main.execute_query) as execute_query:
+        start = time.perf_counter()
+        if endpoint == "link-sightings":
+            cat_id = client.post("/cats", json={"name": "Bulk"}).json()["id"]
+            r = client.post(f"/cats/{cat_id}/link-sightings", json={"entry_ids": ids})
+            assert len(r.json()["newly_linked"]) == 1000
+        else:
+            r = client.post("/cats/from-sightings", json={"entry_ids": ids})
+            cat_id = r.json()["id"]
+        elapsed = time.perf_counter() - start
+    assert r.status_code == 200
+
+    # 2 SELECT and 2 UPDATE chunks plus one stats rebuild, not 2 statements per id
+    assert execute_query.call_count < 40
+    print(f"\n{endpoint}: 1000 ids in {elapsed * 1000:.1f} ms, {execute_query.call_count} statements")
+
+    stats = client.get(f"/cats/{cat_id}/profile/enhanced").json()["stats"]
+    assert (stats["totalSightings"], stats["uniqueLocations"]) == (1000, 25)
+
+
+def entry_with_row_get(main, r):
+    """How list endpoints built entries before RowMapper."""
+    return main.Entry(
+        id=r["id"], text=r["text"], createdAt=main.row_get(r, "createdAt"),
+        isFavorite=bool(main.row_get(r, "isFavorite")), nickname=r["nickname"], location=r["location"],
+        cat_id=r["cat_id"], photo_url=r["photo_url"], photo_thumb_url=r["photo_thumb_url"],
+        photo_medium_url=r["photo_medium_url"], photo_webp_url=r["photo_webp_url"],
+        photo_status=r["photo_status"], location_normalized=r["location_normalized"],
+        location_lat=r["location_lat"], location_lon=r["location_lon"], location_osm_id=r["location_osm_id"],
+        location_street=r["location_street"], location_number=r["location_number"],
+        location_zip=r["location_zip"], location_city=r["location_city"], location_country=r["location_country"],
+    )
+
+
+@pytest.mark.slow
+def test_row_mapper_vs_row_get(main):
+    main.ingest_entries([{"text": f"Cat sighting {i}", "location": "Harbour", "location_city": "Hamburg"}
+                         for i in range(5000)])
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, f"SELECT {main.ENTRY_COLUMNS} FROM entries")
+    rows = cur.fetchall()
+    # The same rows as PostgreSQL's RealDictCursor returns them (lowercased names)
+    names = [column[0].lower() for column in cur.description]
+    dict_rows = [dict(zip(names, row)) for row in rows]
+
+    class PostgresCursor:
+        description = [(name,) for name in names]
+
+    builds = {
+        "sqlite row_get": lambda: [entry_with_row_get(main, r) for r in rows],
+        "sqlite mapper": lambda: main.RowMapper(main.Entry).map(cur, rows),
+        "postgres row_get": lambda: [entry_with_row_get(main, r) for r in dict_rows],
+        "postgres mapper": lambda: main.RowMapper(main.Entry).map(PostgresCursor, dict_rows),
+    }
+    timings = {}
+    gc.disable()
+    try:
+        for label, build in builds.items():
+            timings[label] = min(timeit.repeat(build, number=1, repeat=5))
+    finally:
+        gc.enable()
+    conn.close()
+
+    print("\n" + ", ".join(f"{label}: {seconds * 1000:.1f} ms" for label, seconds in timings.items()))
+    assert builds["postgres mapper"]() == builds["sqlite row_get"]()
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("path", ["/entries", "/cats/{cat_id}/sightings?limit=100&include_total=false", "/cats?include_stats=true"])
+def test_list_endpoints_skip_row_get(main, client: TestClient, path):
+    result = main.ingest_entries([{"text": f"Cat sighting {i}"} for i in range(1000)])
+    cat_id = client.post("/cats/from-sightings", json={"entry_ids": [r.entry_id for r in result.results]}).json()["id"]
+
+    with patch("main.row_get", wraps=main.row_get) as row_get:
+        start = time.perf_counter()
+        r = client.get(path.format(cat_id=cat_id))
+        elapsed = time.perf_counter() - start
+    assert r.status_code == 200
+    assert row_get.call_count == 0
+    print(f"\n{path}: {elapsed * 1000:.1f} ms")
+
@@ -0,0 +1,197 @@
+"""
+Tests for photo-based matching (perceptual hashes).
+
+- BK-tree radius search returns exactly what a brute-force scan would
+- the index picks up new and replaced photos without a rebuild
+- a stale index is rebuilt in the background, keeping changes made meanwhile
+- /entries/{id}/matches ranks visually similar photos higher
+- /entries/{id}/matches only scores keyword, nearby and photo candidates
+- past the keyword candidate limit, entries sharing the most keywords are kept
+- entries from before entry_keywords are indexed by the backfill
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure backend/ is importable
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import random
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def set_hash(main, entry_id: int, dhash: str) -> None:
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.store_photo_hash(cur, entry_id, dhash)
+    conn.commit()
+    conn.close()
+
+
+def test_bk_tree_matches_brute_force(main):
+    rng = random.Random(42)
+    values = [rng.getrandbits(64) for _ in range(2000)]
+    values += [values[0] ^ (1 << bit) for bit in range(5)]  # Near-duplicates
+    values.append(values[1])  # Exact duplicate
+
+    tree = main.BKTree()
+    for i, value in enumerate(values):
+        tree.add(value, i)
+    assert tree.size == len(values)
+
+    for query in (values[0], values[1], rng.getrandbits(64)):
+        for radius in (0, 3, 10):
+            expected = {
+                (i, main.hamming_distance(query, v))
+                for i, v in enumerate(values)
+                if main.hamming_distance(query, v) <= radius
+            }
+            assert set(tree.search(query, radius)) == expected
+
+
+def test_index_tracks_new_and_replaced_photos(main):
+    a = main.create_entry(main.EntryCreate(text="Cat A"))
+    b = main.create_entry(main.EntryCreate(text="Cat B"))
+    set_hash(main, a.id, "ffffffff00000000")
+
+    index = main.photo_hash_index
+    assert index.similar("ffffffff00000000", radius=0) == {a.id: 0}
+
+    # Stored after the build: added without a rebuild
+    set_hash(main, b.id, "ffffffff00000003")
+    index.set(b.id, "ffffffff00000003")
+    assert index.similar("ffffffff00000000", radius=2) == {a.id: 0, b.id: 2}
+
+    # Replaced photo: stale hash must not match any more, and the tree is kept
+    tree = index._tree
+    set_hash(main, a.id, "0000000000000000")
+    index.set(a.id, "0000000000000000")
+    assert index.similar("ffffffff00000000", radius=2) == {b.id: 2}
+    assert index.similar("0000000000000000", radius=0) == {a.id: 0}
+    assert index._tree is tree
+
+    index.set(b.id, None)  # Photo removed
+    assert index.similar("ffffffff00000000", radius=2) == {}
+
+
+def test_stale_index_is_rebuilt_in_background(main, monkeypatch):
+    a = main.create_entry(main.EntryCreate(text="Cat A"))
+    b = main.create_entry(main.EntryCreate(text="Cat B"))
+    set_hash(main, a.id, "ffffffff00000000")
+
+    index = main.photo_hash_index
+    assert index.similar("ffffffff00000000", radius=0) == {a.id: 0}
+
+    # Stored by another process: only visible after a rebuild
+    set_hash(main, b.id, "ffffffff00000001")
+    monkeypatch.setattr(index, "max_age_seconds", 0)
+    started = threading.Event()
+    load = index._load
+
+    def slow_load():
+        started.wait(5)
+        return load()
+
+    monkeypatch.setattr(index, "_load", slow_load)
+    assert index.similar("ffffffff00000000", radius=1) == {a.id: 0}  # Answered from the old tree
+    index.set(a.id, "0000000000000000")  # Changed while the rebuild is loading
+    started.set()
+
+    deadline = time.monotonic() + 5
+    while index._rebuilding and time.monotonic() < deadline:
+        time.sleep(0.01)
+    monkeypatch.setattr(index, "max_age_seconds", 300)
+    assert index.similar("ffffffff00000000", radius=1) == {b.id: 1}
+    assert index.similar("0000000000000000", radius=0) == {a.id: 0}
+
+
+def test_matches_rank_visually_similar_photo_first(main):
+    client = TestClient(main.app)
+    base = main.create_entry(main.EntryCreate(text="Orange tabby cat sleeping", location="Harbour"))
+    same_photo = main.create_entry(main.EntryCreate(text="Tabby near the boats", location="Harbour"))
+    other_photo = main.create_entry(main.EntryCreate(text="Tabby near the boats", location="Harbour"))
+
+    set_hash(main, base.id, "0f0f0f0f0f0f0f0f")
+    set_hash(main, same_photo.id, "0f0f0f0f0f0f0f0e")  # 1 bit apart
+    set_hash(main, other_photo.id, "f0f0f0f0f0f0f0f0")  # Every bit differs
+
+    r = client.get(f"/entries/{base.id}/matches", params={"min_score": 0.0})
+    assert r.status_code == 200
+    matches = r.json()
+
+    assert [m["candidate_id"] for m in matches[:2]] == [same_photo.id, other_photo.id]
+    assert matches[0]["photo_distance"] == 1
+    assert "visually similar photo (hash distance 1)" in matches[0]["reasons"]
+    assert matches[1]["photo_distance"] is None
+    assert matches[0]["score"] > matches[1]["score"]
+
+
+def test_matches_only_score_candidates_that_can_match(main):
+    client = TestClient(main.app)
+    base = main.create_entry(main.EntryCreate(text="Ginger cat with white paws", location="Harbour"))
+    related = [
+        main.create_entry(main.EntryCreate(text="White paws again", location="Old town")).id,
+        main.create_entry(main.EntryCreate(text="Sleeping", location="Harbour")).id,
+    ]
+    unrelated = [main.create_entry(main.EntryCreate(text=f"Zebra number {i}", location="Zoo")).id for i in range(20)]
+    nearby = main.create_entry(main.EntryCreate(text="Something else entirely")).id
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, "UPDATE entries SET location_lat = 53.5, location_lon = 10.0 WHERE id IN (?, ?)",
+                       (base.id, nearby))
+    main.execute_query(cur, "UPDATE entries SET location_lat = 48.1, location_lon = 11.6 WHERE id = ?",
+                       (unrelated[0],))
+    main.execute_query(cur, "SELECT * FROM entries WHERE id = ?", (base.id,))
+    base_row = cur.fetchone()
+    assert main.match_candidate_ids(cur, base_row, []) == sorted(related + [nearby], reverse=True)
+    conn.commit()
+    conn.close()
+
+    matches = client.get(f"/entries/{base.id}/matches", params={"top_k": 20}).json()
+    assert {m["candidate_id"] for m in matches} <= set(related + [nearby])
+
+    # min_score 0 still fills the list with (zero-score) newest entries
+    matches = client.get(f"/entries/{base.id}/matches", params={"top_k": 5, "min_score": 0.0}).json()
+    assert len(matches) == 5
+    assert [m["candidate_id"] for m in matches[3:]] == sorted(unrelated, reverse=True)[:2]
+
+
+def test_keyword_candidates_keep_strongest_matches_past_limit(main, monkeypatch):
+    client = TestClient(main.app)
+    base = main.create_entry(main.EntryCreate(text="Ginger cat with white paws and torn ear", location="Harbour"))
+    strong = main.create_entry(main.EntryCreate(text="Ginger, white paws, torn ear", location="Harbour")).id
+    weak = [main.create_entry(main.EntryCreate(text=f"Ginger number {i}", location="Zoo")).id for i in range(10)]
+    monkeypatch.setattr(main, "MATCH_KEYWORD_CANDIDATE_LIMIT", 3)
+
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, "SELECT * FROM entries WHERE id = ?", (base.id,))
+    candidates = main.match_candidate_ids(cur, cur.fetchone(), [])
+    conn.close()
+    assert candidates == sorted(weak, reverse=True)[:2] + [strong]
+
+    matches = client.get(f"/entries/{base.id}/matches").json()
+    assert matches[0]["candidate_id"] == strong
+
+
+def test_backfill_indexes_entries_from_before_keywords(main):
+    a = main.create_entry(main.EntryCreate(text="Calico cat", location="Market"))
+    b = main.create_entry(main.EntryCreate(text="Calico again"))
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, "DELETE FROM entry_keywords")
+    main.execute_query(cur, "UPDATE entries SET keywords_indexed = 0")
+    conn.commit()
+    conn.close()
+
+    client = TestClient(main.app)
+    assert client.get(f"/entries/{a.id}/matches").json() == []
+
+    assert main.backfill_entry_keywords(batch_size=1) == 2
+    assert main.backfill_entry_keywords() == 0
+    assert [m["candidate_id"] for m in client.get(f"/entries/{a.id}/matches").json()] == [b.id]
@@ -0,0 +1,208 @@
+"""
+Tests for background photo uploads (ASYNC_IMAGE_UPLOADS).
+
+- the entry is created with photo_status "pending" before any storage request
+- the worker uploads the spooled file and fills in photo_url
+- failed uploads end as photo_status "failed" after the last attempt
+- unexpected exceptions from storage are retried like storage errors
+- retries wait in pending_uploads until they're due, then the sweep re-queues them
+- uploads the full queue turned down are picked up by the sweep
+- pending uploads left in the database are resumed (restart recovery)
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure backend/ is importable
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import asyncio
+import io
+import os
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from PIL import Image
+from starlette.datastructures import Headers
+from fastapi import Response, UploadFile
+
+
+@pytest.fixture()
+def main(main, tmp_path: Path, monkeypatch):
+    """conftest's app module, with background uploads on."""
+    import image_upload
+
+    monkeypatch.setattr(main.settings, "async_image_uploads", True)
+    monkeypatch.setattr(main.settings, "upload_spool_dir", str(tmp_path / "spool"))
+    for key, value in {
+        "bunny_storage_zone": "test-zone",
+        "bunny_api_key": "test-api-key",
+        "bunny_cdn_hostname": "test.b-cdn.net",
+        "image_variants_enabled": False,
+    }.items():
+        monkeypatch.setattr(image_upload.settings, key, value)
+    image_upload.bunny_circuit_breaker.call_succeeded()
+    return main
+
+
+def make_image(color: str) -> UploadFile:
+    buf = io.BytesIO()
+    Image.new("RGB", (16, 16), color=color).save(buf, format="PNG")
+    return UploadFile(
+        file=io.BytesIO(buf.getvalue()),
+        size=len(buf.getvalue()),
+        filename="cat.png",
+        headers=Headers({"content-type": "image/png"}),
+    )
+
+
+def storage(handler):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return patch("image_upload.get_http_client", return_value=client)
+
+
+async def create_entry(main, image: UploadFile):
+    return await main.create_entry_with_image(
+        response=Response(), text="Cat by the bakery", nickname=None, location=None,
+        location_street=None, location_number=None, location_zip=None,
+        location_city=None, location_country=None, image=image,
+    )
+
+
+def fetch_entry(main, entry_id: int):
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, "SELECT photo_url, photo_status FROM entries WHERE id = ?", (entry_id,))
+    row = cur.fetchone()
+    main.execute_query(cur, "SELECT COUNT(*) AS n FROM pending_uploads WHERE entry_id = ?", (entry_id,))
+    pending = cur.fetchone()["n"]
+    conn.close()
+    return row, pending
+
+
+@pytest.mark.asyncio
+async def test_entry_returns_before_photo_is_uploaded(main, tmp_path):
+    puts = []
+
+    def handler(request):
+        puts.append(request.url.path)
+        return httpx.Response(201)
+
+    main.photo_upload_queue.start()
+    try:
+        with storage(handler):
+            entry = await create_entry(main, make_image("orange"))
+            assert entry.photo_status == "pending"
+            assert entry.photo_url is None
+            assert puts == []  # Nothing uploaded during the request
+
+            await main.photo_upload_queue.join()
+    finally:
+        await main.photo_upload_queue.stop()
+
+    row, pending = fetch_entry(main, entry.id)
+    assert row["photo_status"] == "ready"
+    assert row["photo_url"].startswith("https://test.b-cdn.net/sightings/")
+    assert len(puts) == 1
+    assert pending == 0
+    assert os.listdir(tmp_path / "spool") == []  # Spool file removed
+
+
+@pytest.mark.asyncio
+async def test_failed_upload_marks_photo_failed(main, monkeypatch):
+    monkeypatch.setattr(main.settings, "photo_upload_max_attempts", 1)
+
+    main.photo_upload_queue.start()
+    try:
+        with storage(lambda request: httpx.Response(401, text="Unauthorized")):
+            entry = await create_entry(main, make_image("grey"))
+            await main.photo_upload_queue.join()
+    finally:
+        await main.photo_upload_queue.stop()
+
+    row, pending = fetch_entry(main, entry.id)
+    assert row["photo_status"] == "failed"
+    assert row["photo_url"] is None
+    assert pending == 0
+
+
+@pytest.mark.asyncio
+async def test_unexpected_upload_error_is_retried(main, monkeypatch):
+    monkeypatch.setattr(main.settings, "photo_upload_max_attempts", 2)
+    monkeypatch.setattr(main, "PHOTO_UPLOAD_RETRY_BASE_DELAY", 0)
+
+    main.photo_upload_queue.start()
+    try:
+        # Not an HTTPException (e.g. a bug or an OS error while rendering variants)
+        with patch("main.store_upload", new=AsyncMock(side_effect=OSError("disk full"))):
+            entry = await create_entry(main, make_image("white"))
+            await main.photo_upload_queue.join()
+            conn = main.get_conn()
+            cur = main.get_cursor(conn)
+            main.execute_query(cur, "SELECT attempts, last_error, next_attempt_at FROM pending_uploads WHERE entry_id = ?",
+                               (entry.id,))
+            retry = cur.fetchone()
+            conn.close()
+            assert retry["attempts"] == 1
+            assert retry["last_error"] == "OSError: disk full"
+            assert retry["next_attempt_at"] is not None
+            assert main.photo_upload_queue.stats()["depth"] == 0  # Waits for the sweep
+
+            assert main.requeue_due_uploads() == 1  # Due after the (zero) backoff
+            assert main.requeue_due_uploads() == 0  # Not queued twice
+            await main.photo_upload_queue.join()
+    finally:
+        await main.photo_upload_queue.stop()
+
+    row, pending = fetch_entry(main, entry.id)
+    assert row["photo_status"] == "failed"
+    assert pending == 0
+
+
+@pytest.mark.asyncio
+async def test_pending_uploads_are_resumed_after_restart(main, tmp_path):
+    # Simulate a previous run that spooled a photo but never uploaded it
+    entry = main.create_entry(main.EntryCreate(text="Black cat"))
+    spooled = await main.spool_upload(make_image("black"), spool_dir=str(tmp_path / "spool"))
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, "UPDATE entries SET photo_status = 'pending' WHERE id = ?", (entry.id,))
+    main.queue_pending_upload(cur, entry.id, spooled)
+    conn.commit()
+    conn.close()
+
+    main.photo_upload_queue.start()
+    try:
+        with storage(lambda request: httpx.Response(201)):
+            assert main.resume_pending_uploads() == 1
+            await main.photo_upload_queue.join()
+    finally:
+        await main.photo_upload_queue.stop()
+
+    row, pending = fetch_entry(main, entry.id)
+    assert row["photo_status"] == "ready"
+    assert row["photo_url"] == f"https://test.b-cdn.net/sightings/{spooled.sha256}.png"
+    assert pending == 0
+
+
+@pytest.mark.asyncio
+async def test_upload_turned_down_by_full_queue_is_swept(main, monkeypatch):
+    monkeypatch.setattr(main.photo_upload_queue, "max_size", 0)
+
+    main.photo_upload_queue.start()
+    try:
+        with storage(lambda request: httpx.Response(201)):
+            entry = await create_entry(main, make_image("brown"))
+            assert main.requeue_due_uploads() == 0  # Still no room
+
+            monkeypatch.setattr(main.photo_upload_queue, "max_size", 10)
+            assert main.requeue_due_uploads() == 1
+            await main.photo_upload_queue.join()
+    finally:
+        await main.photo_upload_queue.stop()
+
+    row, pending = fetch_entry(main, entry.id)
+    assert row["photo_status"] == "ready"
+    assert pending == 0
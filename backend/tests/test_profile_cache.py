@@ -0,0 +1,121 @@
+"""
+Tests for the versioned cat profile response cache.
+
+- repeated profile views are served from the cache (X-Cache: HIT)
+- linking sightings, renaming and new insights bump the cat's version
+- stale-while-revalidate serves the old body and rebuilds it in the background
+- /health/profile-cache reports hit rates
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure backend/ is importable
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture()
+def main(main, monkeypatch):
+    """conftest's app module, with a fresh profile cache."""
+    monkeypatch.setattr(main, "profile_cache", main.ProfileCache(max_size=100))
+    return main
+
+
+def make_cat(main, client: TestClient, texts):
+    ids = [main.create_entry(main.EntryCreate(text=t, location="Harbour")).id for t in texts]
+    return client.post("/cats/from-sightings", json={"entry_ids": ids, "name": "Ginger"}).json()["id"]
+
+
+@pytest.mark.parametrize("path", ["/cats/{id}/profile", "/cats/{id}/profile/enhanced"])
+def test_profile_served_from_cache_until_cat_changes(main, client: TestClient, path):
+    cat_id = make_cat(main, client, ["Orange cat", "Orange cat sleeping"])
+    url = path.format(id=cat_id)
+
+    first = client.get(url)
+    assert first.headers["x-cache"] == "MISS"
+    with patch("main.build_cat_profile") as build, patch("main.build_enhanced_cat_profile") as build_enhanced:
+        second = client.get(url)
+    build.assert_not_called()
+    build_enhanced.assert_not_called()
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == first.json()
+
+    # Rename
+    client.patch(f"/cats/{cat_id}", json={"name": "Marmalade"})
+    renamed = client.get(url)
+    assert renamed.headers["x-cache"] == "MISS"
+    assert "Marmalade" in renamed.text
+
+    # New sighting
+    entry = main.create_entry(main.EntryCreate(text="Orange cat at the bakery", location="Bakery"))
+    client.post(f"/entries/{entry.id}/assign/{cat_id}")
+    linked = client.get(url)
+    assert linked.headers["x-cache"] == "MISS"
+    assert "3 sighting(s)" in linked.json()["profile_text"]
+
+
+def test_new_insight_invalidates_enhanced_profile(main, client: TestClient):
+    cat_id = make_cat(main, client, ["Grey cat"])
+    url = f"/cats/{cat_id}/profile/enhanced"
+    assert client.get(url).json()["insightStatus"]["hasProfile"] is False
+
+    assert client.post(f"/cats/{cat_id}/insights", json={"mode": "profile"}).status_code == 200
+
+    r = client.get(url)
+    assert r.headers["x-cache"] == "MISS"
+    assert r.json()["insightStatus"]["hasProfile"] is True
+
+
+def test_unknown_cat_is_404(client: TestClient):
+    assert client.get("/cats/999/profile").status_code == 404
+    assert client.get("/cats/999/profile/enhanced").json()["detail"]["code"] == "CAT_NOT_FOUND"
+
+
+def test_stale_while_revalidate(main, client: TestClient, monkeypatch):
+    monkeypatch.setattr(main.settings, "profile_cache_stale_while_revalidate", True)
+    cat_id = make_cat(main, client, ["Black cat"])
+    url = f"/cats/{cat_id}/profile"
+    client.get(url)
+
+    client.patch(f"/cats/{cat_id}", json={"name": "Shadow"})
+
+    # Old body right away; the TestClient runs the background rebuild after the response
+    stale = client.get(url)
+    assert stale.headers["x-cache"] == "STALE"
+    assert stale.json()["name"] == "Ginger"
+
+    fresh = client.get(url)
+    assert fresh.headers["x-cache"] == "HIT"
+    assert fresh.json()["name"] == "Shadow"
+    assert main.profile_cache.stats()["refreshes"] == 1
+
+
+def test_cache_evicts_least_recently_used(main):
+    cache = main.ProfileCache(max_size=2)
+    cache.put("profile", 1, 0, b"one")
+    cache.put("profile", 2, 0, b"two")
+    assert cache.get("profile", 1, 0) == (b"one", "hit")
+    cache.put("profile", 3, 0, b"three")
+
+    assert cache.get("profile", 2, 0) == (None, "miss")
+    assert cache.get("profile", 1, 0) == (b"one", "hit")
+    cache.put("profile", 1, 5, b"newer")
+    cache.put("profile", 1, 4, b"late refresh")  # Older version never replaces a newer one
+    assert cache.get("profile", 1, 5) == (b"newer", "hit")
+
+
+def test_health_reports_hit_rate(main, client: TestClient):
+    cat_id = make_cat(main, client, ["Tabby"])
+    for _ in range(4):
+        client.get(f"/cats/{cat_id}/profile")
+
+    stats = client.get("/health/profile-cache").json()
+    assert (stats["hits"], stats["misses"], stats["stale_hits"]) == (3, 1, 0)
+    assert stats["hit_rate"] == 0.75
+    assert stats["size"] == 1
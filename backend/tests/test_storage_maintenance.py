@@ -0,0 +1,212 @@
+"""
+Tests for deferred storage deletes and orphaned-file reconciliation.
+
+- pending deletes are drained in batches; failures are rescheduled with backoff
+- URLs referenced again before the drain are not deleted
+- reconciliation reports unreferenced files older than the grace period
+- reconciliation checks the listing against the database in chunks
+- standalone uploads expire unless an entry attaches their URL
+- a blob leased by a concurrent lookup survives the release of its last reference
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure backend/ is importable
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+CDN = "https://test.b-cdn.net/sightings"
+
+
+def schedule(main, urls):
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.schedule_storage_deletes(cur, urls)
+    conn.commit()
+    conn.close()
+
+
+def pending(main):
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, "SELECT url, attempts, next_attempt_at FROM pending_deletes ORDER BY url")
+    rows = [dict(r) for r in cur.fetchall()]
+    conn.close()
+    return rows
+
+
+@pytest.mark.asyncio
+async def test_drain_deletes_batch_and_reschedules_failures(main):
+    schedule(main, [f"{CDN}/a.jpg", f"{CDN}/b.jpg", f"{CDN}/a.jpg"])  # Duplicate ignored
+    assert len(pending(main)) == 2
+
+    async def fake_delete(url):
+        return url.endswith("a.jpg")  # b.jpg fails (e.g. circuit breaker open)
+
+    with patch("main.delete_stored_file", side_effect=fake_delete) as delete:
+        assert await main.drain_pending_deletes() == 1
+        assert delete.await_count == 2
+
+        rows = pending(main)
+        assert [r["url"] for r in rows] == [f"{CDN}/b.jpg"]
+        assert rows[0]["attempts"] == 1
+        assert rows[0]["next_attempt_at"] > main._utc_timestamp(datetime.utcnow())
+
+        # Not due yet: the next pass doesn't hammer storage
+        assert await main.drain_pending_deletes() == 0
+        assert delete.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_drain_respects_batch_size(main):
+    schedule(main, [f"{CDN}/{i}.jpg" for i in range(5)])
+
+    with patch("main.delete_stored_file", new=AsyncMock(return_value=True)):
+        assert await main.drain_pending_deletes(batch_size=2) == 2
+        assert len(pending(main)) == 3
+
+
+@pytest.mark.asyncio
+async def test_drain_skips_urls_referenced_again(main):
+    from image_upload import UploadedImage
+
+    url = f"{CDN}/{'a' * 64}.jpg"
+    schedule(main, [url])
+
+    # Same bytes uploaded again under the same content-addressed URL
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, "INSERT INTO pending_deletes (url, attempts, next_attempt_at, createdAt) VALUES (?, 0, '', '')",
+                       (f"{CDN}/other.jpg",))
+    main.execute_query(cur, "INSERT INTO entries (text, createdAt, isFavorite, photo_url) VALUES ('x', '', 0, ?)",
+                       (f"{CDN}/other.jpg",))
+    main.acquire_image_blob(cur, UploadedImage(url=url, sha256="a" * 64))
+    conn.commit()
+    conn.close()
+
+    assert [r["url"] for r in pending(main)] == [f"{CDN}/other.jpg"]  # acquire cancelled url
+
+    with patch("main.delete_stored_file", new=AsyncMock(return_value=True)) as delete:
+        assert await main.drain_pending_deletes() == 0
+    delete.assert_not_awaited()  # other.jpg is used by an entry
+    assert pending(main) == []
+
+
+@pytest.mark.asyncio
+async def test_reconcile_reports_old_unreferenced_files(main, monkeypatch):
+    from image_upload import StoredObject
+
+    old = datetime.utcnow() - timedelta(days=2)
+    objects = [
+        StoredObject(url=f"{CDN}/used.jpg", size=1, last_changed=old),
+        StoredObject(url=f"{CDN}/orphan.jpg", size=1, last_changed=old),
+        StoredObject(url=f"{CDN}/just-uploaded.jpg", size=1, last_changed=datetime.utcnow()),
+    ]
+    main.create_entry(main.EntryCreate(text="Cat", photo_url=f"{CDN}/used.jpg"))
+
+    with patch("main.list_storage_objects", new=AsyncMock(return_value=objects)):
+        assert await main.reconcile_storage() == [f"{CDN}/orphan.jpg"]
+        assert pending(main) == []  # Report only by default
+
+        monkeypatch.setattr(main.settings, "storage_reconcile_delete_orphans", True)
+        await main.reconcile_storage()
+        assert [r["url"] for r in pending(main)] == [f"{CDN}/orphan.jpg"]
+
+    assert main.storage_reconcile_state["orphaned_objects"] == 1
+
+
+
+@pytest.mark.asyncio
+async def test_reconcile_checks_references_in_chunks(main, monkeypatch):
+    from image_upload import StoredObject
+
+    monkeypatch.setattr(main, "IN_CLAUSE_CHUNK_SIZE", 2)
+    old = datetime.utcnow() - timedelta(days=2)
+    urls = [f"{CDN}/{i}.jpg" for i in range(7)]
+    main.create_entry(main.EntryCreate(text="Cat", photo_url=urls[1]))
+    main.create_entry(main.EntryCreate(text="Cat", photo_url=urls[6]))
+    schedule(main, [urls[4]])  # Already being deleted
+
+    objects = [StoredObject(url=url, size=1, last_changed=old) for url in urls]
+    with patch("main.list_storage_objects", new=AsyncMock(return_value=objects)):
+        assert await main.reconcile_storage() == [urls[0], urls[2], urls[3], urls[5]]
+
+def blob(main, url):
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, "SELECT refcount, leasedAt FROM image_blobs WHERE url = ?", (url,))
+    row = cur.fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+
+def lease_blob(main, sha256, leased_at):
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.execute_query(cur, "UPDATE image_blobs SET leasedAt = ? WHERE sha256 = ?",
+                       (main._utc_timestamp(leased_at), sha256))
+    conn.commit()
+    conn.close()
+
+
+def store_unattached(main, url, sha256):
+    from image_upload import UploadedImage
+
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.acquire_image_blob(cur, UploadedImage(url=url, sha256=sha256), references=0)
+    conn.commit()
+    conn.close()
+
+
+def test_unattached_upload_expires_after_lease(main):
+    url = f"{CDN}/{'b' * 64}.jpg"
+    store_unattached(main, url, "b" * 64)
+    assert blob(main, url)["refcount"] == 0
+
+    assert main.expire_image_blobs() == 0  # Still leased: the client may attach it
+    lease_blob(main, "b" * 64, datetime.utcnow() - main.IMAGE_BLOB_LEASE - timedelta(minutes=1))
+
+    assert main.expire_image_blobs() == 1
+    assert blob(main, url) is None
+    assert [r["url"] for r in pending(main)] == [url]
+
+
+def test_entry_with_uploaded_url_takes_a_reference(main):
+    url = f"{CDN}/{'c' * 64}.jpg"
+    store_unattached(main, url, "c" * 64)
+    schedule(main, [url])
+
+    main.create_entry(main.EntryCreate(text="Cat", photo_url=url))
+    assert blob(main, url)["refcount"] == 1
+    assert pending(main) == []
+
+    lease_blob(main, "c" * 64, datetime.utcnow() - main.IMAGE_BLOB_LEASE - timedelta(minutes=1))
+    assert main.expire_image_blobs() == 0
+
+
+def test_lookup_leases_blob_against_concurrent_release(main):
+    from image_upload import UploadedImage
+
+    url = f"{CDN}/{'d' * 64}.jpg"
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    main.acquire_image_blob(cur, UploadedImage(url=url, sha256="d" * 64))
+    conn.commit()
+    conn.close()
+    lease_blob(main, "d" * 64, datetime.utcnow() - timedelta(days=2))
+
+    # An upload of the same bytes finds the blob just before its last entry lets go
+    assert main.find_image_blob("d" * 64).url == url
+    conn = main.get_conn()
+    cur = main.get_cursor(conn)
+    assert main.release_image_blob(cur, url) == []
+    conn.commit()
+    conn.close()
+    assert blob(main, url)["refcount"] == 0  # Kept for the in-flight upload to attach
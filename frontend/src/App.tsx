@@ -6,7 +6,7 @@ import {
   createEntry,
   toggleEntryFavorite,
   analyzeEntry,
-  getEntryAnalysis,
+  getEntryAnalyses,
   getCatInsights,
   normalizeEntryLocation,
   type Entry,
@@ -35,6 +35,10 @@ import { CatProfilePage } from "./pages/CatProfilePage";
  * - Shareable cat profile pages with React Router
  */
 
+// Sightings per list page, and the most the map shows (the backend's maximum page size)
+const ENTRIES_PAGE_SIZE = 50;
+const MAP_ENTRIES_LIMIT = 500;
+
 export default function App() {
   return (
     <ToastProvider>
@@ -53,6 +57,10 @@ function AppContent() {
   // Main data state
   // ----------------------------
   const [entries, setEntries] = useState<Entry[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  // Sightings with coordinates for the map view (fetched with has_coords)
+  const [entriesWithCoords, setEntriesWithCoords] = useState<Entry[]>([]);
   const [analysisById, setAnalysisById] = useState<Record<number, EntryAnalysis>>({});
   // Matches are now displayed in SimilarNearbyPanel, but we keep this for inline display
   const [matchesById] = useState<Record<number, MatchCandidate[]>>({});
@@ -97,20 +105,6 @@ function AppContent() {
   const [notes, setNotes] = useState("");
   const [photoFile, setPhotoFile] = useState<File | null>(null);
 
-  // ----------------------------
-  // Derived state: what entries to show
-  // ----------------------------
-  const visible = useMemo(() => {
-    return entries.filter((e) => (filter === "favorites" ? e.isFavorite : true));
-  }, [entries, filter]);
-
-  // Entries with coordinates for map view
-  const entriesWithCoords = useMemo(() => {
-    return entries.filter(
-      (e) => e.location_lat !== null && e.location_lat !== undefined
-    );
-  }, [entries]);
-
   // ----------------------------
   // Week 9: Cat Insights state
   // ----------------------------
@@ -120,7 +114,8 @@ function AppContent() {
   // ----------------------------
   // Community stats
   // ----------------------------
-  const totalSightings = entries.length;
+  // Loaded so far; "+" while more pages follow
+  const totalSightings = `${entries.length}${nextCursor ? "+" : ""}`;
 
   const enrichedCount = useMemo(() => {
     return Object.keys(analysisById).length;
@@ -156,7 +151,7 @@ function AppContent() {
 
   const createEntryMutation = useMutation(createEntry, {
     onSuccess: (created) => {
-      setEntries((prev) => [created, ...prev]);
+      addCreatedEntry(created);
       // Reset form
       setNickname("");
       setLocationStreet("");
@@ -175,7 +170,14 @@ function AppContent() {
 
   const toggleFavoriteMutation = useMutation(toggleEntryFavorite, {
     onSuccess: (updated) => {
-      setEntries((prev) => prev.map((e) => (e.id === updated.id ? updated : e)));
+      setEntries((prev) =>
+        prev.flatMap((e) => {
+          if (e.id !== updated.id) return [e];
+          // An unfavorited sighting leaves the favorites list
+          return filter === "favorites" && !updated.isFavorite ? [] : [updated];
+        })
+      );
+      setEntriesWithCoords((prev) => prev.map((e) => (e.id === updated.id ? updated : e)));
       setError(null);
     },
     onError: (err) => {
@@ -190,19 +192,64 @@ function AppContent() {
   async function loadEntries() {
     setError(null);
     try {
-      const data = await getEntries();
-      setEntries(data);
+      // The list and the map are filtered by the backend (favorites / has_coords)
+      const [page, mapPage] = await Promise.all([
+        getEntries({ favorites: filter === "favorites", limit: ENTRIES_PAGE_SIZE }),
+        getEntries({ has_coords: true, limit: MAP_ENTRIES_LIMIT }),
+      ]);
+      setEntries(page.items);
+      setNextCursor(page.nextCursor);
+      setEntriesWithCoords(mapPage.items);
+
+      // Load enrichment for the loaded sightings in batched requests
+      loadAnalyses(page.items.map((e) => e.id));
+    } catch (e: any) {
+      console.error(e);
+      setError(e.getUserMessage?.() || "Could not load sightings.");
+    }
+  }
 
-      // Load enrichment for each sighting
-      data.forEach((e) => {
-        loadAnalysisIfExists(e.id);
+  async function loadMoreEntries() {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await getEntries({
+        favorites: filter === "favorites",
+        limit: ENTRIES_PAGE_SIZE,
+        cursor: nextCursor,
       });
+      setEntries((prev) => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+      loadAnalyses(page.items.map((e) => e.id));
     } catch (e: any) {
       console.error(e);
-      setError(e.getUserMessage?.() || "Could not load sightings.");
+      setError(e.getUserMessage?.() || "Could not load more sightings.");
+    } finally {
+      setLoadingMore(false);
     }
   }
 
+  function addCreatedEntry(created: Entry) {
+    // New sightings aren't favorites yet
+    if (filter === "all") {
+      setEntries((prev) => [created, ...prev]);
+    }
+    if (created.location_lat != null) {
+      setEntriesWithCoords((prev) => [created, ...prev]);
+    }
+  }
+
+  function applyVerifiedLocation(entryId: number, location: Partial<Entry>) {
+    const update = (e: Entry) => (e.id === entryId ? { ...e, ...location } : e);
+    setEntries((prev) => prev.map(update));
+    setEntriesWithCoords((prev) => {
+      if (prev.some((e) => e.id === entryId)) return prev.map(update);
+      // Newly located: it belongs on the map now
+      const entry = entries.find((e) => e.id === entryId);
+      return entry ? [{ ...entry, ...location }, ...prev] : prev;
+    });
+  }
+
   async function fetchCatInsights(catId: number, mode: "profile" | "care" | "update" | "risk") {
     setLoadingInsightCatId(catId);
     setError(null);
@@ -260,7 +307,7 @@ function AppContent() {
           hasAddress ? addressFields : null,
           photoFile
         );
-        setEntries((prev) => [createdEntry!, ...prev]);
+        addCreatedEntry(createdEntry);
         showSuccess("Sighting added successfully!");
         resetForm();
       } catch (e: any) {
@@ -316,14 +363,19 @@ function AppContent() {
     }
   }
 
-  async function loadAnalysisIfExists(entryId: number) {
+  async function loadAnalyses(entryIds: number[]) {
+    if (entryIds.length === 0) return;
     try {
-      const data = await getEntryAnalysis(entryId);
-      setAnalysisById((prev) => ({ ...prev, [entryId]: data }));
+      const analyses = await getEntryAnalyses(entryIds);
+      setAnalysisById((prev) => {
+        const next = { ...prev };
+        analyses.forEach((a) => {
+          next[a.entry_id] = a;
+        });
+        return next;
+      });
     } catch (e: any) {
-      // 404 is expected when no analysis exists
-      if (e.details?.statusCode === 404) return;
-      // Silently ignore other errors for now
+      // Silently ignore errors for now (enrichment is optional)
     }
   }
 
@@ -340,19 +392,12 @@ function AppContent() {
 
       if (result.status === "success") {
         // Update the entry with normalized location
-        setEntries((prev) =>
-          prev.map((e) =>
-            e.id === entryId
-              ? {
-                  ...e,
-                  location_normalized: result.normalized_location,
-                  location_lat: result.latitude,
-                  location_lon: result.longitude,
-                  location_osm_id: result.osm_id,
-                }
-              : e
-          )
-        );
+        applyVerifiedLocation(entryId, {
+          location_normalized: result.normalized_location,
+          location_lat: result.latitude,
+          location_lon: result.longitude,
+          location_osm_id: result.osm_id,
+        });
 
         if (showFeedback) {
           const shortLocation = result.normalized_location?.split(",")[0] || "Location";
@@ -387,19 +432,12 @@ function AppContent() {
       const result = await normalizeEntryLocation(entryId, true);
 
       if (result.status === "success") {
-        setEntries((prev) =>
-          prev.map((e) =>
-            e.id === entryId
-              ? {
-                  ...e,
-                  location_normalized: result.normalized_location,
-                  location_lat: result.latitude,
-                  location_lon: result.longitude,
-                  location_osm_id: result.osm_id,
-                }
-              : e
-          )
-        );
+        applyVerifiedLocation(entryId, {
+          location_normalized: result.normalized_location,
+          location_lat: result.latitude,
+          location_lon: result.longitude,
+          location_osm_id: result.osm_id,
+        });
         showSuccess("Location verified!");
       } else {
         showWarning("Location could not be verified. Try a different address.");
@@ -454,7 +492,7 @@ function AppContent() {
   // ----------------------------
 
   function handleMapEntryClick(entryId: number) {
-    const entry = entries.find((e) => e.id === entryId);
+    const entry = entriesWithCoords.find((e) => e.id === entryId);
     if (entry) {
       openSimilarPanel(entry);
     }
@@ -465,12 +503,12 @@ function AppContent() {
   }
 
   // ----------------------------
-  // Initial load
+  // Initial load (and reload when the list filter changes)
   // ----------------------------
   useEffect(() => {
     loadEntries();
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, []);
+  }, [filter]);
 
   // ----------------------------
   // UI
@@ -713,7 +751,7 @@ function AppContent() {
         <section style={{ marginTop: 16 }}>
           <h2>Sightings Map</h2>
           <SightingsMap
-            entries={entries}
+            entries={entriesWithCoords}
             onEntryClick={handleMapEntryClick}
             onCreateCat={handleMapCreateCat}
           />
@@ -726,10 +764,10 @@ function AppContent() {
           <h2>Sightings</h2>
 
         <ul className="entry-list">
-          {visible.length === 0 ? (
+          {entries.length === 0 ? (
             <li className="entry-item">No sightings yet. Add the first one above.</li>
           ) : (
-            visible.map((e) => {
+            entries.map((e) => {
               const analysis = analysisById[e.id];
               const catId = e.cat_id;
 
@@ -950,6 +988,12 @@ function AppContent() {
             })
           )}
         </ul>
+
+        {nextCursor && (
+          <button type="button" onClick={loadMoreEntries} disabled={loadingMore} style={{ marginTop: 12 }}>
+            {loadingMore ? "Loading..." : "Load more sightings"}
+          </button>
+        )}
         </section>
       )}
 
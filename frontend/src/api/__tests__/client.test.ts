@@ -3,7 +3,7 @@
  */
 
 import { describe, it, expect, vi, beforeEach, afterEach } from "vitest";
-import { get, post, put, del, patch, resetCircuitBreaker } from "../client";
+import { get, getPage, post, put, del, patch, resetCircuitBreaker } from "../client";
 import { mockFetchResponse, mockNetworkError } from "../../test/setup";
 import { ErrorType } from "../../types/errors";
 
@@ -77,6 +77,24 @@ describe("API Client", () => {
     });
   });
 
+  describe("Paginated GET requests", () => {
+    it("should return the items with the X-Next-Cursor header", async () => {
+      mockFetchResponse([{ id: 2 }, { id: 1 }], 200, true, { "X-Next-Cursor": "abc" });
+
+      const page = await getPage("/entries?limit=2");
+
+      expect(page).toEqual({ items: [{ id: 2 }, { id: 1 }], nextCursor: "abc" });
+    });
+
+    it("should return a null cursor on the last page", async () => {
+      mockFetchResponse([{ id: 1 }]);
+
+      const page = await getPage("/entries");
+
+      expect(page.nextCursor).toBeNull();
+    });
+  });
+
   describe("POST requests", () => {
     it("should make successful POST request with body", async () => {
       const payload = { name: "Test" };
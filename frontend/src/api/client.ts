@@ -142,6 +142,24 @@ export async function get<T>(
   return request<T>(endpoint, { ...config, method: "GET" });
 }
 
+/** One page of a keyset-paginated list */
+export type Page<T> = {
+  items: T[];
+  nextCursor: string | null; // Pass back as `cursor` for the next page; null on the last page
+};
+
+/**
+ * GET request for a paginated list: the cursor comes from the X-Next-Cursor header
+ */
+export async function getPage<T>(
+  endpoint: string,
+  config?: Omit<RequestConfig, "method" | "body">
+): Promise<Page<T>> {
+  const response = await makeRequest(endpoint, { ...config, method: "GET" });
+  const items = (await response.json()) as T[];
+  return { items, nextCursor: response.headers.get("X-Next-Cursor") };
+}
+
 /**
  * POST request
  */
@@ -3,7 +3,7 @@
  * Type-safe API endpoint definitions
  */
 
-import { get, post, patch, del } from "./client";
+import { get, getPage, post, patch, del, type Page } from "./client";
 
 // ===========================
 // Type Definitions
@@ -237,6 +237,7 @@ export type PaginatedSightingsResponse = {
   limit: number;
   totalPages: number;
   hasMore: boolean;
+  nextCursor: string | null; // Pass as cursor to fetch the next page
 };
 
 // ===========================
@@ -283,6 +284,7 @@ export type PaginatedCommentsResponse = {
   limit: number;
   totalPages: number;
   hasMore: boolean;
+  nextCursor: string | null; // Pass as cursor to fetch the next page
 };
 
 // ===========================
@@ -337,11 +339,31 @@ export type SuggestedGroupingsResponse = {
 // Entry Endpoints
 // ===========================
 
+/** Server-side filters for GET /entries (all optional) */
+export type EntryFilters = {
+  favorites?: boolean;
+  cat_id?: number;
+  unassigned?: boolean;
+  has_coords?: boolean;
+  since?: string; // ISO timestamp, inclusive
+  until?: string; // ISO timestamp, exclusive
+  city?: string;
+  limit?: number;
+  cursor?: string; // nextCursor of the previous page
+};
+
 /**
- * Get all cat sightings
+ * Get one page of cat sightings, newest first
+ * @param filters Optional filters applied by the backend; pass the previous
+ *   page's nextCursor as `cursor` for the next page
  */
-export function getEntries(): Promise<Entry[]> {
-  return get<Entry[]>("/entries");
+export function getEntries(filters: EntryFilters = {}): Promise<Page<Entry>> {
+  const params = new URLSearchParams();
+  for (const [key, value] of Object.entries(filters)) {
+    if (value !== undefined && value !== false) params.set(key, String(value));
+  }
+  const query = params.toString();
+  return getPage<Entry>(query ? `/entries?${query}` : "/entries");
 }
 
 /**
@@ -385,6 +407,32 @@ export function getEntryAnalysis(entryId: number): Promise<EntryAnalysis> {
   });
 }
 
+// Ids per GET /entries/analyses request (keeps the query string short)
+const ENTRY_ANALYSES_BATCH_SIZE = 200;
+
+/**
+ * Get stored analyses for many entries (one request per 200 ids)
+ * (entries without analysis are simply missing from the result)
+ */
+export async function getEntryAnalyses(entryIds?: number[]): Promise<EntryAnalysis[]> {
+  if (!entryIds) {
+    return get<EntryAnalysis[]>("/entries/analyses");
+  }
+
+  const batches: number[][] = [];
+  for (let i = 0; i < entryIds.length; i += ENTRY_ANALYSES_BATCH_SIZE) {
+    batches.push(entryIds.slice(i, i + ENTRY_ANALYSES_BATCH_SIZE));
+  }
+  const results = await Promise.all(
+    batches.map((batch) => {
+      const params = new URLSearchParams();
+      batch.forEach((id) => params.append("ids", id.toString()));
+      return get<EntryAnalysis[]>(`/entries/analyses?${params.toString()}`);
+    })
+  );
+  return results.flat();
+}
+
 // ===========================
 // Matching Endpoints
 // ===========================
@@ -521,21 +569,32 @@ export function getEnhancedCatProfile(catId: number): Promise<EnhancedCatProfile
   return get<EnhancedCatProfile>(`/cats/${catId}/profile/enhanced`);
 }
 
+/**
+ * Get enhanced profiles of many cats in one request (list and map views)
+ * @param catIds The cat IDs to fetch profiles for (at most 100, unknown IDs are skipped)
+ */
+export function getEnhancedCatProfiles(catIds: number[]): Promise<EnhancedCatProfile[]> {
+  return get<EnhancedCatProfile[]>(`/cats/profiles/enhanced?ids=${catIds.join(",")}`);
+}
+
 /**
  * Get paginated sightings for a specific cat
  * @param catId The cat ID to fetch sightings for
  * @param page Page number (1-indexed)
  * @param limit Items per page (default 20, max 100)
+ * @param cursor nextCursor of the previous page (keyset pagination, page is then ignored)
  */
 export function getCatSightings(
   catId: number,
   page: number = 1,
-  limit: number = 20
+  limit: number = 20,
+  cursor?: string
 ): Promise<PaginatedSightingsResponse> {
   const params = new URLSearchParams({
     page: page.toString(),
     limit: limit.toString(),
   });
+  if (cursor) params.set("cursor", cursor);
   return get<PaginatedSightingsResponse>(`/cats/${catId}/sightings?${params}`);
 }
 
@@ -560,16 +619,19 @@ export function updateCat(
  * @param catId The cat ID to fetch comments for
  * @param page Page number (1-indexed)
  * @param limit Items per page (default 20, max 100)
+ * @param cursor nextCursor of the previous page (keyset pagination, page is then ignored)
  */
 export function getCatComments(
   catId: number,
   page: number = 1,
-  limit: number = 20
+  limit: number = 20,
+  cursor?: string
 ): Promise<PaginatedCommentsResponse> {
   const params = new URLSearchParams({
     page: page.toString(),
     limit: limit.toString(),
   });
+  if (cursor) params.set("cursor", cursor);
   return get<PaginatedCommentsResponse>(`/cats/${catId}/comments?${params}`);
 }
 
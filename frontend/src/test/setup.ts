@@ -21,13 +21,18 @@ vi.stubEnv("VITE_APP_VERSION", "1.0.0");
 global.fetch = vi.fn();
 
 // Helper to mock fetch responses
-export function mockFetchResponse(data: unknown, status = 200, ok = true) {
+export function mockFetchResponse(
+  data: unknown,
+  status = 200,
+  ok = true,
+  headers: Record<string, string> = {}
+) {
   (global.fetch as any).mockResolvedValueOnce({
     ok,
     status,
     json: async () => data,
     text: async () => JSON.stringify(data),
-    headers: new Headers(),
+    headers: new Headers(headers),
   });
 }
 